@@ -9,7 +9,7 @@ from fastapi import (
     Response,
 )
 from pydantic import EmailStr
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 import app.api.routes.v1.providers.auth as auth_provider
 from app.api.routes.v1.dto.auth import (
@@ -30,7 +30,7 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 async def register_user(
     request: RegisterRequestDTO,
     bt: BackgroundTasks,
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
 ):
     """Register a new user account."""
     return await auth_provider.register(
@@ -48,7 +48,7 @@ async def register_user(
 async def login_user(
     request: LoginRequestDTO,
     bt: BackgroundTasks,
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
     response: Response,
 ):
     """Login user and send OTP for verification."""
@@ -72,16 +72,19 @@ async def get_me(
 @router.post("/logout", response_model=MessageResponse)
 async def logout_user(
     response: Response,
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
+    session_id: Annotated[str | None, Cookie(alias="user_session_id")] = None,
 ):
-    """Logout user by clearing session cookie."""
-    response.delete_cookie(key="user_session_id", httponly=True)
-    return MessageResponse(message="Logged out successfully.")
+    """Logout user by expiring the session and clearing its cookie."""
+    return await auth_provider.logout(
+        db_session=db_session, session_id=session_id, response=response
+    )
 
 
 @router.post("/verify-account", response_model=MessageResponse)
 async def verify_user_account(
     request: AccountVerificationDTO,
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
 ):
     """Verify user account using OTP token."""
     return await auth_provider.verify_account(
@@ -95,7 +98,7 @@ async def verify_user_account(
 async def verify_login_otp(
     request: LoginVerificationDTO,
     response: Response,
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
 ):
     """Verify login OTP and create user session."""
     await auth_provider.authenticate(
@@ -111,14 +114,11 @@ async def verify_login_otp(
 async def send_verification_email(
     email: EmailStr,
     bt: BackgroundTasks,
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
 ):
     """Send verification email to user."""
-
-    bt.add_task(
-        auth_provider.send_verification_email,
-        db_session=db_session,
-        email=email,
+    await auth_provider.send_verification_email(
+        db_session=db_session, email=email, bt=bt
     )
     return MessageResponse(message="Verification email sent successfully.")
 
@@ -127,7 +127,7 @@ async def send_verification_email(
 async def verify_login_otp_cookie(
     token: str,
     response: Response,
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
     auth_session_id: Annotated[str | None, Cookie(alias="_auths")] = None,
 ):
     """Verify login OTP using cookie-based auth session."""
@@ -1,9 +1,9 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, UploadFile
-from fastapi.responses import StreamingResponse
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, File, Request, UploadFile
+from fastapi.responses import FileResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 import app.api.routes.v1.providers.file as file_provider
 from app.api.routes.v1.providers.auth import (
@@ -16,22 +16,24 @@ from app.core.db.setup import create_db_session
 router = APIRouter(prefix="/v1", tags=["File management"])
 
 
-@router.get(
-    "/file/{resource_id}", response_class=StreamingResponse
-)
+@router.get("/file/{resource_id}", response_class=FileResponse)
 async def get_file_resource(
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
     user: Annotated[User | None, Depends(get_current_user_optional)],
+    request: Request,
     resource_id: UUID,
 ):
     return await file_provider.get_file_resource(
-        db_session=db_session, current_user=user, resource_id=resource_id
+        db_session=db_session,
+        request=request,
+        current_user=user,
+        resource_id=resource_id,
     )
 
 
 @router.post("/file")
 async def create_file_resource(
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
     user: Annotated[User, Depends(get_current_user)],
     file: UploadFile = File(),
     protected: bool = False,
@@ -46,7 +48,7 @@ async def create_file_resource(
 
 @router.post("/files")
 async def create_file_resources(
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
     user: Annotated[User, Depends(get_current_user)],
     files: list[UploadFile] = File(...),
     protected: bool = False,
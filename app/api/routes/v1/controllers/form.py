@@ -1,22 +1,35 @@
 from typing import Annotated, List
 from uuid import UUID
 
-from fastapi import APIRouter, Cookie, Depends, Response, status
-from sqlmodel import Session
+from fastapi import (
+    APIRouter,
+    Cookie,
+    Depends,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.routes.v1.dto.form import (
     AnswerSessionDTO,
+    BatchResponseCreationDTO,
     FieldResponseDTO,
     FormCreationDTO,
     FormDTO,
     FormFieldCreationDTO,
     FormFieldDTO,
     FormFieldUpdateDTO,
+    FormStatsDTO,
     FormTranslationModel,
     FormUpdateDTO,
     ResponseCreationDTO,
+    ResponseExportFormat,
 )
 from app.api.routes.v1.dto.message import MessageResponse
+from app.api.routes.v1.dto.pagination import PageDTO
 from app.api.routes.v1.providers import form as form_provider
 from app.api.routes.v1.providers.auth import (
     get_current_user,
@@ -30,7 +43,7 @@ router = APIRouter(prefix="/forms", tags=["Forms"])
 
 ANSWER_SESSION_COOKIE_KEY = "response_session_id"
 
-DBSessionDependency = Annotated[Session, Depends(create_db_session)]
+DBSessionDependency = Annotated[AsyncSession, Depends(create_db_session)]
 CurrentUserDependency = Annotated[User, Depends(get_current_user)]
 OptionalUserDependency = Annotated[
     User | None, Depends(get_current_user_optional)
@@ -56,34 +69,34 @@ async def create_form(
     )
 
 
-@router.get("/", response_model=List[FormDTO])
+@router.get("/", response_model=PageDTO[FormDTO])
 async def get_all_forms(
     db_session: DBSessionDependency,
     current_user: CurrentUserDependency,
-    skip: int = 0,
-    limit: int = 10,
+    cursor: str | None = None,
+    limit: int = Query(10, ge=1, le=100),
 ):
     """Get all forms (Admin only)"""
     return await form_provider.get_forms(
         db_session=db_session,
         current_user=current_user,
-        skip=skip,
+        cursor=cursor,
         limit=limit,
     )
 
 
-@router.get("/my", response_model=List[FormDTO])
+@router.get("/my", response_model=PageDTO[FormDTO])
 async def get_user_forms(
     db_session: DBSessionDependency,
     current_user: CurrentUserDependency,
-    skip: int = 0,
-    limit: int = 10,
+    cursor: str | None = None,
+    limit: int = Query(10, ge=1, le=100),
 ):
     """Get forms created by the current user"""
     return await form_provider.get_user_forms(
         db_session=db_session,
         current_user=current_user,
-        skip=skip,
+        cursor=cursor,
         limit=limit,
     )
 
@@ -91,12 +104,16 @@ async def get_user_forms(
 @router.get("/{form_id}", response_model=FormDTO)
 async def get_form(
     form_id: UUID,
+    request: Request,
+    response: Response,
     db_session: DBSessionDependency,
     current_user: OptionalUserDependency,
 ):
     """Get a specific form by ID (Public for form filling)"""
     return await form_provider.get_form_by_id(
         db_session=db_session,
+        request=request,
+        response=response,
         form_id=form_id,
         current_user=current_user,
     )
@@ -176,12 +193,16 @@ async def open_form(
 @router.get("/{form_id}/fields", response_model=List[FormFieldDTO])
 async def get_form_fields(
     form_id: UUID,
+    request: Request,
+    response: Response,
     db_session: DBSessionDependency,
     current_user: OptionalUserDependency,
 ):
     """Get all fields for a form (Public for form filling)"""
     return await form_provider.get_form_fields(
         db_session=db_session,
+        request=request,
+        response=response,
         form_id=form_id,
         current_user=current_user,
     )
@@ -273,6 +294,30 @@ async def respond_to_field(
     )
 
 
+@router.post(
+    "/{form_id}/responses:batch",
+    response_model=List[FieldResponseDTO],
+    status_code=status.HTTP_201_CREATED,
+)
+async def respond_to_fields(
+    form_id: UUID,
+    response: Response,
+    responses_data: BatchResponseCreationDTO,
+    db_session: DBSessionDependency,
+    response_session_id: CurrentAnswerSessionDependency = None,
+):
+    """Submit responses to several fields at once (Public endpoint)"""
+    return await form_provider.respond_to_fields(
+        api_response=response,
+        db_session=db_session,
+        form_id=form_id,
+        responses_data=responses_data,
+        response_session_id=UUID(response_session_id)
+        if response_session_id
+        else None,
+    )
+
+
 @router.put("/responses/{answer_id}")
 async def edit_response(
     answer_id: UUID,
@@ -334,19 +379,53 @@ async def get_answer_session(
 
 
 # Form Response Management (Admin/Owner Access)
-@router.get("/{form_id}/responses", response_model=List[AnswerSessionDTO])
+@router.get(
+    "/{form_id}/responses", response_model=PageDTO[AnswerSessionDTO]
+)
 async def get_form_responses(
     form_id: UUID,
     db_session: DBSessionDependency,
     current_user: CurrentUserDependency,
-    skip: int = 0,
-    limit: int = 10,
+    cursor: str | None = None,
+    limit: int = Query(10, ge=1, le=100),
 ):
     """Get all responses for a form (Admin/Owner only)"""
     return await form_provider.get_responses(
         db_session=db_session,
         current_user=current_user,
         form_id=form_id,
-        skip=skip,
+        cursor=cursor,
         limit=limit,
     )
+
+
+@router.get(
+    "/{form_id}/responses/export", response_class=StreamingResponse
+)
+async def export_form_responses(
+    form_id: UUID,
+    db_session: DBSessionDependency,
+    current_user: CurrentUserDependency,
+    format: ResponseExportFormat = "csv",
+):
+    """Stream all submitted responses as CSV or NDJSON (Admin/Owner only)"""
+    return await form_provider.export_responses(
+        db_session=db_session,
+        current_user=current_user,
+        form_id=form_id,
+        export_format=format,
+    )
+
+
+@router.get("/{form_id}/stats", response_model=FormStatsDTO)
+async def get_form_stats(
+    form_id: UUID,
+    db_session: DBSessionDependency,
+    current_user: CurrentUserDependency,
+):
+    """Get per-field response summaries for a form (Admin/Owner only)"""
+    return await form_provider.get_form_stats(
+        db_session=db_session,
+        current_user=current_user,
+        form_id=form_id,
+    )
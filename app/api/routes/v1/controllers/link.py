@@ -1,7 +1,7 @@
-from typing import Annotated, List
+from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.routes.v1.dto.link import (
     LinkCreationDTO,
@@ -9,6 +9,7 @@ from app.api.routes.v1.dto.link import (
     LinkUpdateDTO,
 )
 from app.api.routes.v1.dto.message import MessageResponse
+from app.api.routes.v1.dto.pagination import PageDTO
 from app.api.routes.v1.providers import link as link_provider
 from app.api.routes.v1.providers.auth import get_current_user
 from app.core.db.models import User
@@ -20,7 +21,7 @@ router = APIRouter(prefix="/links", tags=["Links"])
 @router.get("/{link_id}", response_model=LinkDTO)
 async def get_link_by_id(
     link_id: str,
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
 ):
     """Get a specific link by its ID."""
     return await link_provider.get_link(db_session=db_session, link_id=link_id)
@@ -29,19 +30,23 @@ async def get_link_by_id(
 @router.get("/label/{label}", response_model=LinkDTO)
 async def get_link_by_label(
     label: str,
-    db_session: Annotated[Session, Depends(create_db_session)],
+    request: Request,
+    response: Response,
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
 ):
     """Get a specific link by its label (public endpoint)."""
     return await link_provider.get_link_by_label(
-        db_session=db_session, label=label
+        db_session=db_session, request=request, response=response, label=label
     )
 
 
-@router.get("", response_model=List[LinkDTO])
+@router.get("", response_model=PageDTO[LinkDTO])
 async def get_my_links(
     current_user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(create_db_session)],
-    skip: int = Query(0, ge=0, description="Number of links to skip"),
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
+    cursor: str | None = Query(
+        None, description="Cursor of the page to return"
+    ),
     limit: int = Query(
         10, ge=1, le=100, description="Number of links to return"
     ),
@@ -50,7 +55,7 @@ async def get_my_links(
     return await link_provider.get_my_links(
         db_session=db_session,
         current_user=current_user,
-        skip=skip,
+        cursor=cursor,
         limit=limit,
     )
 
@@ -59,7 +64,7 @@ async def get_my_links(
 async def create_link(
     request: LinkCreationDTO,
     current_user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
 ):
     """Create a new link."""
     return await link_provider.create_link(
@@ -73,7 +78,7 @@ async def create_link(
 async def update_link(
     request: LinkUpdateDTO,
     current_user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
 ):
     """Update an existing link."""
     return await link_provider.update_link(
@@ -87,7 +92,7 @@ async def update_link(
 async def delete_link(
     link_id: str,
     current_user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
 ):
     """Delete a link by its ID."""
     return await link_provider.delete_link(
@@ -97,21 +102,23 @@ async def delete_link(
     )
 
 
-@router.get("/user/{user_id}", response_model=List[LinkDTO])
+@router.get("/user/{user_id}", response_model=PageDTO[LinkDTO])
 async def get_user_links(
     user_id: str,
     current_user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(create_db_session)],
-    skip: int = Query(0, ge=0, description="Number of links to skip"),
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
+    cursor: str | None = Query(
+        None, description="Cursor of the page to return"
+    ),
     limit: int = Query(
         10, ge=1, le=100, description="Number of links to return"
     ),
 ):
     """Get links for a specific user (admin only or with proper permissions)."""
-    return link_provider.get_user_link(
+    return await link_provider.get_user_link(
         db_session=db_session,
         current_user=current_user,
         target_user_id=user_id,
-        skip=skip,
+        cursor=cursor,
         limit=limit,
     )
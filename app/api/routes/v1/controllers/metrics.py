@@ -0,0 +1,76 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.routes.v1.dto.metrics import (
+    AuthStatsDTO,
+    CacheStatsDTO,
+    DBPoolStatsDTO,
+    HashingPoolStatsDTO,
+    ReaperStatsDTO,
+)
+from app.api.routes.v1.providers import metrics as metrics_provider
+from app.api.routes.v1.providers.auth import get_current_user
+from app.core.db.models import User
+from app.core.db.setup import create_db_session
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+DBSessionDependency = Annotated[AsyncSession, Depends(create_db_session)]
+CurrentUserDependency = Annotated[User, Depends(get_current_user)]
+
+
+@router.get("/db-pool", response_model=DBPoolStatsDTO)
+async def get_db_pool_stats(
+    db_session: DBSessionDependency,
+    current_user: CurrentUserDependency,
+):
+    """Get database connection pool usage (Admin only)"""
+    return await metrics_provider.get_db_pool_stats(
+        db_session=db_session, current_user=current_user
+    )
+
+
+@router.get("/permission-cache", response_model=CacheStatsDTO)
+async def get_permission_cache_stats(
+    db_session: DBSessionDependency,
+    current_user: CurrentUserDependency,
+):
+    """Get permission cache hit rate, size and evictions (Admin only)"""
+    return await metrics_provider.get_permission_cache_stats(
+        db_session=db_session, current_user=current_user
+    )
+
+
+@router.get("/hashing", response_model=HashingPoolStatsDTO)
+async def get_hashing_pool_stats(
+    db_session: DBSessionDependency,
+    current_user: CurrentUserDependency,
+):
+    """Get password hashing pool queue depth and latency (Admin only)"""
+    return await metrics_provider.get_hashing_pool_stats(
+        db_session=db_session, current_user=current_user
+    )
+
+
+@router.get("/auth", response_model=AuthStatsDTO)
+async def get_auth_stats(
+    db_session: DBSessionDependency,
+    current_user: CurrentUserDependency,
+):
+    """Get session cache hit rate and authentication latency (Admin only)"""
+    return await metrics_provider.get_auth_stats(
+        db_session=db_session, current_user=current_user
+    )
+
+
+@router.get("/session-reaper", response_model=ReaperStatsDTO)
+async def get_reaper_stats(
+    db_session: DBSessionDependency,
+    current_user: CurrentUserDependency,
+):
+    """Get expired session rows reaped per run and in total (Admin only)"""
+    return await metrics_provider.get_reaper_stats(
+        db_session=db_session, current_user=current_user
+    )
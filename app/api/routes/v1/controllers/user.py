@@ -1,9 +1,10 @@
-from typing import Annotated, List
+from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.routes.v1.dto.message import MessageResponse
+from app.api.routes.v1.dto.pagination import PageDTO
 from app.api.routes.v1.dto.user import (
     CreatePermissionDTO,
     CreateRoleDTO,
@@ -19,11 +20,13 @@ from app.core.db.setup import create_db_session
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
-@router.get("", response_model=List[UserDTO])
+@router.get("", response_model=PageDTO[UserDTO])
 async def get_users(
     current_user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(create_db_session)],
-    skip: int = Query(0, ge=0, description="Number of users to skip"),
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
+    cursor: str | None = Query(
+        None, description="Cursor of the page to return"
+    ),
     limit: int = Query(
         10, ge=1, le=100, description="Number of users to return"
     ),
@@ -32,7 +35,7 @@ async def get_users(
     return await user_provider.get_users(
         db_session=db_session,
         current_user=current_user,
-        skip=skip,
+        cursor=cursor,
         limit=limit,
     )
 
@@ -41,7 +44,7 @@ async def get_users(
 async def delete_user(
     user_id: str,
     current_user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
 ):
     """Delete a user by ID (admin only or with proper permissions)."""
     return await user_provider.delete_user(
@@ -51,12 +54,14 @@ async def delete_user(
     )
 
 
-@router.get("/{user_id}/roles", response_model=List[RoleDTO])
+@router.get("/{user_id}/roles", response_model=PageDTO[RoleDTO])
 async def get_user_roles(
     user_id: str,
     current_user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(create_db_session)],
-    skip: int = Query(0, ge=0, description="Number of roles to skip"),
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
+    cursor: str | None = Query(
+        None, description="Cursor of the page to return"
+    ),
     limit: int = Query(
         10, ge=1, le=100, description="Number of roles to return"
     ),
@@ -66,17 +71,19 @@ async def get_user_roles(
         db_session=db_session,
         current_user=current_user,
         target_user_id=user_id,
-        skip=skip,
+        cursor=cursor,
         limit=limit,
     )
 
 
-@router.get("/roles/{role_id}/permissions", response_model=List[PermissionDTO])
+@router.get("/roles/{role_id}/permissions", response_model=PageDTO[PermissionDTO])
 async def get_role_permissions(
     role_id: str,
     current_user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(create_db_session)],
-    skip: int = Query(0, ge=0, description="Number of permissions to skip"),
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
+    cursor: str | None = Query(
+        None, description="Cursor of the page to return"
+    ),
     limit: int = Query(
         10, ge=1, le=100, description="Number of permissions to return"
     ),
@@ -86,7 +93,7 @@ async def get_role_permissions(
         db_session=db_session,
         current_user=current_user,
         role_id=role_id,
-        skip=skip,
+        cursor=cursor,
         limit=limit,
     )
 
@@ -96,7 +103,7 @@ async def remove_role_from_user(
     user_id: str,
     role_id: str,
     current_user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
 ):
     """Remove a role from a user (admin only or with proper permissions)."""
     return await user_provider.remove_role_from_user(
@@ -110,7 +117,7 @@ async def remove_role_from_user(
 @router.get("/admin-check", response_model=bool)
 async def is_admin_check(
     current_user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
 ):
     """Check if the current user is an admin."""
     return await user_provider.is_admin(
@@ -119,11 +126,13 @@ async def is_admin_check(
     )
 
 
-@router.get("/roles", response_model=List[RoleDTO])
+@router.get("/roles", response_model=PageDTO[RoleDTO])
 async def get_all_roles(
     current_user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(create_db_session)],
-    skip: int = Query(0, ge=0, description="Number of roles to skip"),
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
+    cursor: str | None = Query(
+        None, description="Cursor of the page to return"
+    ),
     limit: int = Query(
         10, ge=1, le=100, description="Number of roles to return"
     ),
@@ -132,16 +141,18 @@ async def get_all_roles(
     return await user_provider.get_all_roles(
         db_session=db_session,
         current_user=current_user,
-        skip=skip,
+        cursor=cursor,
         limit=limit,
     )
 
 
-@router.get("/permissions", response_model=List[PermissionDTO])
+@router.get("/permissions", response_model=PageDTO[PermissionDTO])
 async def get_all_permissions(
     current_user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(create_db_session)],
-    skip: int = Query(0, ge=0, description="Number of permissions to skip"),
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
+    cursor: str | None = Query(
+        None, description="Cursor of the page to return"
+    ),
     limit: int = Query(
         10, ge=1, le=100, description="Number of permissions to return"
     ),
@@ -150,7 +161,7 @@ async def get_all_permissions(
     return await user_provider.get_all_permissions(
         db_session=db_session,
         current_user=current_user,
-        skip=skip,
+        cursor=cursor,
         limit=limit,
     )
 
@@ -159,7 +170,7 @@ async def get_all_permissions(
 async def create_role(
     data: CreateRoleDTO,
     current_user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
 ):
     """Create a new role (admin only or with proper permissions)."""
     return await user_provider.create_role(
@@ -173,7 +184,7 @@ async def create_role(
 async def delete_role(
     role_id: str,
     current_user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
 ):
     """Delete a role (admin only or with proper permissions)."""
     return await user_provider.delete_role(
@@ -188,7 +199,7 @@ async def assign_role_to_user(
     user_id: str,
     role_id: str,
     current_user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
 ):
     """Assign a role to a user (admin only or with proper permissions)."""
     return await user_provider.assign_role_to_user(
@@ -203,7 +214,7 @@ async def assign_role_to_user(
 async def create_permission(
     data: CreatePermissionDTO,
     current_user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
 ):
     """Create a new permission (admin only or with proper permissions)."""
     return await user_provider.create_permission(
@@ -220,7 +231,7 @@ async def create_permission(
 async def delete_permission(
     permission_id: str,
     current_user: Annotated[User, Depends(get_current_user)],
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
 ):
     """Delete a permission (admin only or with proper permissions)."""
     return await user_provider.delete_permission(
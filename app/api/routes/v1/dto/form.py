@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import List, Literal
 from uuid import UUID
 
@@ -19,6 +20,8 @@ FormFieldType = Literal[
     "Alphanum",
 ]
 
+ResponseExportFormat = Literal["csv", "ndjson"]
+
 
 class FormTranslationModel(BaseModel):
     form: "FormDTO"
@@ -83,6 +86,10 @@ class ResponseCreationDTO(BaseModel):
     value: str | None
 
 
+class BatchResponseCreationDTO(BaseModel):
+    answers: List[ResponseCreationDTO]
+
+
 class FieldResponseDTO(BaseModel):
     id: UUID
     field_id: UUID
@@ -96,3 +103,25 @@ class AnswerSessionDTO(BaseModel):
     form_id: UUID
     answers: List[FieldResponseDTO]
     submitted: bool
+
+
+class FieldStatsDTO(BaseModel):
+    field_id: UUID
+    label: str
+    field_type: str
+    answered: int  # Submitted sessions with a non-empty answer
+    # Boolean, Select and Multiselect fields only
+    option_counts: dict[str, int] | None = None
+    # Numerical fields only
+    min: float | None = None
+    max: float | None = None
+    mean: float | None = None
+
+
+class FormStatsDTO(BaseModel):
+    form_id: UUID
+    started: int
+    submitted: int
+    completion_rate: float
+    fields: List[FieldStatsDTO]
+    refreshed_at: datetime
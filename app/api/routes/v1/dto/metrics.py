@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class LatencyDTO(BaseModel):
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+class DBPoolStatsDTO(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    waiting: int
+    checkouts: int
+    timeouts: int
+    wait: LatencyDTO
+
+
+class CacheStatsDTO(BaseModel):
+    size: int
+    max_size: int
+    ttl: float
+    hits: int
+    misses: int
+    evictions: int
+    hit_rate: float
+
+
+class HashingPoolStatsDTO(BaseModel):
+    workers: int
+    max_pending: int
+    pending: int
+    rejected: int
+    latency: LatencyDTO
+
+
+class AuthStatsDTO(BaseModel):
+    session_cache: CacheStatsDTO
+    latency: LatencyDTO
+
+
+class ReaperStatsDTO(BaseModel):
+    interval: float
+    batch_size: int
+    running: bool
+    runs: int
+    failures: int
+    last_run_at: datetime | None
+    last_run: dict[str, int]
+    total: dict[str, int]
+    duration: LatencyDTO
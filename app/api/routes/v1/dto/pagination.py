@@ -0,0 +1,11 @@
+from typing import Generic, List, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class PageDTO(BaseModel, Generic[T]):
+    items: List[T]
+    # Pass as `cursor` to get the next page; None on the last page.
+    next_cursor: str | None
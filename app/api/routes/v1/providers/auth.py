@@ -1,9 +1,12 @@
 from datetime import datetime, timezone
+from time import perf_counter
 from typing import Annotated
 
 from fastapi import BackgroundTasks, Cookie, Depends, HTTPException, Response
 from pydantic import EmailStr
-from sqlmodel import Session, or_, select
+from sqlalchemy.orm import joinedload
+from sqlmodel import or_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette.status import HTTP_400_BAD_REQUEST, HTTP_401_UNAUTHORIZED
 
 from app.api.routes.v1.dto.message import MessageResponse
@@ -17,6 +20,7 @@ from app.core.db.models import (
     User,
 )
 from app.core.db.setup import create_db_session
+from app.core.db.utils import rel
 from app.core.security.checkers import (
     check_conditions,
     check_equality,
@@ -32,21 +36,40 @@ from app.core.security.permissions import (
     GlobalPermissionCheckModel,
     PermissionChecker,
 )
+from app.core.security.session_cache import (
+    CachedLoginSession,
+    session_cache,
+)
+from app.core.security.tokens import (
+    AUTH_MODE,
+    AUTH_MODE_TOKEN,
+    SessionClaims,
+    read_session_token,
+    revocation_list,
+    sign_session_token,
+)
 from app.core.services.email import send_templated_email
-from app.utils.crypto import hash_password, verify_password
+from app.core.services.hashing import (
+    hash_password,
+    verify_and_update_password,
+)
 from app.utils.date import utc
 
 USER_SESSION_COOKIE_ID = "user_session_id"
 AUTH_SESSION_COOKIE_ID = "_auths"
 
+# Authenticated requests only need the user; PermissionChecker loads the
+# roles and permissions it needs on its own.
+LOGIN_SESSION_LOAD_OPTIONS = [joinedload(rel(LoginSession.user))]
+
 
 async def verify_account(
-    db_session: Session,
+    db_session: AsyncSession,
     token: str,
     account_verification_session_id: str,  # search param
 ):
     account_verification_session = check_existence(
-        db_session.get(
+        await db_session.get(
             AccountVerificationSession, account_verification_session_id
         ),
         detail="Session not found or expired.",
@@ -69,25 +92,29 @@ async def verify_account(
     if not (account_verification_session.token == token):
         account_verification_session.tries += 1
         db_session.add(account_verification_session)
-        db_session.commit()
+        await db_session.commit()
         raise HTTPException(
             status_code=HTTP_401_UNAUTHORIZED, detail="Invalid password."
         )
-    account_verification_session.user.verified = True
-    db_session.add(account_verification_session.user)
-    db_session.delete(account_verification_session)
-    db_session.commit()
+    user = check_existence(
+        await db_session.get(User, account_verification_session.user_id),
+        detail="User not found.",
+    )
+    user.verified = True
+    db_session.add(user)
+    await db_session.delete(account_verification_session)
+    await db_session.commit()
     return MessageResponse(message="Account verified successfully.")
 
 
 async def authenticate(
-    db_session: Session,
+    db_session: AsyncSession,
     token: str,
     auth_session_id: str,  # cookie
     response: Response,
 ):
     auth_session = check_existence(
-        db_session.get(AuthSession, auth_session_id),
+        await db_session.get(AuthSession, auth_session_id),
         detail="Session expired.",
         status_code=HTTP_400_BAD_REQUEST,
     )
@@ -99,7 +126,7 @@ async def authenticate(
     if not auth_session.token == token:
         auth_session.tries += 1
         db_session.add(auth_session)
-        db_session.commit()
+        await db_session.commit()
         raise HTTPException(
             detail="Token invalid.", status_code=HTTP_400_BAD_REQUEST
         )
@@ -108,12 +135,22 @@ async def authenticate(
     auth_session.expired = True
     db_session.add(login_session)
     db_session.add(auth_session)
-    db_session.commit()
-    db_session.refresh(login_session)
+    await db_session.commit()
+    await db_session.refresh(login_session)
+
+    session_cookie = login_session.id
+    if AUTH_MODE == AUTH_MODE_TOKEN:
+        session_cookie = sign_session_token(
+            SessionClaims(
+                sub=login_session.user_id,
+                jti=login_session.id,
+                exp=int(utc(login_session.expires_at).timestamp()),
+            )
+        )
 
     response.set_cookie(
         key=USER_SESSION_COOKIE_ID,
-        value=login_session.id,
+        value=session_cookie,
         expires=utc(login_session.expires_at),
         httponly=True,
         secure=True,
@@ -122,9 +159,13 @@ async def authenticate(
     response.delete_cookie(AUTH_SESSION_COOKIE_ID)
 
 
-async def send_verification_email(db_session: Session, email: EmailStr):
+async def send_verification_email(
+    db_session: AsyncSession, email: EmailStr, bt: BackgroundTasks
+):
     user = check_existence(
-        db_session.exec(select(User).where(User.email == email)).first(),
+        (
+            await db_session.exec(select(User).where(User.email == email))
+        ).first(),
         detail="User not found.",
     )
     account_verification_session = AccountVerificationSession(user_id=user.id)
@@ -134,9 +175,10 @@ async def send_verification_email(db_session: Session, email: EmailStr):
         + account_verification_session.id
     )
     db_session.add(account_verification_session)
-    db_session.commit()
-    db_session.refresh(account_verification_session)
-    send_templated_email(
+    await db_session.commit()
+    await db_session.refresh(account_verification_session)
+    bt.add_task(
+        send_templated_email,
         email=email,
         subject="Verify your account",
         template_name="account_verification",
@@ -149,7 +191,7 @@ async def send_verification_email(db_session: Session, email: EmailStr):
 
 
 async def register(
-    db_session: Session,
+    db_session: AsyncSession,
     username: str,
     email: EmailStr,
     password: str,
@@ -159,7 +201,7 @@ async def register(
 ):
     check_non_existence(
         (
-            db_session.exec(
+            await db_session.exec(
                 select(User).where(
                     or_(User.email == email, User.username == username)
                 )
@@ -167,14 +209,14 @@ async def register(
         ).first()
     )
     check_equality(password, password_confirm)
-    hashed_password = hash_password(password=password)
+    hashed_password = await hash_password(password=password)
     user = User(
         username=username,
         email=email,
         hashed_password=hashed_password,
         name=name,
     )
-    role = RoleBuilder().addUser(user).make()
+    role = RoleBuilder().addUser(user).ownedBy(user).make()
     admin_role = (
         RoleBuilder().addUser(user).withName(ADMIN_ROLE_NAME).make()
         if email.lower() in get_env("ADMIN_EMAILS").split(",")
@@ -201,9 +243,8 @@ async def register(
     if super_admin_role is not None:
         db_session.add(super_admin_role)
 
-    bt.add_task(send_verification_email, db_session=db_session, email=email)
-
-    db_session.commit()
+    await db_session.commit()
+    await send_verification_email(db_session=db_session, email=email, bt=bt)
     return MessageResponse(
         message="Registered !"
         + " An email verification mail was sent to your inbox."
@@ -211,21 +252,30 @@ async def register(
 
 
 async def login(
-    db_session: Session,
+    db_session: AsyncSession,
     email: EmailStr,
     password: str,
     response: Response,
     bt: BackgroundTasks,
 ):
     user = check_existence(
-        (db_session.exec(select(User).where(User.email == email))).first()
+        (
+            await db_session.exec(select(User).where(User.email == email))
+        ).first()
+    )
+    verified, new_hash = await verify_and_update_password(
+        password, user.hashed_password
     )
-    check_conditions([verify_password(password, user.hashed_password)])
+    check_conditions([verified])
+    if new_hash is not None:
+        # Stored hash used outdated parameters, keep the upgraded one.
+        user.hashed_password = new_hash
+        db_session.add(user)
 
     if get_env("ALLOW_ADMINS_ONLY") == "True":
-        PermissionChecker(
+        await PermissionChecker(
             db_session=db_session,
-            roles=user.roles,
+            user=user,
             bypass_roles=[ADMIN_ROLE_NAME, SUPER_ADMIN_ROLE_NAME],
             pcheck_models=[
                 GlobalPermissionCheckModel(
@@ -236,8 +286,8 @@ async def login(
 
     auth_session = AuthSession(user_id=user.id)
     db_session.add(auth_session)
-    db_session.commit()
-    db_session.refresh(auth_session)
+    await db_session.commit()
+    await db_session.refresh(auth_session)
 
     response.set_cookie(key=AUTH_SESSION_COOKIE_ID, value=auth_session.id)
 
@@ -255,52 +305,131 @@ async def login(
     return MessageResponse(message="OTP sent to your email.")
 
 
-async def get_current_user(
-    db_session: Annotated[Session, Depends(create_db_session)],
-    session_id: Annotated[str | None, Cookie(alias="user_session_id")] = None,
-):
+async def load_session(
+    db_session: AsyncSession, session_id: str, is_ws: bool = False
+) -> tuple[CachedLoginSession, User]:
     login_session = check_existence(
-        db_session.get(
+        await db_session.get(
             LoginSession,
-            check_existence(session_id, detail="Not authenticated"),
+            session_id,
+            options=LOGIN_SESSION_LOAD_OPTIONS,
         ),
+        is_ws=is_ws,
         status_code=HTTP_401_UNAUTHORIZED,
         detail="Not authenticated.",
     )
-    check_conditions(
-        [
-            utc(login_session.expires_at) > datetime.now(timezone.utc),
-            not login_session.expired,
-            login_session.user.verified,
-        ],
+    return (
+        CachedLoginSession.from_login_session(login_session),
+        login_session.user,
+    )
+
+
+async def load_token_session(
+    db_session: AsyncSession, claims: SessionClaims, is_ws: bool = False
+) -> tuple[CachedLoginSession, User]:
+    # The signature only proves the token was issued; its login session
+    # row is what a logout on any worker marks as expired.
+    cached, user = await load_session(db_session, claims.jti, is_ws=is_ws)
+    check_equality(
+        user.id,
+        claims.sub,
+        is_ws=is_ws,
+        status_code=HTTP_401_UNAUTHORIZED,
         detail="Not authenticated.",
     )
-    return login_session.user
+    return cached, user
+
+
+async def get_session_user(
+    db_session: AsyncSession, session_id: str | None, is_ws: bool = False
+) -> User:
+    """
+    Resolves the user of a login session, from the session cache when
+    possible so that the common case needs no database round-trip.
+    """
+    started = perf_counter()
+    try:
+        session_id = check_existence(
+            session_id,
+            is_ws=is_ws,
+            status_code=HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated.",
+        )
+        claims = None
+        if AUTH_MODE == AUTH_MODE_TOKEN:
+            claims = check_existence(
+                read_session_token(session_id),
+                is_ws=is_ws,
+                status_code=HTTP_401_UNAUTHORIZED,
+                detail="Not authenticated.",
+            )
+            session_id = claims.jti
+        cached = session_cache.get(session_id)
+        if cached is not None:
+            user = await cached.attach_user(db_session)
+        else:
+            # A logout committed while the session loads must not be
+            # undone by caching what the load saw.
+            version = session_cache.version()
+            if claims is not None:
+                cached, user = await load_token_session(
+                    db_session, claims, is_ws=is_ws
+                )
+            else:
+                cached, user = await load_session(
+                    db_session, session_id, is_ws=is_ws
+                )
+            session_cache.set(session_id, version, cached)
+        check_conditions(
+            [
+                cached.expires_at > datetime.now(timezone.utc),
+                not cached.expired,
+                user.verified,
+            ],
+            detail="Not authenticated.",
+            is_ws=is_ws,
+        )
+        return user
+    finally:
+        session_cache.latency.record(perf_counter() - started)
+
+
+async def get_current_user(
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
+    session_id: Annotated[str | None, Cookie(alias="user_session_id")] = None,
+):
+    return await get_session_user(db_session, session_id)
 
 
 async def ws_get_current_user(
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
     session_id: Annotated[str | None, Cookie(alias="user_session_id")] = None,
 ):
-    login_session = check_existence(
-        db_session.get(LoginSession, session_id),
-        status_code=HTTP_401_UNAUTHORIZED,
-        detail="Not authenticated.",
-    )
-    check_conditions(
-        [
-            utc(login_session.expires_at) > datetime.now(timezone.utc),
-            not login_session.expired,
-            login_session.user.verified,
-        ],
-        detail="Not authenticated.",
-        is_ws=True,
-    )
-    return login_session.user
+    return await get_session_user(db_session, session_id, is_ws=True)
+
+
+async def logout(
+    db_session: AsyncSession, session_id: str | None, response: Response
+):
+    if session_id is not None and AUTH_MODE == AUTH_MODE_TOKEN:
+        claims = read_session_token(session_id)
+        session_id = None
+        if claims is not None:
+            revocation_list.revoke(claims)
+            session_id = claims.jti
+    if session_id is not None:
+        login_session = await db_session.get(LoginSession, session_id)
+        if login_session is not None:
+            login_session.expired = True
+            db_session.add(login_session)
+            await db_session.commit()
+        session_cache.evict(session_id)
+    response.delete_cookie(key=USER_SESSION_COOKIE_ID, httponly=True)
+    return MessageResponse(message="Logged out successfully.")
 
 
 async def get_current_user_optional(
-    db_session: Annotated[Session, Depends(create_db_session)],
+    db_session: Annotated[AsyncSession, Depends(create_db_session)],
     session_id: Annotated[str | None, Cookie(alias="user_session_id")] = None,
 ) -> User | None:
     """Get current user without throwing errors if not authenticated"""
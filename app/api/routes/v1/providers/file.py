@@ -1,18 +1,31 @@
-from io import BytesIO
-from typing import Optional
+from typing import AsyncGenerator, Generator, Optional
 from uuid import UUID
 
-from fastapi import HTTPException, UploadFile
-from fastapi.responses import StreamingResponse
-from sqlmodel import Session, select
+from fastapi import HTTPException, Request, UploadFile
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.responses import (
+    FileResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette.status import (
+    HTTP_304_NOT_MODIFIED,
+    HTTP_307_TEMPORARY_REDIRECT,
     HTTP_400_BAD_REQUEST,
-    HTTP_500_INTERNAL_SERVER_ERROR,
+    HTTP_404_NOT_FOUND,
 )
 
 from app.api.routes.v1.dto.message import MessageResponse
+from app.api.routes.v1.dto.pagination import PageDTO
 from app.core.db.builders.permission import PermissionBuilder
-from app.core.db.models import FileResource, Role, User
+from app.core.db.models import FileResource, User
+from app.core.db.pagination import paginate
+from app.core.db.utils import rel
+from app.core.logging.log import log_error
 from app.core.security.checkers import check_existence
 from app.core.security.permissions import (
     ACTION_READ,
@@ -24,20 +37,54 @@ from app.core.security.permissions import (
     GlobalPermissionCheckModel,
     PermissionChecker,
     PermissionCheckModel,
+    get_owner_role,
 )
 from app.core.services import storage
+from app.core.services.storage_backends import content_disposition
+from app.utils.conditional import (
+    PRIVATE_CACHE_CONTROL,
+    is_not_modified,
+    validator_headers,
+)
+
+FILE_CACHE_CONTROL = "public, max-age=86400"
+
+
+async def locate_file(resource: FileResource) -> str:
+    try:
+        return await run_in_threadpool(storage.locate, resource)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=HTTP_404_NOT_FOUND, detail="File not found."
+        )
+
+
+async def stream_chunks(chunks: Generator[bytes]) -> AsyncGenerator[bytes]:
+    """
+    Reads a stored file in a worker thread and closes it when the response
+    ends, including when a disconnected client cancels it.
+    """
+    try:
+        async for chunk in iterate_in_threadpool(chunks):
+            yield chunk
+    finally:
+        chunks.close()
 
 
 async def get_file_resource(
-    db_session: Session, current_user: User | None, resource_id: UUID
+    db_session: AsyncSession,
+    request: Request,
+    current_user: User | None,
+    resource_id: UUID,
 ):
     resource = check_existence(
-        db_session.get(FileResource, resource_id), detail="File not found."
+        await db_session.get(FileResource, resource_id),
+        detail="File not found.",
     )
     if resource.protected is True:
         user = check_existence(current_user)
-        PermissionChecker(
-            roles=user.roles,
+        await PermissionChecker(
+            user=user,
             db_session=db_session,
             pcheck_models=[
                 PermissionCheckModel(
@@ -52,23 +99,60 @@ async def get_file_resource(
                 ),
             ],
         ).check(either=True)
+    key = None
+    if resource.sha256 is None:
+        # Files stored before content hashes were recorded are hashed on
+        # their first download.
+        key = await locate_file(resource)
+        resource.sha256 = await run_in_threadpool(storage.hash_stored, key)
+        db_session.add(resource)
+        await db_session.commit()
+    # The ETag comes from the row, so a 304 never touches storage.
+    etag = f'"{resource.sha256}"'
+    headers = validator_headers(
+        etag,
+        resource.created_at,
+        PRIVATE_CACHE_CONTROL if resource.protected else FILE_CACHE_CONTROL,
+    )
+    if is_not_modified(request, etag, resource.created_at):
+        return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+    if key is None:
+        key = await locate_file(resource)
+    url = storage.backend.presigned_url(key, resource.name, resource.filetype)
+    if url is not None:
+        # The URL expires, so the redirect itself must not be cached.
+        return RedirectResponse(
+            url,
+            status_code=HTTP_307_TEMPORARY_REDIRECT,
+            headers={"Cache-Control": "no-store"},
+        )
+    path = storage.backend.local_path(key)
+    if path is not None:
+        # Streams from disk in chunks and answers Range requests with 206.
+        return FileResponse(
+            path,
+            media_type=resource.filetype,
+            filename=resource.name,
+            headers=headers,
+        )
+    headers["Content-Disposition"] = content_disposition(resource.name)
+    chunks = await run_in_threadpool(storage.backend.get_stream, key)
     return StreamingResponse(
-        content=BytesIO(
-            storage.get_file(resource),
-        ),
-        headers={
-            "Content-Disposition": f"attachment; filename={resource.name}",
-            "Content-Type": resource.filetype,
-        },
+        stream_chunks(chunks),
+        media_type=resource.filetype,
+        headers=headers,
     )
 
 
 async def get_files_list(
-    db_session: Session, current_user: User, skip: int, limit: int
+    db_session: AsyncSession,
+    current_user: User,
+    cursor: str | None,
+    limit: int,
 ):
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_roles=[ADMIN_ROLE_NAME, SUPER_ADMIN_ROLE_NAME],
         pcheck_models=[
             GlobalPermissionCheckModel(
@@ -76,26 +160,23 @@ async def get_files_list(
             )
         ],
     ).check()
-    files = db_session.exec(
-        select(FileResource).offset(skip).limit(limit)
-    ).all()
-    return [file.to_dto() for file in files]
+    files, next_cursor = await paginate(
+        db_session,
+        select(FileResource).options(selectinload(rel(FileResource.owner))),
+        sort_columns=[FileResource.created_at, FileResource.id],
+        cursor=cursor,
+        limit=limit,
+    )
+    return PageDTO(
+        items=[file.to_dto() for file in files], next_cursor=next_cursor
+    )
 
 
-async def create_file_resource(
-    db_session: Session,
-    current_user: User,
-    file: UploadFile,
-    name: Optional[str] = None,
-    protected: bool = False,
-):
-    if not file.size:
-        raise HTTPException(
-            status_code=HTTP_400_BAD_REQUEST,
-            detail="File size is required",
-        )
-
-    if file.size > 5 * 1024 * 1024:
+def check_upload(file: UploadFile) -> tuple[str, str]:
+    """Returns the name and content type of the upload, both required."""
+    # The declared size is only a hint, the limit is enforced while the
+    # upload is written.
+    if file.size is not None and file.size > storage.MAX_FILE_SIZE:
         raise HTTPException(
             status_code=HTTP_400_BAD_REQUEST,
             detail="File size exceeds 5MB limit",
@@ -111,116 +192,138 @@ async def create_file_resource(
             status_code=HTTP_400_BAD_REQUEST,
             detail="File content type is required",
         )
+    return file.filename, file.content_type
+
+
+async def save_upload(
+    db_session: AsyncSession, file: UploadFile, resource: FileResource
+):
+    """
+    Stages an upload off the event loop, hashing it on the way, and stores
+    it unless a blob with the same digest already exists.
+    """
+    staged = None
+    try:
+        staged = await run_in_threadpool(storage.stage_stream, file.file)
+        if staged.size == 0:
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST,
+                detail="File size is required",
+            )
+        await storage.store_blob(db_session, staged)
+        resource.sha256 = staged.digest
+    except storage.FileTooLargeError:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail="File size exceeds 5MB limit",
+        )
+    except OSError:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail="Failed to save file.",
+        )
+    finally:
+        if staged is not None:
+            await run_in_threadpool(storage.discard_staged, staged)
 
+
+async def create_file_resource(
+    db_session: AsyncSession,
+    current_user: User,
+    file: UploadFile,
+    name: Optional[str] = None,
+    protected: bool = False,
+):
+    filename, content_type = check_upload(file)
     resource = FileResource(
         user_id=current_user.id,
-        name=name or file.filename,
+        name=name or filename,
         protected=protected,
-        filetype=file.content_type,
+        filetype=content_type,
     )
 
-    rw_role = Role(users=[current_user])
+    owner_role = await get_owner_role(db_session, current_user)
     permission = (
         PermissionBuilder()
-        .forRole(rw_role)
+        .forRole(owner_role)
         .withResourceName(FILE_RESOURCE)
         .withResourceId(str(resource.id))
         .withActionName(ACTION_READWRITE)
     ).make()
 
-    try:
-        storage.write_file(file, resource)
-    except Exception:
-        db_session.rollback()
-        raise HTTPException(
-            status_code=HTTP_400_BAD_REQUEST,
-            detail="Failed to save file.",
-        )
-
     db_session.add(resource)
-    db_session.add(rw_role)
     db_session.add(permission)
-    db_session.commit()
+    try:
+        await save_upload(db_session, file, resource)
+        await db_session.commit()
+    except BaseException:
+        # Whatever kept the row from being committed, including a
+        # cancelled request, its blob may now be unreferenced.
+        await db_session.rollback()
+        if resource.sha256 is not None:
+            await storage.release_file(db_session, resource)
+        raise
+    await db_session.refresh(resource, ["owner"])
 
     return resource.to_dto()
 
 
 async def create_file_resources(
-    db_session: Session,
+    db_session: AsyncSession,
     current_user: User,
     files: list[UploadFile],
     protected: bool = False,
 ):
+    # Every file is checked before any is stored, so a rejected file never
+    # leaves the ones before it in storage.
+    uploads = [(file, *check_upload(file)) for file in files]
     resources: list[FileResource] = []
-    for file in files:
-        if not file.size:
-            raise HTTPException(
-                status_code=HTTP_400_BAD_REQUEST,
-                detail="File size is required",
-            )
-
-        if file.size > 5 * 1024 * 1024:
-            raise HTTPException(
-                status_code=HTTP_400_BAD_REQUEST,
-                detail="File size exceeds 5MB limit",
-            )
-        if not file.filename:
-            raise HTTPException(
-                status_code=HTTP_400_BAD_REQUEST,
-                detail="File name is required",
-            )
-
-        if not file.content_type:
-            raise HTTPException(
-                status_code=HTTP_400_BAD_REQUEST,
-                detail="File content type is required",
-            )
-
-        # Create media record
-        resource = FileResource(
-            user_id=current_user.id,
-            name=file.filename,
-            protected=protected,
-            filetype=file.content_type,
-        )
-        rw_role = Role(users=[current_user])
-        permission = (
-            PermissionBuilder()
-            .forRole(rw_role)
-            .withResourceName(FILE_RESOURCE)
-            .withResourceId(str(resource.id))
-            .withActionName(ACTION_READWRITE)
-        ).make()
-        db_session.add(rw_role)
-        db_session.add(permission)
-        db_session.add(resource)
-        resources.append(resource)
-
-        try:
-            storage.write_file(file, resource)
-        except Exception as e:
-            db_session.rollback()
-            raise HTTPException(
-                status_code=HTTP_400_BAD_REQUEST,
-                detail=f"Failed to save file: {str(e)}",
+    owner_role = await get_owner_role(db_session, current_user)
+    try:
+        for file, filename, content_type in uploads:
+            # Create media record
+            resource = FileResource(
+                user_id=current_user.id,
+                name=filename,
+                protected=protected,
+                filetype=content_type,
             )
+            permission = (
+                PermissionBuilder()
+                .forRole(owner_role)
+                .withResourceName(FILE_RESOURCE)
+                .withResourceId(str(resource.id))
+                .withActionName(ACTION_READWRITE)
+            ).make()
+            db_session.add(permission)
+            db_session.add(resource)
+            await save_upload(db_session, file, resource)
+            resources.append(resource)
+        await db_session.commit()
+    except BaseException:
+        # Whatever interrupted the batch, including a cancelled request,
+        # the blobs stored so far are no longer referenced.
+        await db_session.rollback()
+        for saved in resources:
+            await storage.release_file(db_session, saved)
+        raise
 
-    db_session.commit()
     for resource in resources:
-        db_session.refresh(resource)
+        await db_session.refresh(resource, ["owner"])
 
     return [resource.to_dto() for resource in resources]
 
 
 async def delete_file_resource(
-    db_session: Session, user: User, resource_id: UUID
+    db_session: AsyncSession, user: User, resource_id: UUID
 ):
     resource = check_existence(
-        db_session.get(FileResource, resource_id), detail="File not found."
+        await db_session.get(FileResource, resource_id),
+        detail="File not found.",
     )
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
-        roles=user.roles,
+        user=user,
         pcheck_models=[
             PermissionCheckModel(
                 resource_name=FILE_RESOURCE,
@@ -229,13 +332,11 @@ async def delete_file_resource(
             )
         ],
     ).check()
-    db_session.delete(resource)
+    await db_session.delete(resource)
+    await db_session.commit()
     try:
-        storage.delete_file(resource)
-    except Exception:
-        db_session.rollback()
-        raise HTTPException(
-            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Could not delete file.",
-        )
+        await storage.release_file(db_session, resource)
+    except OSError as e:
+        # The row is gone; an unreleased blob only costs disk space.
+        log_error(f"Could not remove content of file {resource.id}: {e}")
     return MessageResponse(message="File deleted successfully")
@@ -1,30 +1,42 @@
-from datetime import date
-from uuid import UUID
-
-import phonenumbers
-from fastapi import HTTPException, Response
-from pydantic import EmailStr, HttpUrl, TypeAdapter, constr
-from sqlmodel import Session, select
+import csv
+import json
+from io import StringIO
+from typing import AsyncIterator, Sequence
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import selectinload
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette.status import (
     HTTP_401_UNAUTHORIZED,
     HTTP_422_UNPROCESSABLE_ENTITY,
 )
 
 from app.api.routes.v1.dto.form import (
+    BatchResponseCreationDTO,
+    FieldResponseDTO,
     FormFieldType,
+    FormStatsDTO,
     FormTranslationModel,
     ResponseCreationDTO,
+    ResponseExportFormat,
 )
 from app.api.routes.v1.dto.message import MessageResponse
+from app.api.routes.v1.dto.pagination import PageDTO
 from app.core.db.builders.permission import PermissionBuilder
-from app.core.db.builders.role import RoleBuilder
 from app.core.db.models import (
     AnswerSession,
     FieldAnswer,
     Form,
     FormField,
+    FormStats,
     User,
 )
+from app.core.db.pagination import paginate
+from app.core.db.setup import engine
+from app.core.db.utils import rel, upsert_statement
 from app.core.logging.log import log_warning
 from app.core.security.checkers import (
     check_conditions,
@@ -40,25 +52,38 @@ from app.core.security.permissions import (
     GlobalPermissionCheckModel,
     PermissionChecker,
     PermissionCheckModel,
+    get_owner_role,
 )
 from app.core.services.ai.translation import (
     SupportedLanguages,
     translate,
     translate_json,
 )
+from app.core.services.form_stats import (
+    count_submitted,
+    form_stats_refresher,
+    refresh_form_stats,
+)
+from app.core.services.form_validation import field_validators
+from app.utils.conditional import (
+    PRIVATE_CACHE_CONTROL,
+    PUBLIC_CACHE_CONTROL,
+    conditional_response,
+)
 
 ANSWER_SESSION_COOKIE_KEY = "response_session_id"
+EXPORT_BATCH_SIZE = 1000
 
 
 async def create_form(
-    db_session: Session,
+    db_session: AsyncSession,
     current_user: User,
     title: str,
     description: str | None = None,
 ):
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_roles=[ADMIN_ROLE_NAME, SUPER_ADMIN_ROLE_NAME],
         pcheck_models=[
             GlobalPermissionCheckModel(
@@ -67,24 +92,28 @@ async def create_form(
         ],
     ).check()
     form = Form(user_id=current_user.id, label=title, description=description)
-    rw_role = RoleBuilder().addUser(current_user).make()
+    owner_role = await get_owner_role(db_session, current_user)
     rw_permission = (
         PermissionBuilder()
         .withResourceName(FORM_RESOURCE)
         .withActionName(ACTION_READWRITE)
         .withResourceId(form.id)
-        .forRole(rw_role)
+        .forRole(owner_role)
     ).make()
-    db_session.add_all([form, rw_role, rw_permission])
-    db_session.commit()
-    db_session.refresh(form)
+    db_session.add_all([form, rw_permission])
+    await db_session.commit()
+    await db_session.refresh(form, ["fields"])
     return form.to_dto()
 
 
 async def translate_form(
-    db_session: Session, form_id: UUID, language: SupportedLanguages
+    db_session: AsyncSession, form_id: UUID, language: SupportedLanguages
 ):
-    form = check_existence(db_session.get(Form, form_id))
+    form = check_existence(
+        await db_session.get(
+            Form, form_id, options=[selectinload(rel(Form.fields))]
+        )
+    )
     form_fields = [form_field.to_dto() for form_field in form.fields]
     data = FormTranslationModel(form=form.to_dto(), fields=form_fields)
     translated_form = await translate_json(
@@ -94,10 +123,8 @@ async def translate_form(
     return FormTranslationModel.model_validate_json(translated_form)
 
 
-
-
 async def add_field_to_form(
-    db_session: Session,
+    db_session: AsyncSession,
     current_user: User,
     form_id: UUID,
     field_label: str,
@@ -108,10 +135,10 @@ async def add_field_to_form(
     number_bounds: str | None = None,
     text_bounds: str | None = None,
 ):
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
         bypass_role=SUPER_ADMIN_ROLE_NAME,
-        roles=current_user.roles,
+        user=current_user,
         pcheck_models=[
             PermissionCheckModel(
                 resource_name=FORM_RESOURCE,
@@ -141,27 +168,33 @@ async def add_field_to_form(
     field.number_bounds = number_bounds
     field.text_bounds = text_bounds
 
-    rw_role = RoleBuilder().addUser(current_user).make()
+    form = check_existence(await db_session.get(Form, form_id))
+    form.touch()
+    owner_role = await get_owner_role(db_session, current_user)
     rw_permission = (
         PermissionBuilder()
         .withResourceName(FORM_FIELD_RESOURCE)
         .withResourceId(field.id)
         .withActionName(ACTION_READWRITE)
-        .forRole(rw_role)
+        .forRole(owner_role)
     ).make()
-    db_session.add_all([field, rw_role, rw_permission])
-    db_session.commit()
-    db_session.refresh(field)
+    db_session.add_all([form, field, rw_permission])
+    await db_session.commit()
+    await db_session.refresh(field)
     return field.to_dto()
 
 
 async def delete_field(
-    db_session: Session, current_user: User, field_id: UUID
+    db_session: AsyncSession, current_user: User, field_id: UUID
 ):
-    field = check_existence(db_session.get(FormField, field_id))
-    PermissionChecker(
+    field = check_existence(
+        await db_session.get(
+            FormField, field_id, options=[selectinload(rel(FormField.answers))]
+        )
+    )
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         pcheck_models=[
             PermissionCheckModel(
                 resource_name=FORM_FIELD_RESOURCE,
@@ -175,153 +208,173 @@ async def delete_field(
             ),
         ],
     ).check()
-    db_session.delete(field)
-    db_session.commit()
+    form = check_existence(await db_session.get(Form, field.form_id))
+    form.touch()
+    db_session.add(form)
+    await db_session.delete(field)
+    await db_session.commit()
+    field_validators.evict(field_id)
+    form_stats_refresher.mark_stale(field.form_id)
     return MessageResponse(message="Field deleted successfully !")
 
 
 def validate_answer(answer: str | None, field: FormField):
-    number_bounds = (
-        [int(bound) for bound in field.number_bounds.split(":")]
-        if field.number_bounds is not None
-        else None
-    )
-    text_bounds = (
-        [int(bound) for bound in field.text_bounds.split(":")]
-        if field.text_bounds is not None
-        else None
-    )
-    possible_answers = (
-        [field.strip() for field in field.possible_answers.split("\\")]
-        if field.possible_answers is not None
-        else None
-    )
-
-    value = str(answer or "")
-    try:
-        check_conditions(
-            [
-                not (
-                    field.required is True and (answer is None or answer == "")
-                ),
-                not (
-                    field.field_type == "Boolean" and answer not in ["0", "1"]
-                ),
-                not (
-                    field.field_type == "Multiselect"
-                    and any(
-                        value not in (possible_answers or [])
-                        for value in (answer or "").split(",")
-                    )
-                ),
-                not (
-                    field.field_type == "Select"
-                    and answer not in (possible_answers or [])
-                ),
-                not (
-                    field.field_type == "Numerical"
-                    and number_bounds is not None
-                    and (
-                        not value.isdigit()
-                        or not (
-                            int(value) >= (number_bounds or [0, 0])[0]
-                            and int(value) <= (number_bounds or [0, 0])[1]
-                        )
-                    )
-                ),
-                not (
-                    (
-                        field.field_type == "Text"
-                        or field.field_type == "LongText"
-                    )
-                    and text_bounds is not None
-                    and not (
-                        len(value) >= (text_bounds or [0, 0])[0]
-                        and len(value) <= (text_bounds or [0, 0])[1]
-                    )
-                ),
-            ],
-            status_code=HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="Could not validate answer",
-        )
-        # Pydantic validation
-        match field.field_type:
-            case "Email":
-                TypeAdapter(EmailStr).validate_python(value)
-            case "Phone":
-                try:
-                    parsed_phonenumber = phonenumbers.parse(value)
-                    check_conditions(
-                        [phonenumbers.is_valid_number(parsed_phonenumber)]
-                    )
-                except phonenumbers.NumberParseException:
-                    raise HTTPException(
-                        status_code=HTTP_422_UNPROCESSABLE_ENTITY
-                    )
-            case "Date":
-                TypeAdapter(date).validate_python(value)
-            case "URL":
-                TypeAdapter(HttpUrl).validate_python(value)
-            case "Alpha":
-                AlphaStr = constr(pattern=r"^[a-zA-Z ]+$")
-                TypeAdapter(AlphaStr).validate_python(value)
-            case "Alphanum":
-                AlphanumStr = constr(pattern=r"^[a-zA-Z0-9 ]+$")
-                TypeAdapter(AlphanumStr).validate_python(value)
-    except Exception:
-        raise HTTPException(status_code=HTTP_422_UNPROCESSABLE_ENTITY)
+    check_conditions(
+        [field_validators.get(field)(answer)],
+        status_code=HTTP_422_UNPROCESSABLE_ENTITY,
+        detail="Could not validate answer",
+    )
+
+
+async def upsert_answers(
+    db_session: AsyncSession,
+    session_id: UUID,
+    values: dict[UUID, str | None],
+) -> dict[UUID, UUID]:
+    """
+    Inserts or updates the answers of a session to the given fields in one
+    statement and returns the answer id for each field id.
+    """
+    statement = upsert_statement(db_session, FieldAnswer).values(
+        [
+            {
+                "id": uuid4(),
+                "session_id": session_id,
+                "field_id": field_id,
+                "value": value,
+            }
+            for field_id, value in values.items()
+        ]
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["session_id", "field_id"],
+        set_={"value": statement.excluded.value},
+    ).returning(col(FieldAnswer.field_id), col(FieldAnswer.id))
+    return {
+        field_id: answer_id
+        for field_id, answer_id in (await db_session.execute(statement)).all()
+    }
+
+
+def answer_dto(
+    answer_id: UUID, session_id: UUID, field: FormField, value: str | None
+):
+    return FieldResponseDTO(
+        id=answer_id,
+        field_id=field.id,
+        session_id=session_id,
+        value=value,
+        field=field.to_dto(),
+    )
 
 
 async def respond_to_field(
     api_response: Response,
-    db_session: Session,
+    db_session: AsyncSession,
     response_data: ResponseCreationDTO,
     response_session_id: UUID | None,
 ):
-    field = check_existence(db_session.get(FormField, response_data.field_id))
+    field = check_existence(
+        await db_session.get(
+            FormField,
+            response_data.field_id,
+            options=[selectinload(rel(FormField.form))],
+        )
+    )
     check_conditions([field.form.open is True])
+    validate_answer(answer=response_data.value, field=field)
     response_session: AnswerSession
     if response_session_id is not None:
         response_session = check_existence(
-            db_session.get(AnswerSession, response_session_id)
+            await db_session.get(AnswerSession, response_session_id)
         )
     else:
-        new_rs = AnswerSession(form_id=field.form_id)
-        db_session.add(new_rs)
-        db_session.commit()
-        db_session.refresh(new_rs)
-        response_session = new_rs
-    answer_fields = [
-        response
-        for response in response_session.answers
-        if response.field.id == field.id
-    ]
-    field_already_answered = len(answer_fields) > 0
-    response = (
-        FieldAnswer(field_id=field.id, session_id=response_session.id)
-        if not field_already_answered
-        else answer_fields[0]
+        response_session = AnswerSession(form_id=field.form_id)
+        db_session.add(response_session)
+        await db_session.flush()
+    answer_ids = await upsert_answers(
+        db_session, response_session.id, {field.id: response_data.value}
     )
-    validate_answer(answer=response_data.value, field=field)
-    response.value = response_data.value
-    db_session.add(response)
-    db_session.commit()
+    await db_session.commit()
     api_response.set_cookie(
         key="response_session_id",
         value=str(response_session.id),
         httponly=True,
     )
-    return response.to_dto()
+    return answer_dto(
+        answer_ids[field.id], response_session.id, field, response_data.value
+    )
+
+
+async def respond_to_fields(
+    api_response: Response,
+    db_session: AsyncSession,
+    form_id: UUID,
+    responses_data: BatchResponseCreationDTO,
+    response_session_id: UUID | None,
+):
+    """
+    Saves several answers of one form at once: the fields are loaded in a
+    single query, every answer is validated before anything is written and
+    all of them are upserted by one statement.
+    """
+    form = check_existence(
+        await db_session.get(
+            Form, form_id, options=[selectinload(rel(Form.fields))]
+        )
+    )
+    check_conditions([form.open is True])
+    fields = {field.id: field for field in form.fields}
+    values = {
+        answer.field_id: answer.value for answer in responses_data.answers
+    }
+    check_conditions(
+        [
+            len(values) > 0,
+            all(field_id in fields for field_id in values),
+            len(values) == len(responses_data.answers),
+        ],
+        status_code=HTTP_422_UNPROCESSABLE_ENTITY,
+        detail="Answers must target distinct fields of this form.",
+    )
+    for field_id, value in values.items():
+        validate_answer(answer=value, field=fields[field_id])
+
+    response_session: AnswerSession | None = None
+    if response_session_id is not None:
+        response_session = check_existence(
+            await db_session.get(AnswerSession, response_session_id)
+        )
+        if response_session.form_id != form.id:
+            response_session = None
+    if response_session is None:
+        response_session = AnswerSession(form_id=form.id)
+        db_session.add(response_session)
+        await db_session.flush()
+
+    answer_ids = await upsert_answers(db_session, response_session.id, values)
+    await db_session.commit()
+    api_response.set_cookie(
+        key=ANSWER_SESSION_COOKIE_KEY,
+        value=str(response_session.id),
+        httponly=True,
+    )
+    return [
+        answer_dto(
+            answer_ids[field_id], response_session.id, fields[field_id], value
+        )
+        for field_id, value in values.items()
+    ]
 
 
 async def edit_response(
-    db_session: Session,
+    db_session: AsyncSession,
     answer_id: UUID,
     answer_session_id: str | None,
     value: str,
 ):
     check_existence(
-        db_session.get(
+        await db_session.get(
             AnswerSession,
             check_existence(
                 answer_session_id, detail="Answer session not found."
@@ -329,28 +382,29 @@ async def edit_response(
         ),
         detail="Answer session not found.",
     )
-    answer = check_existence(db_session.get(FieldAnswer, answer_id))
+    answer = check_existence(await db_session.get(FieldAnswer, answer_id))
     field: FormField = check_existence(
-        db_session.get(FormField, answer.field_id)
+        await db_session.get(FormField, answer.field_id)
     )
     validate_answer(value, field)
     answer.value = value
     db_session.add(answer)
-    db_session.commit()
+    await db_session.commit()
+    form_stats_refresher.mark_stale(field.form_id)
 
 
 async def delete_response(
-    db_session: Session,
+    db_session: AsyncSession,
     current_user: User | None,
     answer_id: UUID,
     answer_session_id: str | None,
 ):
-    answer = check_existence(db_session.get(FieldAnswer, answer_id))
+    answer = check_existence(await db_session.get(FieldAnswer, answer_id))
     if answer_session_id is None:
-        PermissionChecker(
+        await PermissionChecker(
             db_session=db_session,
             bypass_roles=[ADMIN_ROLE_NAME, SUPER_ADMIN_ROLE_NAME],
-            roles=(check_existence(current_user)).roles,
+            user=check_existence(current_user),
             pcheck_models=[
                 GlobalPermissionCheckModel(
                     resource_name=FORM_FIELD_RESPONSE_RESOURCE,
@@ -360,20 +414,32 @@ async def delete_response(
         ).check()
     else:
         check_existence(
-            db_session.get(AnswerSession, check_existence(answer_session_id)),
+            await db_session.get(
+                AnswerSession, check_existence(answer_session_id)
+            ),
             status_code=HTTP_401_UNAUTHORIZED,
             detail="Not authorized to delete this resource",
         )
-    db_session.delete(answer)
-    db_session.commit()
+    form_id = (
+        await db_session.exec(
+            select(AnswerSession.form_id).where(
+                AnswerSession.id == answer.session_id
+            )
+        )
+    ).one()
+    await db_session.delete(answer)
+    await db_session.commit()
+    form_stats_refresher.mark_stale(form_id)
     return MessageResponse(message="Answer deleted.")
 
 
 async def submit(
-    db_session: Session, answer_session_id: UUID | None, response: Response
+    db_session: AsyncSession,
+    answer_session_id: UUID | None,
+    response: Response,
 ):
     answer_session = check_existence(
-        db_session.get(
+        await db_session.get(
             AnswerSession,
             check_existence(
                 answer_session_id, detail="Answer session not found."
@@ -381,40 +447,49 @@ async def submit(
         )
     )
 
-    all_required_fields = db_session.exec(
-        select(FormField).where(
-            FormField.required == True,
-            FormField.form_id == answer_session.form_id,
-        )
-    ).all()
-    answered_required_fields = db_session.exec(
-        select(FormField)
-        .where(
-            FormField.required == True,
-            FormField.form_id == answer_session.form_id,
+    # Anti-join on the (session_id, field_id) unique constraint, returning
+    # only the labels of unanswered required fields.
+    answered = select(FieldAnswer.id).where(
+        FieldAnswer.field_id == FormField.id,
+        FieldAnswer.session_id == answer_session.id,
+    )
+    missing_labels = (
+        await db_session.exec(
+            select(FormField.label)
+            .where(
+                FormField.form_id == answer_session.form_id,
+                col(FormField.required),
+                ~answered.exists(),
+            )
+            .order_by(col(FormField.position))
         )
-        .join(FieldAnswer)
-        .where(FieldAnswer.session_id == answer_session.id)
     ).all()
-
-    for form_field in all_required_fields:
-        check_conditions(
-            [form_field in answered_required_fields],
-            detail=f"Field '{form_field.label}' not answered.",
+    if missing_labels:
+        raise HTTPException(
             status_code=HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=(
+                f"Field '{missing_labels[0]}' not answered."
+                if len(missing_labels) == 1
+                else "Fields "
+                + ", ".join(f"'{label}'" for label in missing_labels)
+                + " not answered."
+            ),
         )
 
     answer_session.submitted = True
     db_session.add(answer_session)
-    db_session.commit()
+    await db_session.commit()
+    form_stats_refresher.mark_stale(answer_session.form_id)
     response.delete_cookie(ANSWER_SESSION_COOKIE_KEY)
     return MessageResponse(message="Responses submitted.")
 
 
-async def close_form(db_session: Session, current_user: User, form_id: UUID):
-    PermissionChecker(
+async def close_form(
+    db_session: AsyncSession, current_user: User, form_id: UUID
+):
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_role=SUPER_ADMIN_ROLE_NAME,
         pcheck_models=[
             PermissionCheckModel(
@@ -424,22 +499,23 @@ async def close_form(db_session: Session, current_user: User, form_id: UUID):
             )
         ],
     ).check()
-    form = check_existence(db_session.get(Form, form_id))
+    form = check_existence(await db_session.get(Form, form_id))
     form.open = False
+    form.touch()
     db_session.add(form)
-    db_session.commit()
+    await db_session.commit()
     return MessageResponse(message="Form closed.")
 
 
 async def open_form(
-    db_session: Session,
+    db_session: AsyncSession,
     current_user: User,
     form_id: UUID,
 ):
     """Open a form to allow new responses"""
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_role=SUPER_ADMIN_ROLE_NAME,
         pcheck_models=[
             PermissionCheckModel(
@@ -449,32 +525,184 @@ async def open_form(
             )
         ],
     ).check()
-    form = check_existence(db_session.get(Form, form_id))
+    form = check_existence(await db_session.get(Form, form_id))
     form.open = True
+    form.touch()
     db_session.add(form)
-    db_session.commit()
+    await db_session.commit()
     return MessageResponse(message="Form opened.")
 
 
 async def get_answer_session(
-    db_session: Session, answer_session_id: UUID | None
+    db_session: AsyncSession, answer_session_id: UUID | None
 ):
     answer_session = check_existence(
-        db_session.get(AnswerSession, check_existence(answer_session_id))
+        await db_session.get(
+            AnswerSession,
+            check_existence(answer_session_id),
+            options=[
+                selectinload(rel(AnswerSession.answers)).selectinload(
+                    rel(FieldAnswer.field)
+                )
+            ],
+        )
     )
     return answer_session.to_dto()
 
 
 async def get_responses(
-    db_session: Session,
+    db_session: AsyncSession,
     current_user: User,
     form_id: UUID,
-    skip: int,
+    cursor: str | None,
     limit: int,
 ):
-    PermissionChecker(
+    await PermissionChecker(
+        db_session=db_session,
+        user=current_user,
+        bypass_roles=[SUPER_ADMIN_ROLE_NAME, ADMIN_ROLE_NAME],
+        pcheck_models=[
+            PermissionCheckModel(
+                resource_name=FORM_RESOURCE,
+                resource_id=form_id,
+                action_names=[ACTION_READWRITE],
+            )
+        ],
+    ).check()
+    form = check_existence(await db_session.get(Form, form_id))
+    answer_sessions, next_cursor = await paginate(
+        db_session,
+        select(AnswerSession)
+        .where(
+            AnswerSession.form_id == form.id,
+            col(AnswerSession.submitted),
+        )
+        .options(
+            selectinload(rel(AnswerSession.answers)).selectinload(
+                rel(FieldAnswer.field)
+            )
+        ),
+        sort_columns=[AnswerSession.id],
+        cursor=cursor,
+        limit=limit,
+    )
+    return PageDTO(
+        items=[answer_session.to_dto() for answer_session in answer_sessions],
+        next_cursor=next_cursor,
+    )
+
+
+async def get_form_stats(
+    db_session: AsyncSession, current_user: User, form_id: UUID
+):
+    """
+    Returns the stored summary of a form. It is only computed inline the
+    first time; afterwards a newer submission count schedules a background
+    refresh and the stored summary is returned meanwhile.
+    """
+    await PermissionChecker(
+        db_session=db_session,
+        user=current_user,
+        bypass_roles=[SUPER_ADMIN_ROLE_NAME, ADMIN_ROLE_NAME],
+        pcheck_models=[
+            PermissionCheckModel(
+                resource_name=FORM_RESOURCE,
+                resource_id=form_id,
+                action_names=[ACTION_READWRITE],
+            )
+        ],
+    ).check()
+    form = check_existence(await db_session.get(Form, form_id))
+    stats = await db_session.get(FormStats, form.id)
+    if stats is None:
+        return await refresh_form_stats(db_session, form.id)
+    if stats.submitted != await count_submitted(db_session, form.id):
+        if form_stats_refresher.interval <= 0:
+            return await refresh_form_stats(db_session, form.id)
+        form_stats_refresher.mark_stale(form.id)
+    return FormStatsDTO.model_validate_json(stats.summary)
+
+
+def export_columns(fields: list[FormField]) -> list[str]:
+    """One column per field, named after its label and made unique."""
+    columns = ["session_id"]
+    for field in fields:
+        column = field.label
+        if column in columns:
+            column = f"{field.label} ({field.id})"
+        columns.append(column)
+    return columns
+
+
+def export_row(
+    columns: list[str], values: Sequence[str | None], export_format: str
+) -> str:
+    if export_format == "ndjson":
+        return json.dumps(dict(zip(columns, values))) + "\n"
+    buffer = StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue()
+
+
+async def stream_responses(
+    form_id: UUID, fields: list[FormField], export_format: str
+) -> AsyncIterator[str]:
+    """
+    Yields the submitted responses of a form one row per answer session.
+    Answers are read through a server-side cursor in `EXPORT_BATCH_SIZE`
+    rows and written out in chunks, so memory stays flat whatever the
+    number of responses.
+    """
+    columns = export_columns(fields)
+    positions = {field.id: index + 1 for index, field in enumerate(fields)}
+    chunk: list[str] = []
+    if export_format == "csv":
+        chunk.append(export_row(columns, columns, export_format))
+
+    statement = (
+        select(AnswerSession.id, FieldAnswer.field_id, FieldAnswer.value)
+        .select_from(AnswerSession)
+        .outerjoin(
+            FieldAnswer, col(FieldAnswer.session_id) == AnswerSession.id
+        )
+        .where(
+            AnswerSession.form_id == form_id,
+            col(AnswerSession.submitted),
+        )
+        .order_by(col(AnswerSession.id))
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    # The request's session may be closed before the body is streamed.
+    async with AsyncSession(engine) as db_session:
+        result = await db_session.stream(statement)
+        session_id: UUID | None = None
+        row: list[str | None] = []
+        async for answer_session_id, field_id, value in result:
+            if answer_session_id != session_id:
+                if session_id is not None:
+                    chunk.append(export_row(columns, row, export_format))
+                session_id = answer_session_id
+                row = [str(session_id)] + [None] * len(fields)
+            if field_id in positions:
+                row[positions[field_id]] = value
+            if len(chunk) >= EXPORT_BATCH_SIZE:
+                yield "".join(chunk)
+                chunk.clear()
+        if session_id is not None:
+            chunk.append(export_row(columns, row, export_format))
+    if chunk:
+        yield "".join(chunk)
+
+
+async def export_responses(
+    db_session: AsyncSession,
+    current_user: User,
+    form_id: UUID,
+    export_format: ResponseExportFormat,
+):
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_roles=[SUPER_ADMIN_ROLE_NAME, ADMIN_ROLE_NAME],
         pcheck_models=[
             PermissionCheckModel(
@@ -484,33 +712,40 @@ async def get_responses(
             )
         ],
     ).check()
-    form = check_existence(db_session.get(Form, form_id))
-    answer_sessions = check_existence(
+    form = check_existence(await db_session.get(Form, form_id))
+    fields = list(
         (
-            db_session.exec(
-                select(AnswerSession)
-                .where(
-                    AnswerSession.form_id == form.id,
-                    AnswerSession.submitted == True,
-                )
-                .offset(skip)
-                .limit(limit)
+            await db_session.exec(
+                select(FormField)
+                .where(FormField.form_id == form.id)
+                .order_by(col(FormField.position))
             )
         ).all()
     )
-    return [answer_session.to_dto() for answer_session in answer_sessions]
+    media_type = (
+        "text/csv" if export_format == "csv" else "application/x-ndjson"
+    )
+    return StreamingResponse(
+        content=stream_responses(form.id, fields, export_format),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": (
+                f"attachment; filename=responses-{form.id}.{export_format}"
+            ),
+        },
+    )
 
 
 async def get_forms(
-    db_session: Session,
+    db_session: AsyncSession,
     current_user: User,
-    skip: int = 0,
+    cursor: str | None = None,
     limit: int = 10,
 ):
     """Get all forms with pagination - Admin only"""
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_roles=[ADMIN_ROLE_NAME, SUPER_ADMIN_ROLE_NAME],
         pcheck_models=[
             GlobalPermissionCheckModel(
@@ -519,22 +754,27 @@ async def get_forms(
         ],
     ).check()
 
-    statement = select(Form).offset(skip).limit(limit)
-    forms = (db_session.exec(statement)).all()
-    return [form.to_dto() for form in forms]
+    forms, next_cursor = await paginate(
+        db_session,
+        select(Form).options(selectinload(rel(Form.fields))),
+        sort_columns=[Form.id],
+        cursor=cursor,
+        limit=limit,
+    )
+    return PageDTO(
+        items=[form.to_dto() for form in forms], next_cursor=next_cursor
+    )
 
 
-async def get_form_by_id(
-    db_session: Session,
-    form_id: UUID,
-    current_user: User | None = None,
-):
-    """Get a specific form by ID - Public access for form filling"""
-    form = check_existence(db_session.get(Form, form_id))
+async def get_readable_form(
+    db_session: AsyncSession, form_id: UUID, current_user: User | None
+) -> Form:
+    """Loads a form, checking permissions unless it is open."""
+    form = check_existence(await db_session.get(Form, form_id))
     if not form.open:
-        PermissionChecker(
+        await PermissionChecker(
             db_session=db_session,
-            roles=(check_existence(current_user)).roles,
+            user=check_existence(current_user),
             bypass_roles=[ADMIN_ROLE_NAME, SUPER_ADMIN_ROLE_NAME],
             pcheck_models=[
                 PermissionCheckModel(
@@ -544,43 +784,64 @@ async def get_form_by_id(
                 )
             ],
         ).check()
+    return form
+
+
+def form_not_modified(request: Request, response: Response, form: Form):
+    return conditional_response(
+        request,
+        response,
+        etag=f'"{form.id}.{form.version}"',
+        last_modified=form.updated_at,
+        cache_control=(
+            PUBLIC_CACHE_CONTROL if form.open else PRIVATE_CACHE_CONTROL
+        ),
+    )
+
+
+async def get_form_by_id(
+    db_session: AsyncSession,
+    request: Request,
+    response: Response,
+    form_id: UUID,
+    current_user: User | None = None,
+):
+    """Get a specific form by ID - Public access for form filling"""
+    form = await get_readable_form(db_session, form_id, current_user)
+    not_modified = form_not_modified(request, response, form)
+    if not_modified is not None:
+        return not_modified
+    await db_session.refresh(form, ["fields"])
     return form.to_dto()
 
 
 async def get_form_fields(
-    db_session: Session,
+    db_session: AsyncSession,
+    request: Request,
+    response: Response,
     form_id: UUID,
     current_user: User | None = None,
 ):
     """Get all fields for a specific form - Public access for form filling"""
-    form = check_existence(db_session.get(Form, form_id))
-    if not form.open:
-        PermissionChecker(
-            db_session=db_session,
-            roles=(check_existence(current_user)).roles,
-            bypass_roles=[ADMIN_ROLE_NAME, SUPER_ADMIN_ROLE_NAME],
-            pcheck_models=[
-                PermissionCheckModel(
-                    resource_name=FORM_RESOURCE,
-                    resource_id=form_id,
-                    action_names=[ACTION_READWRITE],
-                )
-            ],
-        ).check()
+    form = await get_readable_form(db_session, form_id, current_user)
+    not_modified = form_not_modified(request, response, form)
+    if not_modified is not None:
+        return not_modified
+    await db_session.refresh(form, ["fields"])
     return [field.to_dto() for field in form.fields]
 
 
 async def update_form(
-    db_session: Session,
+    db_session: AsyncSession,
     current_user: User,
     form_id: UUID,
     title: str | None = None,
     description: str | None = None,
 ):
     """Update form details"""
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_roles=[ADMIN_ROLE_NAME, SUPER_ADMIN_ROLE_NAME],
         pcheck_models=[
             PermissionCheckModel(
@@ -591,28 +852,32 @@ async def update_form(
         ],
     ).check()
 
-    form = check_existence(db_session.get(Form, form_id))
+    form = check_existence(
+        await db_session.get(
+            Form, form_id, options=[selectinload(rel(Form.fields))]
+        )
+    )
 
     if title is not None:
         form.label = title
     if description is not None:
         form.description = description
+    form.touch()
 
     db_session.add(form)
-    db_session.commit()
-    db_session.refresh(form)
+    await db_session.commit()
     return form.to_dto()
 
 
 async def delete_form(
-    db_session: Session,
+    db_session: AsyncSession,
     current_user: User,
     form_id: UUID,
 ):
     """Delete a form"""
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_roles=[ADMIN_ROLE_NAME, SUPER_ADMIN_ROLE_NAME],
         pcheck_models=[
             PermissionCheckModel(
@@ -623,14 +888,28 @@ async def delete_form(
         ],
     ).check()
 
-    form = check_existence(db_session.get(Form, form_id))
-    db_session.delete(form)
-    db_session.commit()
+    form = check_existence(
+        await db_session.get(
+            Form,
+            form_id,
+            options=[
+                selectinload(rel(Form.fields)).selectinload(
+                    rel(FormField.answers)
+                ),
+                selectinload(rel(Form.answer_sessions)).selectinload(
+                    rel(AnswerSession.answers)
+                ),
+                selectinload(rel(Form.stats)),
+            ],
+        )
+    )
+    await db_session.delete(form)
+    await db_session.commit()
     return MessageResponse(message="Form deleted successfully")
 
 
 async def update_form_field(
-    db_session: Session,
+    db_session: AsyncSession,
     current_user: User,
     field_id: UUID,
     field_label: str | None = None,
@@ -643,12 +922,12 @@ async def update_form_field(
     text_bounds: str | None = None,
 ):
     """Update a form field"""
-    field = check_existence(db_session.get(FormField, field_id))
+    field = check_existence(await db_session.get(FormField, field_id))
 
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
         bypass_role=SUPER_ADMIN_ROLE_NAME,
-        roles=current_user.roles,
+        user=current_user,
         pcheck_models=[
             PermissionCheckModel(
                 resource_name=FORM_FIELD_RESOURCE,
@@ -679,25 +958,33 @@ async def update_form_field(
         field.text_bounds = text_bounds
     if field_position is not None:
         field.position = field_position
-
-    db_session.add(field)
-    db_session.commit()
-    db_session.refresh(field)
+    form = check_existence(await db_session.get(Form, field.form_id))
+    form.touch()
+
+    db_session.add_all([form, field])
+    await db_session.commit()
+    field_validators.evict(field_id)
+    form_stats_refresher.mark_stale(field.form_id)
+    await db_session.refresh(field)
     return field.to_dto()
 
 
 async def get_user_forms(
-    db_session: Session,
+    db_session: AsyncSession,
     current_user: User,
-    skip: int = 0,
+    cursor: str | None = None,
     limit: int = 10,
 ):
     """Get forms created by the current user"""
-    statement = (
+    forms, next_cursor = await paginate(
+        db_session,
         select(Form)
         .where(Form.user_id == current_user.id)
-        .offset(skip)
-        .limit(limit)
+        .options(selectinload(rel(Form.fields))),
+        sort_columns=[Form.id],
+        cursor=cursor,
+        limit=limit,
+    )
+    return PageDTO(
+        items=[form.to_dto() for form in forms], next_cursor=next_cursor
     )
-    forms = (db_session.exec(statement)).all()
-    return [form.to_dto() for form in forms]
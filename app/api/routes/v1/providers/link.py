@@ -1,11 +1,14 @@
+from fastapi import Request, Response
 from pydantic import Field
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.routes.v1.dto.link import LinkCreationDTO, LinkUpdateDTO
 from app.api.routes.v1.dto.message import MessageResponse
+from app.api.routes.v1.dto.pagination import PageDTO
 from app.core.db.builders.permission import PermissionBuilder
-from app.core.db.builders.role import RoleBuilder
 from app.core.db.models import Link, User
+from app.core.db.pagination import paginate
 from app.core.security.checkers import check_existence, check_non_existence
 from app.core.security.permissions import (
     ACTION_READ,
@@ -15,42 +18,62 @@ from app.core.security.permissions import (
     GlobalPermissionCheckModel,
     PermissionChecker,
     PermissionCheckModel,
+    get_owner_role,
 )
+from app.utils.conditional import conditional_response
 
 
 async def get_link_by_label(
-    db_session: Session, label: str = Field(pattern=r"^[a-zA-Z0-9-]+$")
+    db_session: AsyncSession,
+    request: Request,
+    response: Response,
+    label: str = Field(pattern=r"^[a-zA-Z0-9-]+$"),
 ):
     link = check_existence(
-        db_session.exec(select(Link).where(Link.label == label)).first()
+        (
+            await db_session.exec(select(Link).where(Link.label == label))
+        ).first()
     )
+    not_modified = conditional_response(
+        request, response, f'"{link.id}.{link.version}"', link.updated_at
+    )
+    if not_modified is not None:
+        return not_modified
     return link.to_dto()
 
 
-async def get_link(db_session: Session, link_id: str):
+async def get_link(db_session: AsyncSession, link_id: str):
     link = check_existence(
-        db_session.get(Link, link_id), detail="Link not found."
+        await db_session.get(Link, link_id), detail="Link not found."
     )
     return link.to_dto()
 
 
 async def get_my_links(
-    db_session: Session, current_user: User, skip: int, limit: int
+    db_session: AsyncSession,
+    current_user: User,
+    cursor: str | None,
+    limit: int,
 ):
-    links = db_session.exec(
-        select(Link)
-        .where(Link.user_id == current_user.id)
-        .offset(skip)
-        .limit(limit)
-    ).all()
-    return [link.to_dto() for link in links]
+    links, next_cursor = await paginate(
+        db_session,
+        select(Link).where(Link.user_id == current_user.id),
+        sort_columns=[Link.created_at, Link.id],
+        cursor=cursor,
+        limit=limit,
+    )
+    return PageDTO(
+        items=[link.to_dto() for link in links], next_cursor=next_cursor
+    )
 
 
 async def create_link(
-    db_session: Session, current_user: User, data: LinkCreationDTO
+    db_session: AsyncSession, current_user: User, data: LinkCreationDTO
 ):
     check_non_existence(
-        db_session.exec(select(Link).where(Link.label == data.label)).first()
+        (
+            await db_session.exec(select(Link).where(Link.label == data.label))
+        ).first()
     )
     link = Link(
         label=data.label,
@@ -58,30 +81,29 @@ async def create_link(
         description=data.description,
         user_id=current_user.id,
     )
-    rw_role = RoleBuilder().addUser(current_user).make()
+    owner_role = await get_owner_role(db_session, current_user)
     rw_perm = (
         PermissionBuilder()
-        .forRole(rw_role)
+        .forRole(owner_role)
         .withActionName(ACTION_READWRITE)
         .withResourceName(LINK_RESOURCE)
         .withResourceId(link.id)
         .make()
     )
     db_session.add(link)
-    db_session.add(rw_role)
     db_session.add(rw_perm)
-    db_session.commit()
-    db_session.refresh(link)
+    await db_session.commit()
+    await db_session.refresh(link)
     return link.to_dto()
 
 
 async def update_link(
-    db_session: Session, current_user: User, data: LinkUpdateDTO
+    db_session: AsyncSession, current_user: User, data: LinkUpdateDTO
 ):
-    link = check_existence(db_session.get(Link, data.id))
-    PermissionChecker(
+    link = check_existence(await db_session.get(Link, data.id))
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         pcheck_models=[
             PermissionCheckModel(
                 resource_name=LINK_RESOURCE,
@@ -93,17 +115,20 @@ async def update_link(
     link.label = data.label
     link.url = str(data.url)
     link.description = data.description
+    link.touch()
     db_session.add(link)
-    db_session.commit()
-    db_session.refresh(link)
+    await db_session.commit()
+    await db_session.refresh(link)
     return link.to_dto()
 
 
-async def delete_link(db_session: Session, current_user: User, link_id: str):
-    link = check_existence(db_session.get(Link, link_id))
-    PermissionChecker(
+async def delete_link(
+    db_session: AsyncSession, current_user: User, link_id: str
+):
+    link = check_existence(await db_session.get(Link, link_id))
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_role=ADMIN_ROLE_NAME,
         pcheck_models=[
             PermissionCheckModel(
@@ -113,21 +138,21 @@ async def delete_link(db_session: Session, current_user: User, link_id: str):
             )
         ],
     ).check()
-    db_session.delete(link)
-    db_session.commit()
+    await db_session.delete(link)
+    await db_session.commit()
     return MessageResponse(message="Link deleted successfully.")
 
 
-def get_user_link(
-    db_session: Session,
+async def get_user_link(
+    db_session: AsyncSession,
     current_user: User,
     target_user_id: str,
-    skip: int,
+    cursor: str | None,
     limit: int,
 ):
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_role=ADMIN_ROLE_NAME,
         pcheck_models=[
             GlobalPermissionCheckModel(
@@ -139,12 +164,15 @@ def get_user_link(
         ],
     ).check(either=True)
     check_existence(
-        db_session.get(User, target_user_id), detail="User not found."
+        await db_session.get(User, target_user_id), detail="User not found."
+    )
+    links, next_cursor = await paginate(
+        db_session,
+        select(Link).where(Link.user_id == target_user_id),
+        sort_columns=[Link.created_at, Link.id],
+        cursor=cursor,
+        limit=limit,
+    )
+    return PageDTO(
+        items=[link.to_dto() for link in links], next_cursor=next_cursor
     )
-    links = db_session.exec(
-        select(Link)
-        .where(Link.user_id == target_user_id)
-        .offset(skip)
-        .limit(limit)
-    ).all()
-    return [link.to_dto() for link in links]
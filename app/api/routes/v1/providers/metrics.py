@@ -0,0 +1,66 @@
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db.models import User
+from app.core.db.setup import get_pool_stats
+from app.core.security.permission_cache import permission_cache
+from app.core.security.session_cache import session_cache
+from app.core.services.hashing import hashing_pool
+from app.core.services.reaper import session_reaper
+from app.core.security.permissions import (
+    ACTION_READWRITE,
+    ADMIN_RESOURCE,
+    ADMIN_ROLE_NAME,
+    SUPER_ADMIN_ROLE_NAME,
+    GlobalPermissionCheckModel,
+    PermissionChecker,
+)
+
+
+async def check_metrics_access(db_session: AsyncSession, current_user: User):
+    await PermissionChecker(
+        db_session=db_session,
+        user=current_user,
+        bypass_roles=[ADMIN_ROLE_NAME, SUPER_ADMIN_ROLE_NAME],
+        pcheck_models=[
+            GlobalPermissionCheckModel(
+                resource_name=ADMIN_RESOURCE, action_names=[ACTION_READWRITE]
+            )
+        ],
+    ).check()
+
+
+async def get_db_pool_stats(db_session: AsyncSession, current_user: User):
+    await check_metrics_access(
+        db_session=db_session, current_user=current_user
+    )
+    return get_pool_stats()
+
+
+async def get_permission_cache_stats(
+    db_session: AsyncSession, current_user: User
+):
+    await check_metrics_access(
+        db_session=db_session, current_user=current_user
+    )
+    return permission_cache.snapshots.to_dto()
+
+
+async def get_hashing_pool_stats(db_session: AsyncSession, current_user: User):
+    await check_metrics_access(
+        db_session=db_session, current_user=current_user
+    )
+    return hashing_pool.to_dto()
+
+
+async def get_auth_stats(db_session: AsyncSession, current_user: User):
+    await check_metrics_access(
+        db_session=db_session, current_user=current_user
+    )
+    return session_cache.to_dto()
+
+
+async def get_reaper_stats(db_session: AsyncSession, current_user: User):
+    await check_metrics_access(
+        db_session=db_session, current_user=current_user
+    )
+    return session_reaper.to_dto()
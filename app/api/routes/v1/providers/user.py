@@ -1,11 +1,25 @@
 from typing import Literal
 
-from sqlmodel import Session, select
+from sqlalchemy.orm import selectinload
+from sqlmodel import col, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.routes.v1.dto.message import MessageResponse
+from app.api.routes.v1.dto.pagination import PageDTO
+from app.api.routes.v1.dto.user import RoleDTO
 from app.core.db.builders.permission import PermissionBuilder
 from app.core.db.builders.role import RoleBuilder
-from app.core.db.models import Permission, Role, RoleUserLink, User
+from app.core.db.models import (
+    AnswerSession,
+    Form,
+    FormField,
+    Permission,
+    Role,
+    RoleUserLink,
+    User,
+)
+from app.core.db.pagination import paginate
+from app.core.db.utils import rel
 from app.core.security.checkers import check_existence
 from app.core.security.permissions import (
     ACTION_READ,
@@ -17,14 +31,34 @@ from app.core.security.permissions import (
     GlobalPermissionCheckModel,
     PermissionChecker,
 )
+from app.core.services import storage
+
+
+async def roles_to_dtos(
+    db_session: AsyncSession, roles: list[Role]
+) -> list[RoleDTO]:
+    """Counts the permissions of a page of roles in one grouped query."""
+    counts = dict(
+        (
+            await db_session.exec(
+                select(Permission.role_id, func.count())
+                .where(col(Permission.role_id).in_([role.id for role in roles]))
+                .group_by(col(Permission.role_id))
+            )
+        ).all()
+    )
+    return [role.to_dto(counts.get(role.id, 0)) for role in roles]
 
 
 async def get_users(
-    db_session: Session, current_user: User, skip: int, limit: int
+    db_session: AsyncSession,
+    current_user: User,
+    cursor: str | None,
+    limit: int,
 ):
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_role=ADMIN_ROLE_NAME,
         pcheck_models=[
             GlobalPermissionCheckModel(
@@ -35,16 +69,24 @@ async def get_users(
             ),
         ],
     ).check(either=True)
-    users = db_session.exec(select(User).offset(skip).limit(limit)).all()
-    return [user.to_dto() for user in users]
+    users, next_cursor = await paginate(
+        db_session,
+        select(User),
+        sort_columns=[User.registered_at, User.id],
+        cursor=cursor,
+        limit=limit,
+    )
+    return PageDTO(
+        items=[user.to_dto() for user in users], next_cursor=next_cursor
+    )
 
 
 async def delete_user(
-    db_session: Session, current_user: User, target_user_id: str
+    db_session: AsyncSession, current_user: User, target_user_id: str
 ):
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_role=ADMIN_ROLE_NAME,
         pcheck_models=[
             GlobalPermissionCheckModel(
@@ -53,25 +95,49 @@ async def delete_user(
         ],
     ).check(either=True)
     user = check_existence(
-        db_session.get(User, target_user_id), detail="User not found."
+        await db_session.get(
+            User,
+            target_user_id,
+            options=[
+                selectinload(rel(User.login_sessions)),
+                selectinload(rel(User.auth_sessions)),
+                selectinload(rel(User.verification_sessions)),
+                selectinload(rel(User.roles)),
+                selectinload(rel(User.owner_role)).selectinload(
+                    rel(Role.permissions)
+                ),
+                selectinload(rel(User.links)),
+                selectinload(rel(User.files)),
+                selectinload(rel(User.forms))
+                .selectinload(rel(Form.fields))
+                .selectinload(rel(FormField.answers)),
+                selectinload(rel(User.forms))
+                .selectinload(rel(Form.answer_sessions))
+                .selectinload(rel(AnswerSession.answers)),
+                selectinload(rel(User.forms)).selectinload(rel(Form.stats)),
+            ],
+        ),
+        detail="User not found.",
     )
-    db_session.delete(user)
-    db_session.commit()
+    await db_session.delete(user)
+    await db_session.commit()
+    for file in user.files:
+        await storage.release_file(db_session, file)
     return MessageResponse(
         message=f"User {target_user_id} deleted successfully."
     )
 
 
 async def get_user_roles(
-    db_session: Session,
+    db_session: AsyncSession,
     current_user: User,
     target_user_id: str,
-    skip: int,
+    cursor: str | None,
     limit: int,
 ):
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_role=ADMIN_ROLE_NAME,
         pcheck_models=[
             GlobalPermissionCheckModel(
@@ -82,27 +148,30 @@ async def get_user_roles(
             ),
         ],
     ).check(either=True)
-    roles = db_session.exec(
+    roles, next_cursor = await paginate(
+        db_session,
         select(Role)
         .join(RoleUserLink)
-        .join(User)
-        .where(RoleUserLink.user_id == target_user_id)
-        .offset(skip)
-        .limit(limit)
-    ).all()
-    return [role.to_dto() for role in roles]
+        .where(RoleUserLink.user_id == target_user_id),
+        sort_columns=[Role.id],
+        cursor=cursor,
+        limit=limit,
+    )
+    return PageDTO(
+        items=await roles_to_dtos(db_session, roles), next_cursor=next_cursor
+    )
 
 
 async def get_role_permissions(
-    db_session: Session,
+    db_session: AsyncSession,
     current_user: User,
     role_id: str,
-    skip: int,
+    cursor: str | None,
     limit: int,
 ):
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         pcheck_models=[
             GlobalPermissionCheckModel(
                 resource_name=ROLE_RESOURCE, action_names=[ACTION_READWRITE]
@@ -112,18 +181,22 @@ async def get_role_permissions(
             ),
         ],
     ).check(either=True)
-    check_existence(db_session.get(Role, role_id))
-    permissions = db_session.exec(
-        select(Permission)
-        .where(Permission.role_id == role_id)
-        .offset(skip)
-        .limit(limit)
-    ).all()
-    return [permission.to_dto() for permission in permissions]
+    check_existence(await db_session.get(Role, role_id))
+    permissions, next_cursor = await paginate(
+        db_session,
+        select(Permission).where(Permission.role_id == role_id),
+        sort_columns=[Permission.id],
+        cursor=cursor,
+        limit=limit,
+    )
+    return PageDTO(
+        items=[permission.to_dto() for permission in permissions],
+        next_cursor=next_cursor,
+    )
 
 
 async def add_permission_to_user(
-    db_session: Session,
+    db_session: AsyncSession,
     current_user: User,
     target_user_id: str,
     action_name: Literal["r", "rw"],
@@ -131,9 +204,9 @@ async def add_permission_to_user(
     resource_name: Literal["resource", "link"],
     role_name: str | None = None,
 ):
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         pcheck_models=[
             GlobalPermissionCheckModel(
                 resource_name=ADMIN_RESOURCE, action_names=[ACTION_READWRITE]
@@ -141,7 +214,7 @@ async def add_permission_to_user(
         ],
     ).check()
     target_user = check_existence(
-        db_session.get(User, target_user_id), detail="User not found."
+        await db_session.get(User, target_user_id), detail="User not found."
     )
     role = RoleBuilder().addUser(target_user).withName(role_name).make()
     permission = (
@@ -153,43 +226,49 @@ async def add_permission_to_user(
         .make()
     )
     db_session.add_all([role, permission])
-    db_session.commit()
+    await db_session.commit()
     return MessageResponse(message="Permission added successfully.")
 
 
 async def remove_role_from_user(
-    db_session: Session, current_user: User, role_id: str, target_user_id: str
+    db_session: AsyncSession,
+    current_user: User,
+    role_id: str,
+    target_user_id: str,
 ):
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
+        bypass_role=ADMIN_ROLE_NAME,
         pcheck_models=[
             GlobalPermissionCheckModel(
                 resource_name=USER_RESOURCE, action_names=[ACTION_READWRITE]
             )
         ],
-    )
+    ).check()
     user = check_existence(
-        db_session.get(User, target_user_id), detail="User not found"
+        await db_session.get(User, target_user_id), detail="User not found"
     )
     role_user_link = check_existence(
-        db_session.exec(
-            select(RoleUserLink).where(
-                RoleUserLink.user_id == target_user_id,
-                RoleUserLink.role_id == role_id,
+        (
+            await db_session.exec(
+                select(RoleUserLink).where(
+                    RoleUserLink.user_id == target_user_id,
+                    RoleUserLink.role_id == role_id,
+                )
             )
         ).first(),
         detail=f"Role not found for user: {user.name}",
     )
-    db_session.delete(role_user_link)
-    db_session.commit()
+    await db_session.delete(role_user_link)
+    await db_session.commit()
     return MessageResponse(message="Role remove from user successfully.")
 
 
-async def is_admin(db_session: Session, current_user: User):
-    return PermissionChecker(
+async def is_admin(db_session: AsyncSession, current_user: User):
+    return await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_role=ADMIN_ROLE_NAME,
         pcheck_models=[
             GlobalPermissionCheckModel(
@@ -200,11 +279,14 @@ async def is_admin(db_session: Session, current_user: User):
 
 
 async def get_all_roles(
-    db_session: Session, current_user: User, skip: int, limit: int
+    db_session: AsyncSession,
+    current_user: User,
+    cursor: str | None,
+    limit: int,
 ):
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_role=ADMIN_ROLE_NAME,
         pcheck_models=[
             GlobalPermissionCheckModel(
@@ -215,16 +297,27 @@ async def get_all_roles(
             ),
         ],
     ).check(either=True)
-    roles = db_session.exec(select(Role).offset(skip).limit(limit)).all()
-    return [role.to_dto() for role in roles]
+    roles, next_cursor = await paginate(
+        db_session,
+        select(Role),
+        sort_columns=[Role.id],
+        cursor=cursor,
+        limit=limit,
+    )
+    return PageDTO(
+        items=await roles_to_dtos(db_session, roles), next_cursor=next_cursor
+    )
 
 
 async def get_all_permissions(
-    db_session: Session, current_user: User, skip: int, limit: int
+    db_session: AsyncSession,
+    current_user: User,
+    cursor: str | None,
+    limit: int,
 ):
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_role=ADMIN_ROLE_NAME,
         pcheck_models=[
             GlobalPermissionCheckModel(
@@ -235,16 +328,25 @@ async def get_all_permissions(
             ),
         ],
     ).check(either=True)
-    permissions = db_session.exec(
-        select(Permission).offset(skip).limit(limit)
-    ).all()
-    return [permission.to_dto() for permission in permissions]
+    permissions, next_cursor = await paginate(
+        db_session,
+        select(Permission),
+        sort_columns=[Permission.id],
+        cursor=cursor,
+        limit=limit,
+    )
+    return PageDTO(
+        items=[permission.to_dto() for permission in permissions],
+        next_cursor=next_cursor,
+    )
 
 
-async def create_role(db_session: Session, current_user: User, role_name: str):
-    PermissionChecker(
+async def create_role(
+    db_session: AsyncSession, current_user: User, role_name: str
+):
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_role=ADMIN_ROLE_NAME,
         pcheck_models=[
             GlobalPermissionCheckModel(
@@ -254,14 +356,16 @@ async def create_role(db_session: Session, current_user: User, role_name: str):
     ).check()
     role = RoleBuilder().withName(role_name).make()
     db_session.add(role)
-    db_session.commit()
+    await db_session.commit()
     return MessageResponse(message=f"Role '{role_name}' created successfully.")
 
 
-async def delete_role(db_session: Session, current_user: User, role_id: str):
-    PermissionChecker(
+async def delete_role(
+    db_session: AsyncSession, current_user: User, role_id: str
+):
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_role=ADMIN_ROLE_NAME,
         pcheck_models=[
             GlobalPermissionCheckModel(
@@ -270,19 +374,27 @@ async def delete_role(db_session: Session, current_user: User, role_id: str):
         ],
     ).check()
     role = check_existence(
-        db_session.get(Role, role_id), detail="Role not found."
+        await db_session.get(
+            Role,
+            role_id,
+            options=[
+                selectinload(rel(Role.users)),
+                selectinload(rel(Role.permissions)),
+            ],
+        ),
+        detail="Role not found.",
     )
-    db_session.delete(role)
-    db_session.commit()
+    await db_session.delete(role)
+    await db_session.commit()
     return MessageResponse(message="Role deleted successfully.")
 
 
 async def assign_role_to_user(
-    db_session: Session, current_user: User, user_id: str, role_id: str
+    db_session: AsyncSession, current_user: User, user_id: str, role_id: str
 ):
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_role=ADMIN_ROLE_NAME,
         pcheck_models=[
             GlobalPermissionCheckModel(
@@ -291,16 +403,19 @@ async def assign_role_to_user(
         ],
     ).check()
     user = check_existence(
-        db_session.get(User, user_id), detail="User not found."
+        await db_session.get(User, user_id), detail="User not found."
     )
     role = check_existence(
-        db_session.get(Role, role_id), detail="Role not found."
+        await db_session.get(Role, role_id), detail="Role not found."
     )
 
     # Check if user already has this role
-    existing_link = db_session.exec(
-        select(RoleUserLink).where(
-            RoleUserLink.user_id == user_id, RoleUserLink.role_id == role_id
+    existing_link = (
+        await db_session.exec(
+            select(RoleUserLink).where(
+                RoleUserLink.user_id == user_id,
+                RoleUserLink.role_id == role_id,
+            )
         )
     ).first()
 
@@ -309,21 +424,21 @@ async def assign_role_to_user(
 
     role_user_link = RoleUserLink(user_id=user_id, role_id=role_id)
     db_session.add(role_user_link)
-    db_session.commit()
+    await db_session.commit()
     return MessageResponse(message="Role assigned to user successfully.")
 
 
 async def create_permission(
-    db_session: Session,
+    db_session: AsyncSession,
     current_user: User,
     role_id: str,
     action_name: str,
     resource_name: str,
     resource_id: str | None = None,
 ):
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_role=ADMIN_ROLE_NAME,
         pcheck_models=[
             GlobalPermissionCheckModel(
@@ -332,7 +447,7 @@ async def create_permission(
         ],
     ).check()
     role = check_existence(
-        db_session.get(Role, role_id), detail="Role not found."
+        await db_session.get(Role, role_id), detail="Role not found."
     )
     permission = (
         PermissionBuilder()
@@ -343,16 +458,16 @@ async def create_permission(
         .make()
     )
     db_session.add(permission)
-    db_session.commit()
+    await db_session.commit()
     return MessageResponse(message="Permission created successfully.")
 
 
 async def delete_permission(
-    db_session: Session, current_user: User, permission_id: str
+    db_session: AsyncSession, current_user: User, permission_id: str
 ):
-    PermissionChecker(
+    await PermissionChecker(
         db_session=db_session,
-        roles=current_user.roles,
+        user=current_user,
         bypass_role=ADMIN_ROLE_NAME,
         pcheck_models=[
             GlobalPermissionCheckModel(
@@ -361,9 +476,9 @@ async def delete_permission(
         ],
     ).check()
     permission = check_existence(
-        db_session.get(Permission, permission_id),
+        await db_session.get(Permission, permission_id),
         detail="Permission not found.",
     )
-    db_session.delete(permission)
-    db_session.commit()
+    await db_session.delete(permission)
+    await db_session.commit()
     return MessageResponse(message="Permission deleted successfully.")
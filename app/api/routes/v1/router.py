@@ -4,6 +4,7 @@ from app.api.routes.v1.controllers.auth import router as auth_router
 from app.api.routes.v1.controllers.file import router as file_router
 from app.api.routes.v1.controllers.form import router as form_router
 from app.api.routes.v1.controllers.link import router as link_router
+from app.api.routes.v1.controllers.metrics import router as metrics_router
 from app.api.routes.v1.controllers.miscellaneous import (
     router as miscellaneous_router,
 )
@@ -15,3 +16,4 @@ router.include_router(form_router)
 router.include_router(file_router)
 router.include_router(link_router)
 router.include_router(miscellaneous_router)
+router.include_router(metrics_router)
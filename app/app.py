@@ -6,17 +6,31 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes.v1.router import router as v1_router
 from app.core.config.env import get_env
-from app.core.db.setup import setup_db
+from app.core.db.setup import close_db, setup_db
+from app.core.services.form_stats import form_stats_refresher
+from app.core.services.hashing import hashing_pool
+from app.core.services.reaper import session_reaper
+from app.core.services.storage import MAX_FILE_SIZE
+from app.utils.body_limit import BodySizeLimitMiddleware
 
 DEBUG = get_env("DEBUG", "True") == "True"
 PORT = int(get_env("PORT", "8000")) or 8000
+# Room for the multipart boundary and part headers around an upload.
+MULTIPART_OVERHEAD = 64 * 1024
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # startup
-    setup_db()
+    await setup_db()
+    session_reaper.start()
+    form_stats_refresher.start()
     yield
+    # shutdown
+    await session_reaper.stop()
+    await form_stats_refresher.stop()
+    await close_db()
+    hashing_pool.shutdown()
 
 
 app = FastAPI(
@@ -28,6 +42,13 @@ app = FastAPI(
 
 app.include_router(v1_router)
 
+# Oversized single uploads are cut off while they are received, instead of
+# after Starlette has spooled them to disk.
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={"/api/v1/v1/file": MAX_FILE_SIZE + MULTIPART_OVERHEAD},
+    detail="File size exceeds 5MB limit",
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -7,6 +7,34 @@ _ = load_dotenv()
 
 EnvKey = Literal[
     "DB_STRING",
+    "DB_POOL_SIZE",
+    "DB_MAX_OVERFLOW",
+    "DB_POOL_TIMEOUT",
+    "DB_POOL_RECYCLE",
+    "DB_POOL_PRE_PING",
+    "PERMISSION_CACHE_SIZE",
+    "PERMISSION_CACHE_TTL",
+    "HASHING_WORKERS",
+    "HASHING_MAX_PENDING",
+    "PASSWORD_SCHEMES",
+    "BCRYPT_ROUNDS",
+    "SESSION_CACHE_SIZE",
+    "SESSION_CACHE_TTL",
+    "FIELD_VALIDATOR_CACHE_SIZE",
+    "FIELD_VALIDATOR_CACHE_TTL",
+    "AUTH_MODE",
+    "SESSION_REAPER_INTERVAL",
+    "SESSION_REAPER_BATCH_SIZE",
+    "FORM_STATS_REFRESH_INTERVAL",
+    "STORAGE",
+    "STORAGE_BACKEND",
+    "S3_BUCKET",
+    "S3_ENDPOINT_URL",
+    "S3_REGION",
+    "S3_ACCESS_KEY_ID",
+    "S3_SECRET_ACCESS_KEY",
+    "S3_PRESIGN_TTL",
+    "SESSION_SECRET",
     "ALLOW_ADMINS_ONLY",
     "ALMEBIC_DB_URL",
     "DEBUG",
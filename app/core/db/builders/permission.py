@@ -20,7 +20,7 @@ class PermissionBuilder:
         return self
 
     def withResourceId(self, resource_id: Any):
-        self.resource_id = str(resource_id)
+        self.resource_id = None if resource_id is None else str(resource_id)
         return self
 
     def forRole(self, role: Role):
@@ -33,14 +33,9 @@ class PermissionBuilder:
         if not self.role:
             raise ValueError("Role not set.")
 
-        if self.resource_id:
-            name = (
-                f"{self.resource_name}:{self.resource_id}:{self.action_name}"
-            )
-        else:
-            name = f"{self.resource_name}:{self.action_name}"
-
         return Permission(
-            name=name,
+            resource_name=self.resource_name,
+            resource_id=self.resource_id,
+            action_name=self.action_name,
             role=self.role,
         )
@@ -6,6 +6,7 @@ from app.core.db.models import Permission, Role, User
 class RoleBuilder:
     def __init__(self) -> None:
         self.name: Optional[str] = None
+        self.owner: Optional[User] = None
         self.users: List[User] = []
         self.permissions: List[Permission] = []
 
@@ -13,6 +14,10 @@ class RoleBuilder:
         self.name = name
         return self
 
+    def ownedBy(self, user: User):
+        self.owner = user
+        return self
+
     def addUser(self, user: User):
         self.users.append(user)
         return self
@@ -34,6 +39,7 @@ class RoleBuilder:
     def make(self):
         return Role(
             name=self.name,
+            owner=self.owner,
             users=self.users,
             permissions=self.permissions,
         )
@@ -1,8 +1,17 @@
 import uuid
 from datetime import datetime, timedelta, timezone
-from typing import List
-
-from sqlmodel import Column, DateTime, Field, Relationship, SQLModel
+from typing import List, Optional
+
+from sqlmodel import (
+    Column,
+    col,
+    DateTime,
+    Field,
+    Index,
+    Relationship,
+    SQLModel,
+    UniqueConstraint,
+)
 
 from app.api.routes.v1.dto.file import ResourceDTO
 from app.api.routes.v1.dto.form import (
@@ -12,59 +21,68 @@ from app.api.routes.v1.dto.form import (
     FormFieldDTO,
 )
 from app.api.routes.v1.dto.link import LinkDTO
-from app.api.routes.v1.dto.user import UserDTO
+from app.api.routes.v1.dto.user import PermissionDTO, RoleDTO, UserDTO
 from app.utils.crypto import gen_id, gen_otp
 
 
 class RoleUserLink(SQLModel, table=True):
     user_id: str = Field(foreign_key="user.id", primary_key=True)
-    role_id: str = Field(foreign_key="role.id", primary_key=True)
+    role_id: str = Field(foreign_key="role.id", primary_key=True, index=True)
 
 
 class User(SQLModel, table=True):
     id: str = Field(default_factory=lambda: gen_id(10), primary_key=True)
-    email: str
-    username: str
+    email: str = Field(unique=True, index=True)
+    username: str = Field(unique=True, index=True)
     hashed_password: str
     name: str
     registered_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc)
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
     )
     verified: bool = False
+    # Bumped by every flush that changes the user's roles or permissions;
+    # cached permission snapshots are keyed on it.
+    permissions_version: int = 0
     login_sessions: list["LoginSession"] = Relationship(
         back_populates="user",
         cascade_delete=True,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
     auth_sessions: list["AuthSession"] = Relationship(
         back_populates="user",
         cascade_delete=True,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
     roles: List["Role"] = Relationship(
         back_populates="users",
         link_model=RoleUserLink,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
     forms: List["Form"] = Relationship(
         back_populates="author",
         cascade_delete=True,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
     links: List["Link"] = Relationship(
         back_populates="author",
         cascade_delete=True,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
     files: List["FileResource"] = Relationship(
         back_populates="owner",
         cascade_delete=True,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
     verification_sessions: List["AccountVerificationSession"] = Relationship(
         back_populates="user",
         cascade_delete=True,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
+    )
+    owner_role: Optional["Role"] = Relationship(
+        back_populates="owner",
+        cascade_delete=True,
+        sa_relationship_kwargs={"lazy": "raise_on_sql", "uselist": False},
     )
 
     def to_dto(self):
@@ -78,14 +96,29 @@ class User(SQLModel, table=True):
 
 class Link(SQLModel, table=True):
     id: str = Field(primary_key=True, default_factory=lambda: gen_id(10))
-    user_id: str = Field(foreign_key="user.id")
-    label: str
+    user_id: str = Field(foreign_key="user.id", index=True)
+    label: str = Field(unique=True, index=True)
     url: str
     created_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc)
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
     )
     description: str | None = None
-    author: User = Relationship(back_populates="links")
+    # Bumped on every change; the ETag of the link.
+    version: int = 0
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+    author: User = Relationship(
+        back_populates="links",
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
+    )
+
+    def touch(self):
+        # Incremented in SQL so that concurrent changes never share one.
+        self.version = col(Link.version) + 1  # type: ignore
+        self.updated_at = datetime.now(timezone.utc)
 
     def to_dto(self):
         return LinkDTO(
@@ -104,10 +137,17 @@ class FileResource(SQLModel, table=True):
     protected: bool = Field(default=True)
     name: str
     filetype: str
+    # Hex digest of the content, which is stored once per digest; the
+    # rows sharing a digest are the references to that blob.
+    sha256: str | None = Field(default=None, index=True)
     created_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc)
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+    owner: User = Relationship(
+        back_populates="files",
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
-    owner: User = Relationship(back_populates="files")
 
     def to_dto(self):
         return ResourceDTO(
@@ -122,45 +162,100 @@ class FileResource(SQLModel, table=True):
 class Role(SQLModel, table=True):
     id: str = Field(default_factory=gen_id, primary_key=True)
     name: str | None = None
-    permissions: list["Permission"] = Relationship(back_populates="role")
+    # Set on the personal role that holds the permissions on everything a
+    # user creates.
+    owner_id: str | None = Field(
+        default=None, foreign_key="user.id", unique=True, index=True
+    )
+    permissions: list["Permission"] = Relationship(
+        back_populates="role",
+        cascade_delete=True,
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
+    )
     users: List[User] = Relationship(
         back_populates="roles",
         link_model=RoleUserLink,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
+    owner: User | None = Relationship(
+        back_populates="owner_role",
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
+    )
+
+    def to_dto(self, permissions_count: int):
+        return RoleDTO(
+            id=self.id, name=self.name, permissions_count=permissions_count
+        )
 
 
 class Permission(SQLModel, table=True):
-    permission_id: str = Field(default_factory=gen_id, primary_key=True)
-    name: str = Field(primary_key=True)
+    __table_args__ = (
+        Index(
+            "ix_permission_role_id_resource",
+            "role_id",
+            "resource_name",
+            "action_name",
+        ),
+        Index("ix_permission_resource", "resource_name", "resource_id"),
+    )
+
+    id: str = Field(default_factory=gen_id, primary_key=True)
+    resource_name: str
+    resource_id: str | None = None  # None for global permissions
+    action_name: str
     role_id: str | None = Field(foreign_key="role.id", default=None)
     role: Role | None = Relationship(
         back_populates="permissions",
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
 
+    def to_dto(self):
+        return PermissionDTO(
+            id=self.id,
+            action_name=self.action_name,
+            resource_name=self.resource_name,
+            resource_id=self.resource_id,
+        )
+
 
 class Form(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    user_id: str = Field(foreign_key="user.id")
+    user_id: str = Field(foreign_key="user.id", index=True)
     label: str
     description: str | None = None
     open: bool = False
+    # Bumped whenever the form or one of its fields changes; the ETag of
+    # the form and of its field list.
+    version: int = 0
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
     fields: List["FormField"] = Relationship(
         back_populates="form",
         cascade_delete=True,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
     answer_sessions: List["AnswerSession"] = Relationship(
         back_populates="form",
         cascade_delete=True,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
     author: User = Relationship(
         back_populates="forms",
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
+    )
+    stats: Optional["FormStats"] = Relationship(
+        back_populates="form",
+        cascade_delete=True,
+        sa_relationship_kwargs={"lazy": "raise_on_sql", "uselist": False},
     )
 
+    def touch(self):
+        # Incremented in SQL so that concurrent changes never share one.
+        self.version = col(Form.version) + 1  # type: ignore
+        self.updated_at = datetime.now(timezone.utc)
+
     def to_dto(self):
         return FormDTO(
             id=self.id,
@@ -173,7 +268,7 @@ class Form(SQLModel, table=True):
 
 class FormField(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    form_id: uuid.UUID = Field(foreign_key="form.id")
+    form_id: uuid.UUID = Field(foreign_key="form.id", index=True)
     label: str
     description: str
     position: int | None = None
@@ -189,11 +284,11 @@ class FormField(SQLModel, table=True):
     answers: List["FieldAnswer"] = Relationship(
         back_populates="field",
         cascade_delete=True,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
     form: Form = Relationship(
         back_populates="fields",
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
 
     def to_dto(self):
@@ -212,17 +307,26 @@ class FormField(SQLModel, table=True):
 
 
 class FieldAnswer(SQLModel, table=True):
+    # Also serves lookups by session_id alone.
+    __table_args__ = (
+        UniqueConstraint(
+            "session_id",
+            "field_id",
+            name="uq_fieldanswer_session_id_field_id",
+        ),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    field_id: uuid.UUID = Field(foreign_key="formfield.id")
+    field_id: uuid.UUID = Field(foreign_key="formfield.id", index=True)
     session_id: uuid.UUID = Field(foreign_key="answersession.id")
     value: str | None = None
     field: FormField = Relationship(
         back_populates="answers",
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
     session: "AnswerSession" = Relationship(
         back_populates="answers",
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
 
     def to_dto(self):
@@ -236,17 +340,21 @@ class FieldAnswer(SQLModel, table=True):
 
 
 class AnswerSession(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_answersession_form_id_submitted", "form_id", "submitted"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     form_id: uuid.UUID = Field(foreign_key="form.id")
     answers: List[FieldAnswer] = Relationship(
         back_populates="session",
         cascade_delete=True,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
     submitted: bool = False
     form: Form = Relationship(
         back_populates="answer_sessions",
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
 
     def to_dto(self):
@@ -258,6 +366,22 @@ class AnswerSession(SQLModel, table=True):
         )
 
 
+class FormStats(SQLModel, table=True):
+    """Response summary of a form, recomputed in the background."""
+
+    form_id: uuid.UUID = Field(foreign_key="form.id", primary_key=True)
+    submitted: int = 0  # Submitted sessions the summary was computed from
+    summary: str  # FormStatsDTO as JSON
+    refreshed_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+    form: Form = Relationship(
+        back_populates="stats",
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
+    )
+
+
 class LoginSession(SQLModel, table=True):
     id: str = Field(default_factory=lambda: gen_id(30), primary_key=True)
     user_id: str = Field(foreign_key="user.id")
@@ -269,7 +393,7 @@ class LoginSession(SQLModel, table=True):
     expired: bool = False
     user: User = Relationship(
         back_populates="login_sessions",
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
 
 
@@ -288,7 +412,7 @@ class AuthSession(SQLModel, table=True):
     verified: bool = False
     user: User = Relationship(
         back_populates="auth_sessions",
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
     )
 
 
@@ -297,9 +421,13 @@ class AccountVerificationSession(SQLModel, table=True):
     token: str = Field(default_factory=lambda: gen_id(8))
     user_id: str = Field(foreign_key="user.id")
     expires_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc) + timedelta(days=1)
+        default_factory=lambda: datetime.now(timezone.utc) + timedelta(days=1),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
     )
     tries: int = 0
     max_tries: int = 3
     expired: bool = False
-    user: User = Relationship(back_populates="verification_sessions")
+    user: User = Relationship(
+        back_populates="verification_sessions",
+        sa_relationship_kwargs={"lazy": "raise_on_sql"},
+    )
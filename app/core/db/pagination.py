@@ -0,0 +1,82 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from typing import Any, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import ColumnElement, String, tuple_
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
+from sqlmodel.sql.sqltypes import AutoString
+from starlette.status import HTTP_400_BAD_REQUEST
+
+
+def encode_cursor(values: list[Any]) -> str:
+    return urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+
+def decode_cursor(
+    cursor: str, sort_columns: Sequence[Any]
+) -> tuple[Any, ...]:
+    try:
+        values = json.loads(urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(sort_columns):
+            raise ValueError
+        return tuple(
+            load_cursor_value(column, value)
+            for column, value in zip(sort_columns, values)
+        )
+    except (ValueError, TypeError, AttributeError):
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+        )
+
+
+def load_cursor_value(column: ColumnElement[Any], value: Any) -> Any:
+    if isinstance(column.type, (String, AutoString)):
+        return value
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is UUID:
+        return UUID(value)
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return value
+
+
+async def paginate[T](
+    db_session: AsyncSession,
+    statement: SelectOfScalar[T],
+    # Model attributes such as `Form.id`, which type checkers see as the
+    # type of their values.
+    sort_columns: Sequence[Any],
+    cursor: str | None,
+    limit: int,
+) -> tuple[list[T], str | None]:
+    """
+    Keyset pagination: returns up to `limit` rows ordered by
+    `sort_columns`, which must end with a unique column, starting after the
+    position encoded in `cursor`, and the cursor of the next page. Pages
+    cost the same however deep they are and stay stable while rows are
+    inserted.
+    """
+    if cursor is not None:
+        statement = statement.where(
+            tuple_(*sort_columns) > decode_cursor(cursor, sort_columns)
+        )
+    rows = list(
+        (
+            await db_session.exec(
+                statement.order_by(*sort_columns).limit(limit + 1)
+            )
+        ).all()
+    )
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(
+        [getattr(rows[-1], column.key) for column in sort_columns]
+    )
@@ -1,22 +1,87 @@
-from sqlite3 import OperationalError
+from time import perf_counter
+from typing import cast
 
-from sqlalchemy import create_engine, Engine
-from sqlmodel import Session
+from sqlalchemy.exc import OperationalError, TimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.api.routes.v1.dto.metrics import DBPoolStatsDTO
 from app.core.config.env import get_env
-from app.core.logging.log import log_error, log_success
+from app.core.logging.log import log_error, log_success, log_warning
+from app.utils.metrics import LatencyRecorder
 
-engine: Engine = create_engine(get_env("DB_STRING"))
 
+class PoolMetrics:
+    def __init__(self) -> None:
+        self.waiting = 0
+        self.timeouts = 0
+        self.wait = LatencyRecorder()
 
-def setup_db():
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Records how long callers wait for a connection and how often the pool
+    is exhausted.
+    """
+
+    def connect(self):
+        started = perf_counter()
+        pool_metrics.waiting += 1
+        try:
+            connection = super().connect()
+        except TimeoutError:
+            pool_metrics.timeouts += 1
+            log_warning("Database connection pool exhausted.")
+            raise
+        finally:
+            pool_metrics.waiting -= 1
+        pool_metrics.wait.record(perf_counter() - started)
+        return connection
+
+
+engine: AsyncEngine = create_async_engine(
+    get_env("DB_STRING"),
+    poolclass=InstrumentedQueuePool,
+    pool_size=int(get_env("DB_POOL_SIZE", "10")),
+    max_overflow=int(get_env("DB_MAX_OVERFLOW", "20")),
+    pool_timeout=float(get_env("DB_POOL_TIMEOUT", "30")),
+    pool_recycle=int(get_env("DB_POOL_RECYCLE", "1800")),
+    pool_pre_ping=get_env("DB_POOL_PRE_PING", "True") == "True",
+)
+
+
+async def setup_db():
     try:
-        with engine.connect():
+        async with engine.connect():
             log_success("Connected to database!")
     except OperationalError as e:
         log_error(f"Error connecting to DB: {e}")
 
 
-def create_db_session():
-    with Session(engine) as session:
+async def close_db():
+    await engine.dispose()
+
+
+def get_pool_stats() -> DBPoolStatsDTO:
+    pool = cast(InstrumentedQueuePool, engine.pool)
+    return DBPoolStatsDTO(
+        size=pool.size(),
+        checked_in=pool.checkedin(),
+        checked_out=pool.checkedout(),
+        overflow=max(pool.overflow(), 0),
+        waiting=pool_metrics.waiting,
+        checkouts=pool_metrics.wait.count,
+        timeouts=pool_metrics.timeouts,
+        wait=pool_metrics.wait.to_dto(),
+    )
+
+
+async def create_db_session():
+    # Objects are kept loaded after commit: with an AsyncSession, expired
+    # attributes cannot be lazily refreshed outside of an awaited call.
+    async with AsyncSession(engine, expire_on_commit=False) as session:
         yield session
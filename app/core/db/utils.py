@@ -0,0 +1,33 @@
+from typing import Any
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import QueryableAttribute
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+def upsert_statement(db_session: AsyncSession, model: type[SQLModel]):
+    """
+    Returns an INSERT for `model` that supports `on_conflict_do_update`
+    on the dialect the session is bound to (PostgreSQL or SQLite).
+    """
+    match db_session.get_bind().dialect.name:
+        case "postgresql":
+            return postgresql.insert(model)
+        case "sqlite":
+            return sqlite.insert(model)
+        case dialect:
+            raise NotImplementedError(
+                f"Upserts are not supported on {dialect}"
+            )
+
+
+def rel(attribute: Any) -> QueryableAttribute[Any]:
+    """
+    Types a relationship of a model for loader options such as
+    `selectinload`, the way `col` does for columns: SQLModel annotates
+    relationships with the related model rather than the attribute.
+    """
+    if not isinstance(attribute, QueryableAttribute):
+        raise RuntimeError(f"Not a SQLAlchemy relationship: {attribute}")
+    return attribute
@@ -5,46 +5,49 @@ from rich.console import Console
 
 console = Console()
 
+# Read on every call, so that tests can point it elsewhere.
+LOG_FILE = "log.txt"
 
-def log_info(message: Any, log_file: str = "log.txt"):
+
+def log_info(message: Any, log_file: str | None = None):
     """
     Logs an info message to the console and a log file.
     """
     console.print(message, style="bold green")
-    with open(log_file, "a") as f:
+    with open(log_file or LOG_FILE, "a") as f:
         _ = f.write(
             f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} INFO] {message}\n"
         )
 
 
-def log_warning(message: Any, log_file: str = "log.txt"):
+def log_warning(message: Any, log_file: str | None = None):
     """
     Logs a warning message to the console and a log file.
     """
     console.print(message, style="bold yellow")
-    with open(log_file, "a") as f:
+    with open(log_file or LOG_FILE, "a") as f:
         _ = f.write(
             f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} WARNING] {message}\n"
         )
 
 
-def log_error(message: Any, log_file: str = "log.txt"):
+def log_error(message: Any, log_file: str | None = None):
     """
     Logs an error message to the console and a log file.
     """
     console.print(message, style="bold red")
-    with open(log_file, "a") as f:
+    with open(log_file or LOG_FILE, "a") as f:
         _ = f.write(
             f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ERROR] {message}\n"
         )
 
 
-def log_success(message: Any, log_file: str = "log.txt"):
+def log_success(message: Any, log_file: str | None = None):
     """
     Logs a success message to the console and a log file.
     """
     console.print(message, style="bold blue")
-    with open(log_file, "a") as f:
+    with open(log_file or LOG_FILE, "a") as f:
         _ = f.write(
             f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} SUCCESS] {message}\n"
         )
@@ -0,0 +1,111 @@
+from itertools import chain
+from typing import TYPE_CHECKING
+
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import instance_state
+from sqlmodel import col, select
+
+from app.core.config.env import get_env
+from app.core.db.models import Permission, Role, RoleUserLink, User
+from app.utils.cache import LRUCache
+
+if TYPE_CHECKING:
+    from app.core.security.permissions import PermissionSnapshot
+
+
+CHANGED_USERS_KEY = "permission_changed_users"
+
+
+class PermissionCache:
+    """
+    Process-wide cache of permission snapshots keyed by user id and the
+    user's `permissions_version`. Every flush that changes a user's roles
+    or permissions bumps that column, so once the change is committed no
+    worker finds a snapshot taken before it again; stale entries simply
+    age out.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.snapshots = LRUCache[tuple[str, int], "PermissionSnapshot"](
+            max_size, ttl
+        )
+
+    def get(self, user_id: str, version: int) -> "PermissionSnapshot | None":
+        return self.snapshots.get((user_id, version))
+
+    def set(
+        self, user_id: str, version: int, snapshot: "PermissionSnapshot"
+    ):
+        self.snapshots.set((user_id, version), snapshot)
+
+
+permission_cache = PermissionCache(
+    max_size=int(get_env("PERMISSION_CACHE_SIZE", "10000")),
+    ttl=float(get_env("PERMISSION_CACHE_TTL", "300")),
+)
+
+
+def _affected_user_ids(session: Session) -> set[str]:
+    user_ids: set[str] = set()
+    role_ids: set[str | None] = set()
+    new_role_ids = {obj.id for obj in session.new if isinstance(obj, Role)}
+
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, RoleUserLink):
+            user_ids.add(obj.user_id)
+        elif isinstance(obj, Permission):
+            state = instance_state(obj)
+            role_history = state.attrs.role.history
+            role_ids.add(obj.role_id)
+            role_ids.update(state.attrs.role_id.history.deleted)
+            role_ids.update(
+                role.id
+                for role in chain(role_history.added, role_history.deleted)
+                if role is not None
+            )
+        elif isinstance(obj, Role):
+            role_ids.add(obj.id)
+            history = instance_state(obj).attrs.users.history
+            user_ids.update(
+                user.id for user in chain(history.added, history.deleted)
+            )
+        elif isinstance(obj, User):
+            if obj in session.deleted or (
+                instance_state(obj).attrs.roles.history.has_changes()
+            ):
+                user_ids.add(obj.id)
+
+    role_ids -= new_role_ids
+    role_ids.discard(None)
+    if role_ids:
+        user_ids.update(
+            session.connection()
+            .execute(
+                select(RoleUserLink.user_id).where(
+                    col(RoleUserLink.role_id).in_(role_ids)
+                )
+            )
+            .scalars()
+        )
+    return user_ids
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_permissions_versions(session: Session, flush_context, instances):
+    user_ids = _affected_user_ids(session)
+    if not user_ids:
+        return
+    # Incremented in SQL so that concurrent changes never share a version.
+    session.connection().execute(
+        update(User)
+        .where(col(User.id).in_(user_ids))
+        .values(permissions_version=col(User.permissions_version) + 1)
+    )
+    session.info.setdefault(CHANGED_USERS_KEY, set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session: Session):
+    session.info.pop(CHANGED_USERS_KEY, None)
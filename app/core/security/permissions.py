@@ -3,15 +3,23 @@ from typing import Any
 
 from fastapi import HTTPException
 from pydantic import BaseModel
-from sqlmodel import Session, select
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette.status import (
     HTTP_401_UNAUTHORIZED,
     HTTP_404_NOT_FOUND,
     HTTP_409_CONFLICT,
 )
 
-from app.core.db.models import Permission, Role
+from app.core.db.builders.role import RoleBuilder
+from app.core.db.models import Permission, Role, RoleUserLink, User
 from app.core.security.checkers import check_existence
+from app.core.security.permission_cache import (
+    CHANGED_USERS_KEY,
+    permission_cache,
+)
 
 
 SUPER_ADMIN_ROLE_NAME = "superadmin"
@@ -34,23 +42,39 @@ ACTION_UPDATE = "w"
 ACTION_DELETE = "d"
 
 
-def create_global_permission(
+async def get_owner_role(db_session: AsyncSession, user: User) -> Role:
+    """
+    Returns the personal role holding the permissions on everything the
+    user creates, adding it to the session if the user has none yet.
+    """
+    role = (
+        await db_session.exec(select(Role).where(Role.owner_id == user.id))
+    ).first()
+    if role is None:
+        role = RoleBuilder().addUser(user).ownedBy(user).make()
+        db_session.add(role)
+    return role
+
+
+async def create_global_permission(
     role_id: str,
-    db_session: Session,
+    db_session: AsyncSession,
     resource_name: str,
     action_name: str,
     commit: bool = True,
 ):
-    role = db_session.get(Role, role_id)
+    role = await db_session.get(Role, role_id)
     if not role:
         raise HTTPException(
             status_code=HTTP_404_NOT_FOUND, detail="Role not found."
         )
     permission_in_db = (
-        db_session.exec(
+        await db_session.exec(
             select(Permission).where(
                 Permission.role_id == role_id,
-                Permission.name == f"{resource_name}:{action_name}",
+                Permission.resource_name == resource_name,
+                col(Permission.resource_id).is_(None),
+                Permission.action_name == action_name,
             )
         )
     ).first()
@@ -60,21 +84,22 @@ def create_global_permission(
             detail="The user already has this permission.",
         )
     permission = Permission(
-        name=f"{resource_name}:{action_name}",
+        resource_name=resource_name,
+        action_name=action_name,
         role_id=role_id,
     )
     if commit:
         db_session.add(permission)
-        db_session.commit()
-        db_session.refresh(permission)
+        await db_session.commit()
+        await db_session.refresh(permission)
     else:
         db_session.add(permission)
         return permission
 
 
-def create_permission(
+async def create_permission(
     _role: Role | None,
-    db_session: Session,
+    db_session: AsyncSession,
     resource_name: str,
     resource_id: Any,
     action_name: str,
@@ -86,11 +111,12 @@ def create_permission(
         detail="Not authorized to access this resource.",
     )
     permission_in_db = (
-        db_session.exec(
+        await db_session.exec(
             select(Permission).where(
                 Permission.role_id == role.id,
-                Permission.name
-                == f"{resource_name}:{str(resource_id)}:{action_name}",
+                Permission.resource_name == resource_name,
+                Permission.resource_id == str(resource_id),
+                Permission.action_name == action_name,
             )
         )
     ).first()
@@ -100,50 +126,102 @@ def create_permission(
             detail="The user already has this permission.",
         )
     permission = Permission(
-        name=f"{resource_name}:{resource_id}:{action_name}",
+        resource_name=resource_name,
+        resource_id=str(resource_id),
+        action_name=action_name,
         role_id=role.id,
     )
     if commit:
         db_session.add(permission)
-        db_session.commit()
-        db_session.refresh(permission)
+        await db_session.commit()
+        await db_session.refresh(permission)
     return permission
 
 
-def has_permission(
-    db_session: Session,
-    role: Role,
-    resource_name: str,
-    resource_id: str,
-    action_name: str,
-) -> bool:
-    permission = (
-        db_session.exec(
-            select(Permission).where(
-                Permission.role_id == role.id,
-                Permission.name
-                == f"{resource_name}:{resource_id}:{action_name}",
-            )
-        )
-    ).first()
-    return permission is not None
+class PermissionSnapshot(BaseModel):
+    role_names: frozenset[str]
+    # (resource_name, resource_id, action_name), resource_id is None for
+    # global permissions.
+    grants: frozenset[tuple[str, str | None, str]]
 
+    def has_permission(
+        self, resource_name: str, resource_id: str, action_name: str
+    ) -> bool:
+        return (resource_name, resource_id, action_name) in self.grants
 
-def has_global_permission(
-    db_session: Session,
-    role: Role,
-    resource_name: str,
-    action_name: str,
-) -> bool:
-    permission = (
-        db_session.exec(
-            select(Permission).where(
-                Permission.role_id == role.id,
-                Permission.name == f"{resource_name}:{action_name}",
-            )
+    def has_global_permission(
+        self, resource_name: str, action_name: str
+    ) -> bool:
+        return (resource_name, None, action_name) in self.grants
+
+
+PERMISSION_SNAPSHOT_KEY = "permission_snapshots"
+
+
+async def load_permission_snapshot(
+    db_session: AsyncSession, user_id: str
+) -> PermissionSnapshot:
+    """
+    Loads every role name and permission held by a user in a single
+    query. The result is kept on the session for the rest of the request
+    and in the process-wide permission cache, under the user's current
+    permissions version, which is read from the database on every request
+    so that a change committed by any worker takes effect at once.
+    """
+    snapshots: dict[str, PermissionSnapshot] = db_session.info.setdefault(
+        PERMISSION_SNAPSHOT_KEY, {}
+    )
+    if user_id in snapshots:
+        return snapshots[user_id]
+    version = (
+        await db_session.exec(
+            select(User.permissions_version).where(User.id == user_id)
         )
     ).first()
-    return permission is not None
+    cached = (
+        permission_cache.get(user_id, version) if version is not None else None
+    )
+    if cached is not None:
+        snapshots[user_id] = cached
+        return cached
+    rows = (
+        await db_session.exec(
+            select(
+                Role.name,
+                Permission.resource_name,
+                Permission.resource_id,
+                Permission.action_name,
+            )
+            .select_from(RoleUserLink)
+            .join(Role, col(Role.id) == RoleUserLink.role_id)
+            .outerjoin(Permission, col(Permission.role_id) == Role.id)
+            .where(RoleUserLink.user_id == user_id)
+        )
+    ).all()
+    snapshot = PermissionSnapshot(
+        role_names=frozenset(
+            role_name for role_name, *_ in rows if role_name is not None
+        ),
+        grants=frozenset(
+            (resource_name, resource_id, action_name)
+            for _, resource_name, resource_id, action_name in rows
+            if resource_name is not None
+        ),
+    )
+    snapshots[user_id] = snapshot
+    # The queries autoflush: a snapshot that saw this transaction's own
+    # changes to the user's grants must not outlive a rollback.
+    if version is not None and user_id not in db_session.info.get(
+        CHANGED_USERS_KEY, ()
+    ):
+        permission_cache.set(user_id, version, snapshot)
+    return snapshot
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_permission_snapshots(session: Session):
+    session.info.pop(PERMISSION_SNAPSHOT_KEY, None)
 
 
 class PermissionCheckModel(BaseModel):
@@ -158,70 +236,63 @@ class GlobalPermissionCheckModel(BaseModel):
 
 
 class PermissionChecker(BaseModel):
+    """
+    Authorizes a user against the union of the permissions granted by all
+    of their roles.
+    """
+
     model_config = {"arbitrary_types_allowed": True}
-    db_session: Session
-    roles: list[Role]
+    db_session: AsyncSession
+    user: User
     bypass_role: str | None = None
     bypass_roles: list[str] = []
     pcheck_models: Sequence[PermissionCheckModel | GlobalPermissionCheckModel]
 
     def _is_allowed(
         self,
-        role: Role,
+        snapshot: PermissionSnapshot,
         pcheck: PermissionCheckModel | GlobalPermissionCheckModel,
         action_name: str,
     ) -> bool:
         if isinstance(pcheck, PermissionCheckModel):
-            return has_permission(
-                db_session=self.db_session,
-                role=role,
+            return snapshot.has_permission(
                 resource_name=pcheck.resource_name,
                 resource_id=str(pcheck.resource_id),
                 action_name=action_name,
             )
-        elif isinstance(pcheck, GlobalPermissionCheckModel):
-            return has_global_permission(
-                db_session=self.db_session,
-                role=role,
-                resource_name=pcheck.resource_name,
-                action_name=action_name,
-            )
+        return snapshot.has_global_permission(
+            resource_name=pcheck.resource_name,
+            action_name=action_name,
+        )
 
-    def check(self, either: bool = False, message: str | None = None) -> bool:
-        def has_role():
-            role_names = [
-                role.name for role in self.roles if role.name is not None
-            ]
-            return self.bypass_role in role_names or any(
-                role in self.bypass_roles
-                for role in role_names
-                if role is not None
-            )
+    async def check(
+        self, either: bool = False, message: str | None = None
+    ) -> bool:
+        snapshot = await load_permission_snapshot(
+            self.db_session, self.user.id
+        )
 
-        if has_role():
+        if self.bypass_role in snapshot.role_names or any(
+            role in snapshot.role_names for role in self.bypass_roles
+        ):
             return True
 
+        allowed = [
+            self._is_allowed(snapshot, pcheck, action_name)
+            for pcheck in self.pcheck_models
+            for action_name in pcheck.action_names
+        ]
+
         if either:
-            for role in self.roles:
-                for pcheck in self.pcheck_models:
-                    for action_name in pcheck.action_names:
-                        if self._is_allowed(role, pcheck, action_name):
-                            return True
+            if any(allowed):
+                return True
             raise HTTPException(
                 401, message or "Not authorized to access this resource"
             )
 
-        for role in self.roles:
-            all_permissions_satisfied = True
-            for pcheck in self.pcheck_models:
-                for action_name in pcheck.action_names:
-                    if not self._is_allowed(role, pcheck, action_name):
-                        all_permissions_satisfied = False
-                        break
-                if not all_permissions_satisfied:
-                    break
-            if all_permissions_satisfied:
-                return True
+        # Without any check model there is nothing to deny.
+        if all(allowed):
+            return True
 
         raise HTTPException(
             401, message or "Not authorized to access resource"
@@ -0,0 +1,151 @@
+from collections import OrderedDict
+from datetime import datetime
+from itertools import chain
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.routes.v1.dto.metrics import AuthStatsDTO
+from app.core.config.env import get_env
+from app.core.db.models import LoginSession, User
+from app.utils.cache import LRUCache
+from app.utils.date import utc
+from app.utils.metrics import LatencyRecorder
+
+EVICTED_SESSIONS_KEY = "evicted_login_sessions"
+EVICTED_USERS_KEY = "evicted_session_users"
+
+
+class CachedLoginSession(BaseModel):
+    user_id: str
+    expires_at: datetime
+    expired: bool
+    user: dict[str, Any]
+
+    @classmethod
+    def from_login_session(cls, login_session: LoginSession):
+        return cls(
+            user_id=login_session.user_id,
+            expires_at=utc(login_session.expires_at),
+            expired=login_session.expired,
+            user=cls.dump_user(login_session.user),
+        )
+
+    @staticmethod
+    def dump_user(user: User) -> dict[str, Any]:
+        # The password hash is only read by login, which queries the user.
+        return user.model_dump(exclude={"hashed_password"})
+
+    async def attach_user(self, db_session: AsyncSession) -> User:
+        """
+        Rebuilds the user from the cached columns and attaches it to the
+        session without querying the database.
+        """
+        user = User(**self.user)
+        make_transient_to_detached(user)
+        return await db_session.merge(user, load=False)
+
+
+class SessionCache:
+    """
+    Cache of login sessions and the columns of their user, so that
+    authenticated requests do not have to query the database.
+
+    Like the permission cache, a load takes the current generation before
+    querying, and an eviction records the generation it happened at for
+    the session or user it evicts. An entry is only stored if neither its
+    session nor its user has been evicted since its load started, so a
+    logout committed during a load cannot be undone by it. Only the latest
+    `max_size` evictions are remembered; forgetting one raises the floor
+    below which loads are too old to be stored.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.sessions = LRUCache[str, CachedLoginSession](max_size, ttl)
+        self.user_sessions: dict[str, set[str]] = {}
+        self.evicted: OrderedDict[tuple[str, str], int] = OrderedDict()
+        self.generation = 0
+        self.floor = 0
+        self.latency = LatencyRecorder()
+
+    def version(self) -> int:
+        return self.generation
+
+    def get(self, session_id: str) -> CachedLoginSession | None:
+        return self.sessions.get(session_id)
+
+    def set(
+        self, session_id: str, version: int, cached: CachedLoginSession
+    ):
+        if (
+            self.evicted.get(("session", session_id), self.floor) > version
+            or self.evicted.get(("user", cached.user_id), self.floor)
+            > version
+        ):
+            return
+        self.sessions.set(session_id, cached)
+        # Drop ids the LRU has already evicted so the index stays bounded.
+        self.user_sessions[cached.user_id] = {
+            cached_id
+            for cached_id in self.user_sessions.get(cached.user_id, ())
+            if cached_id in self.sessions.entries
+        } | {session_id}
+
+    def record_eviction(self, key: tuple[str, str]):
+        self.generation += 1
+        self.evicted[key] = self.generation
+        self.evicted.move_to_end(key)
+        while len(self.evicted) > self.max_size:
+            _, generation = self.evicted.popitem(last=False)
+            self.floor = max(self.floor, generation)
+
+    def evict(self, session_id: str):
+        self.record_eviction(("session", session_id))
+        self.sessions.pop(session_id)
+
+    def evict_user(self, user_id: str):
+        self.record_eviction(("user", user_id))
+        for session_id in self.user_sessions.pop(user_id, ()):
+            self.sessions.pop(session_id)
+
+    def to_dto(self) -> AuthStatsDTO:
+        return AuthStatsDTO(
+            session_cache=self.sessions.to_dto(),
+            latency=self.latency.to_dto(),
+        )
+
+
+session_cache = SessionCache(
+    max_size=int(get_env("SESSION_CACHE_SIZE", "10000")),
+    ttl=float(get_env("SESSION_CACHE_TTL", "60")),
+)
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_evictions(session: Session, flush_context, instances):
+    for obj in chain(session.dirty, session.deleted):
+        if isinstance(obj, LoginSession):
+            session.info.setdefault(EVICTED_SESSIONS_KEY, set()).add(obj.id)
+        elif isinstance(obj, User) and (
+            obj in session.deleted
+            or session.is_modified(obj, include_collections=False)
+        ):
+            session.info.setdefault(EVICTED_USERS_KEY, set()).add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_changed(session: Session):
+    for session_id in session.info.pop(EVICTED_SESSIONS_KEY, ()):
+        session_cache.evict(session_id)
+    for user_id in session.info.pop(EVICTED_USERS_KEY, ()):
+        session_cache.evict_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_evictions(session: Session):
+    session.info.pop(EVICTED_SESSIONS_KEY, None)
+    session.info.pop(EVICTED_USERS_KEY, None)
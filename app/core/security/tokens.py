@@ -0,0 +1,93 @@
+import base64
+import hashlib
+import hmac
+from datetime import datetime, timezone
+
+from pydantic import BaseModel, ValidationError
+
+from app.core.config.env import get_env
+
+AUTH_MODE_SESSION = "session"
+AUTH_MODE_TOKEN = "token"
+
+# "session" looks every login session up by its id, "token" issues signed
+# session tokens so that forged or expired cookies are rejected without a
+# database round-trip; valid ones are still checked against their login
+# session, which logout expires.
+AUTH_MODE = get_env("AUTH_MODE", AUTH_MODE_SESSION)
+SESSION_SECRET = get_env("SESSION_SECRET")
+
+if AUTH_MODE == AUTH_MODE_TOKEN and not SESSION_SECRET:
+    raise RuntimeError("SESSION_SECRET must be set when AUTH_MODE is token.")
+
+
+class SessionClaims(BaseModel):
+    sub: str  # user id
+    jti: str  # login session id
+    exp: int  # unix timestamp
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _signature(payload: str) -> str:
+    return _b64encode(
+        hmac.new(
+            SESSION_SECRET.encode(), payload.encode(), hashlib.sha256
+        ).digest()
+    )
+
+
+class RevocationList:
+    """
+    Ids of tokens revoked by logout in this process, kept until the token
+    would have expired anyway. Other workers learn of a logout from the
+    expired login session row.
+    """
+
+    def __init__(self) -> None:
+        self.revoked: dict[str, int] = {}
+
+    def revoke(self, claims: SessionClaims):
+        now = datetime.now(timezone.utc).timestamp()
+        self.revoked = {
+            jti: exp for jti, exp in self.revoked.items() if exp > now
+        }
+        self.revoked[claims.jti] = claims.exp
+
+    def is_revoked(self, jti: str) -> bool:
+        return jti in self.revoked
+
+
+revocation_list = RevocationList()
+
+
+def sign_session_token(claims: SessionClaims) -> str:
+    payload = _b64encode(claims.model_dump_json().encode())
+    return f"{payload}.{_signature(payload)}"
+
+
+def read_session_token(token: str) -> SessionClaims | None:
+    """
+    Returns the claims of a token if its signature is valid and it has
+    neither expired nor been revoked.
+    """
+    payload, _, signature = token.partition(".")
+    if not hmac.compare_digest(
+        signature.encode(), _signature(payload).encode()
+    ):
+        return None
+    try:
+        claims = SessionClaims.model_validate_json(_b64decode(payload))
+    except (ValueError, ValidationError):
+        return None
+    if claims.exp <= datetime.now(timezone.utc).timestamp():
+        return None
+    if revocation_list.is_revoked(claims.jti):
+        return None
+    return claims
@@ -0,0 +1,240 @@
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import case, func
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.routes.v1.dto.form import FieldStatsDTO, FormStatsDTO
+from app.core.config.env import get_env
+from app.core.db.models import (
+    AnswerSession,
+    FieldAnswer,
+    Form,
+    FormField,
+    FormStats,
+)
+from app.core.db.setup import engine
+from app.core.db.utils import upsert_statement
+from app.core.logging.log import log_error
+
+OPTION_FIELD_TYPES = ["Boolean", "Select", "Multiselect"]
+SUMMARIZED_FIELD_TYPES = OPTION_FIELD_TYPES + ["Numerical"]
+
+
+def submitted_answers(form_id: UUID, *columns):
+    """Selects `columns` over the non-empty answers of submitted sessions."""
+    return (
+        select(*columns)
+        .select_from(FieldAnswer)
+        .join(AnswerSession)
+        .where(
+            AnswerSession.form_id == form_id,
+            col(AnswerSession.submitted),
+            col(FieldAnswer.value).is_not(None),
+            FieldAnswer.value != "",
+        )
+    )
+
+
+async def count_submitted(db_session: AsyncSession, form_id: UUID) -> int:
+    return (
+        await db_session.exec(
+            select(func.count()).where(
+                AnswerSession.form_id == form_id,
+                col(AnswerSession.submitted),
+            )
+        )
+    ).one()
+
+
+async def compute_form_stats(
+    db_session: AsyncSession, form_id: UUID
+) -> FormStatsDTO:
+    """
+    Summarizes the submitted responses of a form with a few grouped
+    queries. Choice and numerical answers are grouped by value, so Python
+    only sees one row per distinct value, not one per response.
+    """
+    started, submitted = (
+        await db_session.exec(
+            select(
+                func.count(),
+                func.count(case((col(AnswerSession.submitted), 1))),
+            ).where(AnswerSession.form_id == form_id)
+        )
+    ).one()
+    fields = (
+        await db_session.exec(
+            select(FormField)
+            .where(FormField.form_id == form_id)
+            .order_by(col(FormField.position))
+        )
+    ).all()
+    field_types = {field.id: field.field_type for field in fields}
+
+    answered: defaultdict[UUID, int] = defaultdict(int)
+    options: defaultdict[UUID, defaultdict[str, int]] = defaultdict(
+        lambda: defaultdict(int)
+    )
+    numbers: defaultdict[UUID, list[tuple[float, int]]] = defaultdict(list)
+    answered_rows = await db_session.exec(
+        submitted_answers(
+            form_id, col(FieldAnswer.field_id), func.count()
+        ).group_by(col(FieldAnswer.field_id))
+    )
+    for field_id, count in answered_rows:
+        answered[field_id] = count
+    summarized_ids = [
+        field.id
+        for field in fields
+        if field.field_type in SUMMARIZED_FIELD_TYPES
+    ]
+    value_rows = await db_session.exec(
+        submitted_answers(
+            form_id,
+            col(FieldAnswer.field_id),
+            col(FieldAnswer.value),
+            func.count(),
+        )
+        .where(col(FieldAnswer.field_id).in_(summarized_ids))
+        .group_by(col(FieldAnswer.field_id), col(FieldAnswer.value))
+    )
+    for field_id, value, count in value_rows:
+        match field_types[field_id]:
+            case "Multiselect":
+                for option in value.split(","):
+                    options[field_id][option] += count
+            case "Numerical":
+                try:
+                    numbers[field_id].append((float(value), count))
+                except ValueError:
+                    pass
+            case _:
+                options[field_id][value] += count
+
+    field_stats: list[FieldStatsDTO] = []
+    for field in fields:
+        stats = FieldStatsDTO(
+            field_id=field.id,
+            label=field.label,
+            field_type=field.field_type,
+            answered=answered[field.id],
+        )
+        if field.field_type in OPTION_FIELD_TYPES:
+            stats.option_counts = dict(options[field.id])
+        elif field.field_type == "Numerical" and numbers[field.id]:
+            values = numbers[field.id]
+            stats.min = min(value for value, _ in values)
+            stats.max = max(value for value, _ in values)
+            stats.mean = sum(value * count for value, count in values) / sum(
+                count for _, count in values
+            )
+        field_stats.append(stats)
+
+    return FormStatsDTO(
+        form_id=form_id,
+        started=started,
+        submitted=submitted,
+        completion_rate=submitted / started if started else 0.0,
+        fields=field_stats,
+        refreshed_at=datetime.now(timezone.utc),
+    )
+
+
+async def refresh_form_stats(
+    db_session: AsyncSession, form_id: UUID
+) -> FormStatsDTO:
+    stats = await compute_form_stats(db_session, form_id)
+    # An upsert, as a request and the refresher may store the same form.
+    statement = upsert_statement(db_session, FormStats).values(
+        form_id=form_id,
+        submitted=stats.submitted,
+        summary=stats.model_dump_json(),
+        refreshed_at=stats.refreshed_at,
+    )
+    await db_session.execute(
+        statement.on_conflict_do_update(
+            index_elements=["form_id"],
+            set_={
+                "submitted": statement.excluded.submitted,
+                "summary": statement.excluded.summary,
+                "refreshed_at": statement.excluded.refreshed_at,
+            },
+        )
+    )
+    await db_session.commit()
+    return stats
+
+
+class FormStatsRefresher:
+    """
+    Recomputes the stored summary of forms whose responses changed, every
+    `interval` seconds, so that reading the stats of a form never scans
+    its responses. An interval of 0 disables it; stale summaries are then
+    recomputed when read.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.stale: set[UUID] = set()
+        self.task: asyncio.Task[None] | None = None
+
+    def mark_stale(self, form_id: UUID):
+        if self.interval > 0:
+            self.stale.add(form_id)
+
+    async def refresh_stale(self):
+        form_ids, self.stale = self.stale, set()
+        try:
+            async with AsyncSession(
+                engine, expire_on_commit=False
+            ) as db_session:
+                for form_id in form_ids:
+                    try:
+                        if await db_session.get(Form, form_id) is not None:
+                            await refresh_form_stats(db_session, form_id)
+                    except Exception as e:
+                        await db_session.rollback()
+                        self.stale.add(form_id)
+                        log_error(
+                            f"Error refreshing form {form_id} stats: {e}"
+                        )
+        except BaseException:
+            # Refreshing is idempotent, so the whole batch is retried.
+            self.stale |= form_ids
+            raise
+
+    async def loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                if self.stale:
+                    await self.refresh_stale()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log_error(f"Error refreshing form stats: {e}")
+
+    def start(self):
+        if self.interval > 0 and self.task is None:
+            self.task = asyncio.create_task(
+                self.loop(), name="form-stats-refresher"
+            )
+
+    async def stop(self):
+        if self.task is None:
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+
+
+form_stats_refresher = FormStatsRefresher(
+    interval=float(get_env("FORM_STATS_REFRESH_INTERVAL", "30"))
+)
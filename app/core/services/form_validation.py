@@ -0,0 +1,153 @@
+import re
+from datetime import date
+from typing import Any, Callable
+from uuid import UUID
+
+import phonenumbers
+from pydantic import EmailStr, HttpUrl, TypeAdapter
+
+from app.core.config.env import get_env
+from app.core.db.models import FormField
+from app.utils.cache import LRUCache
+
+# Checks receive the raw answer and the answer as a string ("" for None).
+Check = Callable[[str | None, str], bool]
+Validator = Callable[[str | None], bool]
+FieldSignature = tuple[str, bool, str | None, str | None, str | None]
+
+BOOLEAN_ANSWERS = frozenset(["0", "1"])
+ALPHA_PATTERN = re.compile(r"[a-zA-Z ]+")
+ALPHANUM_PATTERN = re.compile(r"[a-zA-Z0-9 ]+")
+EMAIL_ADAPTER = TypeAdapter(EmailStr)
+DATE_ADAPTER = TypeAdapter(date)
+URL_ADAPTER = TypeAdapter(HttpUrl)
+
+
+def parse_bounds(bounds: str) -> tuple[int, int]:
+    low, high = (int(bound) for bound in bounds.split(":"))
+    return low, high
+
+
+def adapter_check(adapter: TypeAdapter[Any]) -> Check:
+    def check(answer: str | None, value: str) -> bool:
+        try:
+            adapter.validate_python(value)
+        except ValueError:
+            return False
+        return True
+
+    return check
+
+
+def pattern_check(pattern: re.Pattern[str]) -> Check:
+    return lambda answer, value: pattern.fullmatch(value) is not None
+
+
+def phone_check(answer: str | None, value: str) -> bool:
+    try:
+        return phonenumbers.is_valid_number(phonenumbers.parse(value))
+    except phonenumbers.NumberParseException:
+        return False
+
+
+TYPE_CHECKS: dict[str, Check] = {
+    "Email": adapter_check(EMAIL_ADAPTER),
+    "Phone": phone_check,
+    "Date": adapter_check(DATE_ADAPTER),
+    "URL": adapter_check(URL_ADAPTER),
+    "Alpha": pattern_check(ALPHA_PATTERN),
+    "Alphanum": pattern_check(ALPHANUM_PATTERN),
+}
+
+
+def field_signature(field: FormField) -> FieldSignature:
+    return (
+        field.field_type,
+        field.required,
+        field.possible_answers,
+        field.number_bounds,
+        field.text_bounds,
+    )
+
+
+def compile_validator(field: FormField) -> Validator:
+    """
+    Turns the configuration of a field into a single callable, so that
+    bounds and choices are parsed once instead of on every answer.
+    """
+    checks: list[Check] = []
+    if field.required:
+        checks.append(lambda answer, value: bool(answer))
+
+    choices = (
+        frozenset(
+            choice.strip() for choice in field.possible_answers.split("\\")
+        )
+        if field.possible_answers is not None
+        else frozenset()
+    )
+    match field.field_type:
+        case "Boolean":
+            checks.append(lambda answer, value: answer in BOOLEAN_ANSWERS)
+        case "Select":
+            checks.append(lambda answer, value: answer in choices)
+        case "Multiselect":
+            checks.append(
+                lambda answer, value: all(
+                    choice in choices for choice in (answer or "").split(",")
+                )
+            )
+        case "Numerical" if field.number_bounds is not None:
+            low, high = parse_bounds(field.number_bounds)
+            checks.append(
+                # isdigit() alone accepts digits such as "²" that int()
+                # cannot parse.
+                lambda answer, value: value.isascii()
+                and value.isdigit()
+                and low <= int(value) <= high
+            )
+        case "Text" | "LongText" if field.text_bounds is not None:
+            min_length, max_length = parse_bounds(field.text_bounds)
+            checks.append(
+                lambda answer, value: min_length <= len(value) <= max_length
+            )
+        case field_type if field_type in TYPE_CHECKS:
+            checks.append(TYPE_CHECKS[field_type])
+
+    def validate(answer: str | None) -> bool:
+        value = str(answer or "")
+        return all(check(answer, value) for check in checks)
+
+    return validate
+
+
+class FieldValidatorCache:
+    """
+    Compiled validators keyed by field id. Each entry remembers the field
+    configuration it was compiled from and is recompiled when it no longer
+    matches, so a field edited through another worker is never validated
+    against its old rules.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.validators = LRUCache[UUID, tuple[FieldSignature, Validator]](
+            max_size, ttl
+        )
+
+    def get(self, field: FormField) -> Validator:
+        signature = field_signature(field)
+        cached = self.validators.get(field.id)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        validator = compile_validator(field)
+        self.validators.set(field.id, (signature, validator))
+        return validator
+
+    def evict(self, field_id: UUID):
+        self.validators.pop(field_id)
+
+
+field_validators = FieldValidatorCache(
+    max_size=int(get_env("FIELD_VALIDATOR_CACHE_SIZE", "10000")),
+    ttl=float(get_env("FIELD_VALIDATOR_CACHE_TTL", "3600")),
+)
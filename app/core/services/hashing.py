@@ -0,0 +1,92 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable
+
+from fastapi import HTTPException
+from starlette.status import HTTP_503_SERVICE_UNAVAILABLE
+
+from app.api.routes.v1.dto.metrics import HashingPoolStatsDTO
+from app.core.config import env
+from app.core.logging.log import log_warning
+from app.utils import crypto
+from app.utils.metrics import LatencyRecorder
+
+HASHING_WORKERS = int(env.get_env("HASHING_WORKERS", "4"))
+HASHING_MAX_PENDING = int(env.get_env("HASHING_MAX_PENDING", "64"))
+
+
+class HashingPool:
+    """
+    Runs password hashing in a dedicated thread pool so that bcrypt does
+    not block the event loop. Calls beyond `max_pending` are rejected with
+    a 503 instead of queueing without bound.
+    """
+
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="hashing"
+        )
+        self.pending = 0
+        self.rejected = 0
+        self.latency = LatencyRecorder()
+
+    async def run[T](self, fn: Callable[..., T], *args) -> T:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            log_warning("Password hashing pool saturated.")
+            raise HTTPException(
+                status_code=HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy, please try again.",
+                headers={"Retry-After": "1"},
+            )
+        loop = asyncio.get_running_loop()
+        started = perf_counter()
+        self.pending += 1
+        future = self.executor.submit(fn, *args)
+        # Released when the worker is done rather than when the caller
+        # stops waiting, so cancelled requests still count until then.
+        future.add_done_callback(lambda _: self.release(loop, started))
+        return await asyncio.wrap_future(future)
+
+    def release(self, loop: asyncio.AbstractEventLoop, started: float):
+        # Runs in the worker thread; the counters belong to the loop.
+        try:
+            loop.call_soon_threadsafe(self.done, started)
+        except RuntimeError:
+            pass  # The loop is closed, there is nothing left to count.
+
+    def done(self, started: float):
+        self.pending -= 1
+        self.latency.record(perf_counter() - started)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def to_dto(self) -> HashingPoolStatsDTO:
+        return HashingPoolStatsDTO(
+            workers=self.workers,
+            max_pending=self.max_pending,
+            pending=self.pending,
+            rejected=self.rejected,
+            latency=self.latency.to_dto(),
+        )
+
+
+hashing_pool = HashingPool(
+    workers=HASHING_WORKERS, max_pending=HASHING_MAX_PENDING
+)
+
+
+async def hash_password(password: str) -> str:
+    return await hashing_pool.run(crypto.hash_password, password)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    return await hashing_pool.run(
+        crypto.verify_and_update_password, plain_password, hashed_password
+    )
@@ -0,0 +1,136 @@
+import asyncio
+from datetime import datetime, timezone
+from time import perf_counter
+
+from sqlmodel import col, delete, or_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.routes.v1.dto.metrics import ReaperStatsDTO
+from app.core.config.env import get_env
+from app.core.db.models import (
+    AccountVerificationSession,
+    AuthSession,
+    LoginSession,
+)
+from app.core.db.setup import engine
+from app.core.logging.log import log_error, log_info
+from app.core.security.session_cache import session_cache
+from app.utils.metrics import LatencyRecorder
+
+SessionModel = type[LoginSession | AuthSession | AccountVerificationSession]
+
+REAPED_MODELS: list[SessionModel] = [
+    LoginSession,
+    AuthSession,
+    AccountVerificationSession,
+]
+
+
+class SessionReaper:
+    """
+    Periodically deletes expired login, auth and account verification
+    sessions. Rows are deleted in batches of `batch_size`, walking the
+    primary key, and each batch is committed on its own so that no run
+    holds locks for long.
+    """
+
+    def __init__(self, interval: float, batch_size: int) -> None:
+        self.interval = interval
+        self.batch_size = batch_size
+        self.task: asyncio.Task[None] | None = None
+        self.runs = 0
+        self.failures = 0
+        self.last_run_at: datetime | None = None
+        self.last_run: dict[str, int] = {}
+        self.total: dict[str, int] = {}
+        self.duration = LatencyRecorder()
+
+    async def reap_model(self, db_session: AsyncSession, model: SessionModel):
+        now = datetime.now(timezone.utc)
+        is_expired = or_(col(model.expired), col(model.expires_at) <= now)
+        reaped = 0
+        last_id = ""
+        while True:
+            ids = list(
+                await db_session.exec(
+                    select(model.id)
+                    .where(is_expired, col(model.id) > last_id)
+                    .order_by(col(model.id))
+                    .limit(self.batch_size)
+                )
+            )
+            if not ids:
+                break
+            await db_session.execute(
+                delete(model).where(col(model.id).in_(ids))
+            )
+            await db_session.commit()
+            if model is LoginSession:
+                for session_id in ids:
+                    session_cache.evict(session_id)
+            reaped += len(ids)
+            if len(ids) < self.batch_size:
+                break
+            last_id = ids[-1]
+        return reaped
+
+    async def run_once(self) -> dict[str, int]:
+        started = perf_counter()
+        counts: dict[str, int] = {}
+        async with AsyncSession(engine, expire_on_commit=False) as db_session:
+            for model in REAPED_MODELS:
+                table = str(model.__tablename__)
+                counts[table] = await self.reap_model(db_session, model)
+        self.duration.record(perf_counter() - started)
+        self.runs += 1
+        self.last_run_at = datetime.now(timezone.utc)
+        self.last_run = counts
+        for table, count in counts.items():
+            self.total[table] = self.total.get(table, 0) + count
+        if any(counts.values()):
+            log_info(f"Reaped expired sessions: {counts}")
+        return counts
+
+    async def loop(self):
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failures += 1
+                log_error(f"Error reaping expired sessions: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self.interval > 0 and self.task is None:
+            self.task = asyncio.create_task(self.loop(), name="session-reaper")
+
+    async def stop(self):
+        if self.task is None:
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+
+    def to_dto(self) -> ReaperStatsDTO:
+        return ReaperStatsDTO(
+            interval=self.interval,
+            batch_size=self.batch_size,
+            running=self.task is not None and not self.task.done(),
+            runs=self.runs,
+            failures=self.failures,
+            last_run_at=self.last_run_at,
+            last_run=self.last_run,
+            total=self.total,
+            duration=self.duration.to_dto(),
+        )
+
+
+session_reaper = SessionReaper(
+    interval=float(get_env("SESSION_REAPER_INTERVAL", "600")),
+    batch_size=int(get_env("SESSION_REAPER_BATCH_SIZE", "500")),
+)
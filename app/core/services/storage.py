@@ -1,30 +1,208 @@
+import hashlib
 import os
-import shutil
-from io import BytesIO
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import BinaryIO
 
-from fastapi import UploadFile
+from sqlalchemy import func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import env
 from app.core.db.models import FileResource
+from app.core.services.storage_backends import (
+    CHUNK_SIZE,
+    LocalStorage,
+    S3Storage,
+    StorageBackend,
+)
 
 STORAGE = env.get_env("STORAGE", "fs/storage")
-os.makedirs(STORAGE, exist_ok=True)
 
+MAX_FILE_SIZE = 5 * 1024 * 1024
 
-def write_bytes(stream: BytesIO, resource: FileResource):
-    with open(f"{STORAGE}/{resource.id}", "wb") as buffer:
-        shutil.copyfileobj(stream, buffer)
 
+class FileTooLargeError(ValueError):
+    pass
 
-def write_file(uploaded_file: UploadFile, resource: FileResource):
-    with open(f"{STORAGE}/{resource.id}", "wb") as buffer:
-        shutil.copyfileobj(uploaded_file.file, buffer)
 
+def create_backend() -> StorageBackend:
+    match env.get_env("STORAGE_BACKEND", "local"):
+        case "local":
+            return LocalStorage(STORAGE)
+        case "s3":
+            return S3Storage(
+                bucket=env.get_env("S3_BUCKET"),
+                endpoint_url=env.get_env("S3_ENDPOINT_URL") or None,
+                region=env.get_env("S3_REGION") or None,
+                access_key_id=env.get_env("S3_ACCESS_KEY_ID") or None,
+                secret_access_key=env.get_env("S3_SECRET_ACCESS_KEY") or None,
+                presign_ttl=int(env.get_env("S3_PRESIGN_TTL", "300")),
+            )
+        case other:
+            raise ValueError(f"Unknown STORAGE_BACKEND: {other}")
 
-def get_file(resource: FileResource):
-    with open(f"{STORAGE}/{resource.id}", "rb") as buffer:
-        return buffer.read()
 
+backend = create_backend()
 
-def delete_file(resource: FileResource):
-    os.remove(f"{STORAGE}/{resource.id}")
+
+def blob_key(digest: str) -> str:
+    """
+    Content is stored once per SHA-256 digest, under two levels of
+    directories named after its first four hex digits.
+    """
+    return f"{digest[:2]}/{digest[2:4]}/{digest}"
+
+
+def legacy_key(resource: FileResource) -> str:
+    """Where files were stored, by resource id, before content addressing."""
+    return str(resource.id)
+
+
+@dataclass
+class StagedBlob:
+    path: str
+    digest: str
+    size: int
+
+
+def stage_stream(
+    source: BinaryIO, max_size: int = MAX_FILE_SIZE
+) -> StagedBlob:
+    """
+    Copies `source` from the start into a file staged by the backend,
+    computing the SHA-256 hex digest and size of its content on the way,
+    so that an upload is read only once. Blocking, run it in a worker
+    thread.
+
+    Raises FileTooLargeError as soon as more than `max_size` bytes are
+    read, leaving nothing staged.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    source.seek(0)
+    buffer, path = backend.stage()
+    try:
+        with buffer:
+            while chunk := source.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    raise FileTooLargeError(
+                        f"File size exceeds {max_size} bytes"
+                    )
+                digest.update(chunk)
+                buffer.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return StagedBlob(path=path, digest=digest.hexdigest(), size=size)
+
+
+def discard_staged(staged: StagedBlob):
+    """Removes a staged file unless it was stored. Blocking."""
+    with suppress(FileNotFoundError):
+        os.unlink(staged.path)
+
+
+def store_staged(staged: StagedBlob) -> bool:
+    """
+    Stores a staged file as the blob of its digest, or discards it if that
+    blob is already there. Blocking, run it in a worker thread. Returns
+    whether anything was stored.
+    """
+    key = blob_key(staged.digest)
+    if backend.exists(key):
+        discard_staged(staged)
+        return False
+    backend.put_staged(key, staged.path)
+    return True
+
+
+def store_stream(source: BinaryIO, digest: str) -> bool:
+    """
+    Stores the content of `source` as the blob of `digest` unless it is
+    already there. Blocking, run it in a worker thread. Returns whether
+    anything was written.
+    """
+    key = blob_key(digest)
+    if backend.exists(key):
+        return False
+    backend.put(key, source)
+    return True
+
+
+async def lock_digest(
+    db_session: AsyncSession, digest: str, shared: bool = False
+):
+    """
+    Locks the blob of `digest` until the session's transaction ends.
+    Uploads take the lock shared from before checking whether the blob
+    exists until their row is committed; releasing a blob takes it
+    exclusively around counting references and deleting. So a blob is
+    never deleted between an upload finding it and referencing it.
+
+    Only PostgreSQL has advisory locks; SQLite is for development and is
+    left unlocked.
+    """
+    if db_session.get_bind().dialect.name != "postgresql":
+        return
+    lock = (
+        func.pg_advisory_xact_lock_shared
+        if shared
+        else func.pg_advisory_xact_lock
+    )
+    await db_session.exec(select(lock(func.hashtext(digest))))
+
+
+async def store_blob(db_session: AsyncSession, staged: StagedBlob):
+    """
+    Stores a staged file as the blob of its digest under a shared lock,
+    which is held until the caller commits the row referencing it.
+    """
+    await lock_digest(db_session, staged.digest, shared=True)
+    await run_in_threadpool(store_staged, staged)
+
+
+def locate(resource: FileResource) -> str:
+    """Returns the key holding the content of a resource. Blocking."""
+    if resource.sha256 is not None:
+        key = blob_key(resource.sha256)
+        if backend.exists(key):
+            return key
+    key = legacy_key(resource)
+    if not backend.exists(key):
+        raise FileNotFoundError(key)
+    return key
+
+
+def hash_stored(key: str) -> str:
+    digest = hashlib.sha256()
+    for chunk in backend.get_stream(key):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def count_references(db_session: AsyncSession, digest: str) -> int:
+    return (
+        await db_session.exec(
+            select(func.count()).where(FileResource.sha256 == digest)
+        )
+    ).one()
+
+
+async def release_file(db_session: AsyncSession, resource: FileResource):
+    """
+    Removes the stored content of a resource whose row is gone. Its blob
+    is shared by every resource with the same content, so it is only
+    deleted once no committed row references it anymore. Commits the
+    session.
+    """
+    if resource.sha256 is not None:
+        await lock_digest(db_session, resource.sha256)
+        if not await count_references(db_session, resource.sha256):
+            await run_in_threadpool(
+                backend.delete, blob_key(resource.sha256)
+            )
+        await db_session.commit()
+    await run_in_threadpool(backend.delete, legacy_key(resource))
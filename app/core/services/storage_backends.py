@@ -0,0 +1,276 @@
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, BinaryIO, Generator, Protocol
+from urllib.parse import quote
+
+if TYPE_CHECKING:
+    from botocore.exceptions import ClientError
+
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class BlobStat:
+    size: int
+    modified: datetime
+
+
+class StorageBackend(Protocol):
+    """
+    Where file contents live, addressed by key. Every method blocks, run
+    them in a worker thread. Reading a missing key raises
+    FileNotFoundError.
+    """
+
+    def put(self, key: str, source: BinaryIO) -> None:
+        """Stores `source` from its start; readers never see it partly."""
+        ...
+
+    def stage(self) -> tuple[BinaryIO, str]:
+        """
+        Creates a local file, opened for writing, that `put_staged` can
+        store cheaply, and returns it with its path.
+        """
+        ...
+
+    def put_staged(self, key: str, path: str) -> None:
+        """
+        Stores the staged file at `path`, which the caller removes if this
+        raises; readers never see it partly.
+        """
+        ...
+
+    def get_stream(
+        self, key: str, start: int = 0, end: int | None = None
+    ) -> Generator[bytes]:
+        """
+        Yields bytes `start` to `end` (inclusive, or the last one). Closing
+        the generator early releases the underlying file or connection.
+        """
+        ...
+
+    def delete(self, key: str) -> None:
+        """Deletes `key`, doing nothing when it does not exist."""
+        ...
+
+    def exists(self, key: str) -> bool: ...
+
+    def stat(self, key: str) -> BlobStat: ...
+
+    def local_path(self, key: str) -> str | None:
+        """A path the server can send from directly, if there is one."""
+        ...
+
+    def presigned_url(
+        self, key: str, filename: str, media_type: str
+    ) -> str | None:
+        """A temporary URL clients can download from, if supported."""
+        ...
+
+
+def content_disposition(filename: str) -> str:
+    return f"attachment; filename*=utf-8''{quote(filename)}"
+
+
+class LocalStorage:
+    """Stores each key as a file under `root`."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return f"{self.root}/{key}"
+
+    def put(self, key: str, source: BinaryIO) -> None:
+        source.seek(0)
+        buffer, temp_path = self.stage()
+        try:
+            with buffer:
+                while chunk := source.read(CHUNK_SIZE):
+                    buffer.write(chunk)
+            self.put_staged(key, temp_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def stage(self) -> tuple[BinaryIO, str]:
+        # Under the root, so that storing it is a rename.
+        fd, path = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        return os.fdopen(fd, "wb"), path
+
+    def put_staged(self, key: str, path: str) -> None:
+        target = self.path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(path, target)
+
+    def get_stream(
+        self, key: str, start: int = 0, end: int | None = None
+    ) -> Generator[bytes]:
+        buffer = open(self.path(key), "rb")
+        buffer.seek(start)
+
+        def read() -> Generator[bytes]:
+            with buffer:
+                remaining = None if end is None else end - start + 1
+                while remaining is None or remaining > 0:
+                    size = CHUNK_SIZE
+                    if remaining is not None:
+                        size = min(size, remaining)
+                        remaining -= size
+                    if not (chunk := buffer.read(size)):
+                        return
+                    yield chunk
+
+        return read()
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self.path(key))
+
+    def stat(self, key: str) -> BlobStat:
+        result = os.stat(self.path(key))
+        return BlobStat(
+            size=result.st_size,
+            modified=datetime.fromtimestamp(result.st_mtime, timezone.utc),
+        )
+
+    def local_path(self, key: str) -> str | None:
+        path = self.path(key)
+        return path if os.path.isfile(path) else None
+
+    def presigned_url(
+        self, key: str, filename: str, media_type: str
+    ) -> str | None:
+        return None
+
+
+class S3Storage:
+    """
+    Stores each key as an object of an S3-compatible bucket. Downloads are
+    redirected to presigned URLs, so file bytes never pass through the
+    API. Requires boto3 (`pip install loslc[s3]`).
+    """
+
+    MISSING_CODES = frozenset(["404", "NoSuchKey", "NotFound"])
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: str | None = None,
+        region: str | None = None,
+        access_key_id: str | None = None,
+        secret_access_key: str | None = None,
+        presign_ttl: int = 300,
+    ) -> None:
+        try:
+            import boto3
+            from botocore.config import Config
+            from botocore.exceptions import ClientError
+        except ImportError as e:
+            raise RuntimeError(
+                "STORAGE_BACKEND=s3 requires boto3, install loslc[s3]"
+            ) from e
+
+        self.bucket = bucket
+        self.presign_ttl = presign_ttl
+        self.client_error = ClientError
+        self.client: Any = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+            # Path-style addressing works with MinIO and similar servers.
+            config=Config(
+                signature_version="s3v4", s3={"addressing_style": "path"}
+            ),
+        )
+
+    def is_missing(self, error: "ClientError") -> bool:
+        code = error.response.get("Error", {}).get("Code")
+        return code in self.MISSING_CODES
+
+    def put(self, key: str, source: BinaryIO) -> None:
+        source.seek(0)
+        # Uploads are multipart above the transfer threshold; either way
+        # the object only becomes visible once complete.
+        self.client.upload_fileobj(source, self.bucket, key)
+
+    def stage(self) -> tuple[BinaryIO, str]:
+        fd, path = tempfile.mkstemp(prefix="loslc-upload-")
+        return os.fdopen(fd, "wb"), path
+
+    def put_staged(self, key: str, path: str) -> None:
+        self.client.upload_file(path, self.bucket, key)
+        os.unlink(path)
+
+    def get_stream(
+        self, key: str, start: int = 0, end: int | None = None
+    ) -> Generator[bytes]:
+        kwargs: dict[str, str] = {}
+        if start or end is not None:
+            kwargs["Range"] = f"bytes={start}-{'' if end is None else end}"
+        try:
+            response = self.client.get_object(
+                Bucket=self.bucket, Key=key, **kwargs
+            )
+        except self.client_error as e:
+            if self.is_missing(e):
+                raise FileNotFoundError(key) from e
+            raise
+        body = response["Body"]
+
+        def read() -> Generator[bytes]:
+            # An unread body holds its connection out of the pool.
+            try:
+                yield from body.iter_chunks(CHUNK_SIZE)
+            finally:
+                body.close()
+
+        return read()
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.stat(key)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def stat(self, key: str) -> BlobStat:
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=key)
+        except self.client_error as e:
+            if self.is_missing(e):
+                raise FileNotFoundError(key) from e
+            raise
+        return BlobStat(
+            size=head["ContentLength"], modified=head["LastModified"]
+        )
+
+    def local_path(self, key: str) -> str | None:
+        return None
+
+    def presigned_url(
+        self, key: str, filename: str, media_type: str
+    ) -> str | None:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": key,
+                "ResponseContentType": media_type,
+                "ResponseContentDisposition": content_disposition(filename),
+            },
+            ExpiresIn=self.presign_ttl,
+        )
@@ -0,0 +1,115 @@
+"""
+Moves files stored by resource id into the content-addressed layout.
+
+    python -m app.core.services.storage_migration
+
+Each file directly under STORAGE named after a FileResource is hashed, the
+digest is committed on its row, and only then is the file stored as a
+blob of the configured backend, unless a blob with the same content
+already exists, and removed.
+An interrupted run leaves every file readable and can simply be resumed.
+Files that match no row are reported and left in place.
+"""
+
+import asyncio
+import hashlib
+import os
+from uuid import UUID
+
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.db.models import FileResource
+from app.core.db.setup import engine
+from app.core.logging.log import log_info, log_warning
+from app.core.services.storage import (
+    STORAGE,
+    count_references,
+    legacy_key,
+    lock_digest,
+    store_stream,
+)
+
+BATCH_SIZE = 100
+
+
+def legacy_ids() -> list[UUID]:
+    ids: list[UUID] = []
+    if not os.path.isdir(STORAGE):
+        return ids
+    for entry in os.scandir(STORAGE):
+        if not entry.is_file():
+            continue
+        try:
+            ids.append(UUID(entry.name))
+        except ValueError:
+            continue
+    return ids
+
+
+def legacy_path(resource: FileResource) -> str:
+    return f"{STORAGE}/{legacy_key(resource)}"
+
+
+def hash_legacy_file(resource: FileResource) -> str:
+    with open(legacy_path(resource), "rb") as buffer:
+        return hashlib.file_digest(buffer, "sha256").hexdigest()
+
+
+def store_legacy_file(resource: FileResource):
+    path = legacy_path(resource)
+    try:
+        with open(path, "rb") as buffer:
+            store_stream(buffer, str(resource.sha256))
+    except FileNotFoundError:
+        # Removed along with its resource meanwhile.
+        return
+    os.remove(path)
+
+
+async def move_to_blob(db_session: AsyncSession, resource: FileResource):
+    """
+    Stores the file of a resource as its blob under the same shared lock
+    as uploads, so a concurrent release of the digest cannot delete the
+    blob between it being stored and found referenced. A digest no row
+    references anymore is left to the release of its resource. Commits
+    the session.
+    """
+    digest = str(resource.sha256)
+    await lock_digest(db_session, digest, shared=True)
+    if await count_references(db_session, digest):
+        await run_in_threadpool(store_legacy_file, resource)
+    await db_session.commit()
+
+
+async def migrate_batch(db_session: AsyncSession, ids: list[UUID]) -> int:
+    resources = (
+        await db_session.exec(
+            select(FileResource).where(col(FileResource.id).in_(ids))
+        )
+    ).all()
+    for missing in set(ids) - {resource.id for resource in resources}:
+        log_warning(f"{STORAGE}/{missing} matches no file, skipped")
+    for resource in resources:
+        resource.sha256 = await run_in_threadpool(hash_legacy_file, resource)
+        db_session.add(resource)
+    await db_session.commit()
+    for resource in resources:
+        await move_to_blob(db_session, resource)
+    return len(resources)
+
+
+async def migrate_storage():
+    ids = await run_in_threadpool(legacy_ids)
+    migrated = 0
+    async with AsyncSession(engine, expire_on_commit=False) as db_session:
+        for start in range(0, len(ids), BATCH_SIZE):
+            migrated += await migrate_batch(
+                db_session, ids[start : start + BATCH_SIZE]
+            )
+    log_info(f"Moved {migrated} of {len(ids)} stored files to blobs")
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate_storage())
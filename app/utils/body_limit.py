@@ -0,0 +1,54 @@
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.status import HTTP_413_REQUEST_ENTITY_TOO_LARGE
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class BodySizeLimitMiddleware:
+    """
+    Rejects requests to `limits` paths whose body is larger than the
+    path's limit with 413, while the body is received rather than once the
+    framework has spooled all of it.
+    """
+
+    def __init__(
+        self, app: ASGIApp, limits: dict[str, int], detail: str
+    ) -> None:
+        self.app = app
+        self.limits = limits
+        self.detail = detail
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        limit = (
+            self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        )
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+        declared = Headers(scope=scope).get("content-length", "")
+        if declared.isdigit() and int(declared) > limit:
+            response = JSONResponse(
+                {"detail": self.detail},
+                status_code=HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # FastAPI passes HTTPExceptions raised while reading
+                    # the body on to its exception handlers.
+                    raise HTTPException(
+                        status_code=HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=self.detail,
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,63 @@
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+from app.utils.date import utc
+
+PUBLIC_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def validator_headers(
+    etag: str, last_modified: datetime, cache_control: str
+) -> dict[str, str]:
+    return {
+        "ETag": etag,
+        "Last-Modified": format_datetime(utc(last_modified), usegmt=True),
+        "Cache-Control": cache_control,
+    }
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: datetime
+) -> bool:
+    """
+    Evaluates If-None-Match, or If-Modified-Since when it is absent, as
+    RFC 9110 orders them.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = utc(since)
+    # HTTP dates have a resolution of one second.
+    return utc(last_modified).replace(microsecond=0) <= since
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: datetime,
+    cache_control: str = PUBLIC_CACHE_CONTROL,
+) -> Response | None:
+    """
+    Returns a 304 response when the client's copy is current. Otherwise
+    sets the validators on `response` and returns None, and the caller
+    builds the body.
+    """
+    headers = validator_headers(etag, last_modified, cache_control)
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -2,6 +2,22 @@ import secrets
 
 from passlib.context import CryptContext
 
+from app.core.config.env import get_env
+
+# The first scheme is used for new hashes, the others are only verified
+# and upgraded on login, e.g. PASSWORD_SCHEMES="argon2,bcrypt" (argon2
+# requires argon2-cffi).
+PASSWORD_SCHEMES = get_env("PASSWORD_SCHEMES", "bcrypt").split(",")
+BCRYPT_ROUNDS = int(get_env("BCRYPT_ROUNDS", "12"))
+
+password_context = CryptContext(
+    schemes=PASSWORD_SCHEMES,
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
 
 def gen_id(size: int = 32) -> str:
     return secrets.token_urlsafe(size)
@@ -13,10 +29,18 @@ def gen_otp(length: int = 8):
 
 
 def hash_password(password: str):
-    password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
     return password_context.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
     return password_context.verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Verifies a password and returns a new hash when the stored one was made
+    with a deprecated scheme or different bcrypt rounds.
+    """
+    return password_context.verify_and_update(plain_password, hashed_password)
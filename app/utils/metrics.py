@@ -0,0 +1,38 @@
+from collections import deque
+
+from app.api.routes.v1.dto.metrics import LatencyDTO
+
+
+class LatencyRecorder:
+    """
+    Records durations and reports percentiles over the most recent samples.
+    """
+
+    def __init__(self, window: int = 2048) -> None:
+        self.samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def to_dto(self) -> LatencyDTO:
+        samples = sorted(self.samples)
+
+        def percentile(q: float) -> float:
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+        return LatencyDTO(
+            count=self.count,
+            mean_ms=(self.total / self.count * 1000) if self.count else 0.0,
+            p50_ms=percentile(0.50) * 1000,
+            p95_ms=percentile(0.95) * 1000,
+            p99_ms=percentile(0.99) * 1000,
+            max_ms=self.max * 1000,
+        )
@@ -0,0 +1,38 @@
+"""add versions and content hashes
+
+Revision ID: 2b8e61f0ca57
+Revises: d41f7c3b9e20
+Create Date: 2026-10-16 21:42:09.871356
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b8e61f0ca57'
+down_revision: Union[str, None] = 'd41f7c3b9e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('form', 'link'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='0'))
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()))
+    # Existing files are hashed on their next download.
+    op.add_column('fileresource', sa.Column('sha256', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('fileresource', 'sha256')
+    for table in ('link', 'form'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('updated_at')
+            batch_op.drop_column('version')
@@ -0,0 +1,52 @@
+"""unique answer per session field
+
+Revision ID: 5c2e9a41d7b3
+Revises: b97c94e0c930
+Create Date: 2026-10-16 21:20:14.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e9a41d7b3'
+down_revision: Union[str, None] = 'b97c94e0c930'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+fieldanswer = sa.table(
+    'fieldanswer',
+    sa.column('id', sa.Uuid),
+    sa.column('session_id', sa.Uuid),
+    sa.column('field_id', sa.Uuid),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep a single answer per (session, field) before enforcing it.
+    answer_id = sa.cast(fieldanswer.c.id, sa.String)
+    kept_ids = sa.select(sa.func.min(answer_id)).group_by(
+        fieldanswer.c.session_id, fieldanswer.c.field_id
+    )
+    op.execute(fieldanswer.delete().where(answer_id.not_in(kept_ids)))
+    with op.batch_alter_table('fieldanswer') as batch_op:
+        batch_op.drop_index(op.f('ix_fieldanswer_session_id'))
+        batch_op.create_unique_constraint(
+            'uq_fieldanswer_session_id_field_id', ['session_id', 'field_id']
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('fieldanswer') as batch_op:
+        batch_op.drop_constraint(
+            'uq_fieldanswer_session_id_field_id', type_='unique'
+        )
+        batch_op.create_index(
+            op.f('ix_fieldanswer_session_id'), ['session_id'], unique=False
+        )
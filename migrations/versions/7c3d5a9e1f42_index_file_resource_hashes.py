@@ -0,0 +1,29 @@
+"""index file resource hashes
+
+Revision ID: 7c3d5a9e1f42
+Revises: 2b8e61f0ca57
+Create Date: 2026-10-16 23:05:37.214809
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3d5a9e1f42'
+down_revision: Union[str, None] = '2b8e61f0ca57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Stored files are moved to the content-addressed layout by running
+    # `python -m app.core.services.storage_migration`.
+    op.create_index(op.f('ix_fileresource_sha256'), 'fileresource', ['sha256'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_fileresource_sha256'), table_name='fileresource')
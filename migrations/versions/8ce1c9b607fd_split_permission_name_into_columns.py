@@ -0,0 +1,97 @@
+"""split permission name into columns
+
+Revision ID: 8ce1c9b607fd
+Revises: 6810e90cc3a9
+Create Date: 2026-10-16 21:03:20.908246
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8ce1c9b607fd'
+down_revision: Union[str, None] = '6810e90cc3a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def split_name(name: str) -> tuple[str, str | None, str]:
+    """Split "resource:action" or "resource:id:action" into its parts."""
+    resource_name, *resource_id, action_name = name.split(":")
+    return resource_name, ":".join(resource_id) or None, action_name
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The primary key changes from (permission_id, name) to id, which
+    # SQLite cannot alter in place, so the table is rebuilt.
+    permission_new = op.create_table('permission_new',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('resource_name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('resource_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('action_name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('role_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.ForeignKeyConstraint(['role_id'], ['role.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    rows = op.get_bind().execute(
+        sa.text('SELECT permission_id, name, role_id FROM permission')
+    ).all()
+    permissions = []
+    for permission_id, name, role_id in rows:
+        resource_name, resource_id, action_name = split_name(name)
+        permissions.append({
+            'id': permission_id,
+            'resource_name': resource_name,
+            'resource_id': resource_id,
+            'action_name': action_name,
+            'role_id': role_id,
+        })
+    if permissions:
+        op.bulk_insert(permission_new, permissions)
+    op.drop_index(op.f('ix_permission_role_id_name'), table_name='permission')
+    op.drop_table('permission')
+    op.rename_table('permission_new', 'permission')
+    op.create_index('ix_permission_resource', 'permission', ['resource_name', 'resource_id'], unique=False)
+    op.create_index('ix_permission_role_id_resource', 'permission', ['role_id', 'resource_name', 'action_name'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    permission_old = op.create_table('permission_old',
+    sa.Column('permission_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('role_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.ForeignKeyConstraint(['role_id'], ['role.id'], ),
+    sa.PrimaryKeyConstraint('permission_id', 'name')
+    )
+    rows = op.get_bind().execute(
+        sa.text(
+            'SELECT id, resource_name, resource_id, action_name, role_id'
+            ' FROM permission'
+        )
+    ).all()
+    permissions = [
+        {
+            'permission_id': permission_id,
+            'name': ':'.join(
+                part
+                for part in (resource_name, resource_id, action_name)
+                if part is not None
+            ),
+            'role_id': role_id,
+        }
+        for permission_id, resource_name, resource_id, action_name, role_id
+        in rows
+    ]
+    if permissions:
+        op.bulk_insert(permission_old, permissions)
+    op.drop_index('ix_permission_role_id_resource', table_name='permission')
+    op.drop_index('ix_permission_resource', table_name='permission')
+    op.drop_table('permission')
+    op.rename_table('permission_old', 'permission')
+    op.create_index(op.f('ix_permission_role_id_name'), 'permission', ['role_id', 'name'], unique=False)
@@ -0,0 +1,55 @@
+"""store timestamps with time zone
+
+Revision ID: 987d08003700
+Revises: 3546d475a55f
+Create Date: 2026-10-16 21:10:30.573906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '987d08003700'
+down_revision: Union[str, None] = '3546d475a55f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The models write timezone-aware UTC datetimes, which asyncpg refuses
+# to bind to `timestamp without time zone` columns. Values were written
+# as UTC, so they are converted from UTC.
+COLUMNS = [
+    ('user', 'registered_at'),
+    ('link', 'created_at'),
+    ('fileresource', 'created_at'),
+    ('accountverificationsession', 'expires_at'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in COLUMNS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                column,
+                existing_type=sa.DateTime(),
+                type_=sa.DateTime(timezone=True),
+                existing_nullable=False,
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in COLUMNS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                column,
+                existing_type=sa.DateTime(timezone=True),
+                type_=sa.DateTime(),
+                existing_nullable=False,
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
@@ -0,0 +1,30 @@
+"""add user permissions version
+
+Revision ID: a41e7d2c9b65
+Revises: 7c3d5a9e1f42
+Create Date: 2026-10-17 09:12:44.381027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41e7d2c9b65'
+down_revision: Union[str, None] = '7c3d5a9e1f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.add_column(sa.Column('permissions_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.drop_column('permissions_version')
@@ -0,0 +1,92 @@
+"""add personal owner roles
+
+Revision ID: b97c94e0c930
+Revises: 8ce1c9b607fd
+Create Date: 2026-10-16 21:05:22.320678
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+from app.utils.crypto import gen_id
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b97c94e0c930'
+down_revision: Union[str, None] = '8ce1c9b607fd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+role = sa.table(
+    'role',
+    sa.column('id', sa.String),
+    sa.column('name', sa.String),
+    sa.column('owner_id', sa.String),
+)
+roleuserlink = sa.table(
+    'roleuserlink',
+    sa.column('user_id', sa.String),
+    sa.column('role_id', sa.String),
+)
+permission = sa.table(
+    'permission',
+    sa.column('role_id', sa.String),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('role') as batch_op:
+        batch_op.add_column(sa.Column('owner_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_role_owner_id'), ['owner_id'], unique=True)
+        batch_op.create_foreign_key('fk_role_owner_id_user', 'user', ['owner_id'], ['id'])
+
+    bind = op.get_bind()
+
+    # Give every user a personal role.
+    user_ids = bind.execute(sa.text('SELECT id FROM "user"')).scalars().all()
+    owner_roles = {user_id: gen_id() for user_id in user_ids}
+    if owner_roles:
+        op.bulk_insert(role, [
+            {'id': role_id, 'name': None, 'owner_id': user_id}
+            for user_id, role_id in owner_roles.items()
+        ])
+        op.bulk_insert(roleuserlink, [
+            {'user_id': user_id, 'role_id': role_id}
+            for user_id, role_id in owner_roles.items()
+        ])
+
+    # Move the permissions of unnamed single-member roles, which were
+    # created one per form, field, link, file and account, to the
+    # member's personal role and drop the old roles.
+    anonymous_roles = bind.execute(
+        sa.select(roleuserlink.c.role_id, sa.func.min(roleuserlink.c.user_id))
+        .join(role, role.c.id == roleuserlink.c.role_id)
+        .where(role.c.name.is_(None), role.c.owner_id.is_(None))
+        .group_by(roleuserlink.c.role_id)
+        .having(sa.func.count() == 1)
+    ).all()
+    for role_id, user_id in anonymous_roles:
+        bind.execute(
+            permission.update()
+            .where(permission.c.role_id == role_id)
+            .values(role_id=owner_roles[user_id])
+        )
+        bind.execute(
+            roleuserlink.delete().where(roleuserlink.c.role_id == role_id)
+        )
+        bind.execute(role.delete().where(role.c.id == role_id))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Merged roles are not split again; personal roles are kept as
+    # regular roles.
+    with op.batch_alter_table('role') as batch_op:
+        batch_op.drop_constraint('fk_role_owner_id_user', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_role_owner_id'))
+        batch_op.drop_column('owner_id')
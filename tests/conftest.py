@@ -0,0 +1,88 @@
+import os
+import tempfile
+from collections.abc import AsyncIterator, Iterator
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+# Importing `app` creates the engine from DB_STRING. It is always pointed
+# at a throwaway SQLite file, since the fixtures below drop every table.
+os.environ["DB_STRING"] = (
+    f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/loslc-test.db"
+)
+# The cheapest bcrypt cost, so that hashing does not dominate the tests.
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+from sqlalchemy import event  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
+
+from app import app  # noqa: E402
+from app.core.db.setup import create_db_session, engine  # noqa: E402
+from app.core.logging import log  # noqa: E402
+from app.core.security.permission_cache import permission_cache  # noqa: E402
+from app.core.security.session_cache import session_cache  # noqa: E402
+from app.core.services import storage  # noqa: E402
+from app.core.services.storage_backends import LocalStorage  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def log_file(tmp_path, monkeypatch) -> str:
+    """Keeps what the code under test logs out of the working tree."""
+    path = str(tmp_path / "log.txt")
+    monkeypatch.setattr(log, "LOG_FILE", path)
+    return path
+
+
+@pytest.fixture
+async def app_db() -> AsyncIterator[None]:
+    """Creates the application tables for one test and drops them after."""
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+    yield
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.drop_all)
+    session_cache.sessions.clear()
+    session_cache.user_sessions.clear()
+    permission_cache.snapshots.clear()
+
+
+@pytest.fixture
+async def app_session(app_db: None) -> AsyncIterator[AsyncSession]:
+    """A session opened the way request handlers get theirs."""
+    async for session in create_db_session():
+        yield session
+
+
+@pytest.fixture
+async def client(app_db: None) -> AsyncIterator[AsyncClient]:
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+@pytest.fixture
+def statements() -> Iterator[list[str]]:
+    """Records every SQL statement the engine sends while the test runs."""
+    sent: list[str] = []
+
+    def record(connection, cursor, statement, *args):
+        sent.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield sent
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def local_storage(tmp_path, monkeypatch) -> LocalStorage:
+    """Stores uploaded files under the test's temporary directory."""
+    backend = LocalStorage(str(tmp_path))
+    monkeypatch.setattr(storage, "backend", backend)
+    return backend
@@ -0,0 +1,112 @@
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db.models import FieldAnswer, Form, FormField
+from tests.utils import create_user
+
+FIELDS = 50
+
+
+async def create_open_form(
+    db_session: AsyncSession, fields: int = FIELDS
+) -> tuple[Form, list[FormField]]:
+    author = await create_user(db_session)
+    form = Form(user_id=author.id, label="Survey", open=True)
+    form_fields = [
+        FormField(
+            form_id=form.id,
+            label=f"Question {position}",
+            description="",
+            position=position,
+            field_type="Numerical",
+            number_bounds="0:100",
+        )
+        for position in range(fields)
+    ]
+    db_session.add_all([form, *form_fields])
+    await db_session.commit()
+    return form, form_fields
+
+
+async def count_answers(db_session: AsyncSession) -> int:
+    return (
+        await db_session.exec(select(func.count()).select_from(FieldAnswer))
+    ).one()
+
+
+def batch(fields: list[FormField], value: str = "7"):
+    return {
+        "answers": [
+            {"field_id": str(field.id), "value": value} for field in fields
+        ]
+    }
+
+
+@pytest.mark.anyio
+async def test_submits_a_whole_form_in_one_request(
+    app_session: AsyncSession, client: AsyncClient, statements: list[str]
+):
+    form, fields = await create_open_form(app_session)
+    statements.clear()
+
+    response = await client.post(
+        f"/api/v1/forms/{form.id}/responses:batch", json=batch(fields)
+    )
+
+    assert response.status_code == 201
+    assert len(response.json()) == FIELDS
+    assert "response_session_id" in response.cookies
+    # Form with its fields, the new answer session and one upsert; the
+    # count must not depend on how many fields the form has.
+    writes = [s for s in statements if s.lstrip().startswith("INSERT")]
+    assert len(writes) == 2
+    assert await count_answers(app_session) == FIELDS
+
+
+@pytest.mark.anyio
+async def test_resubmitting_updates_the_same_answers(
+    app_session: AsyncSession, client: AsyncClient
+):
+    form, fields = await create_open_form(app_session, fields=3)
+    url = f"/api/v1/forms/{form.id}/responses:batch"
+
+    first = await client.post(url, json=batch(fields, "1"))
+    second = await client.post(url, json=batch(fields, "2"))
+
+    assert second.status_code == 201
+    assert [a["id"] for a in second.json()] == [
+        a["id"] for a in first.json()
+    ]
+    assert {a["value"] for a in second.json()} == {"2"}
+    assert await count_answers(app_session) == 3
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "problem", ["invalid", "superscript", "duplicate", "foreign"]
+)
+async def test_rejects_the_whole_batch(
+    app_session: AsyncSession, client: AsyncClient, problem: str
+):
+    form, fields = await create_open_form(app_session, fields=3)
+    payload = batch(fields)
+    answers = payload["answers"]
+    if problem == "invalid":
+        answers[-1]["value"] = "seven"
+    elif problem == "superscript":
+        answers[-1]["value"] = "²"
+    elif problem == "duplicate":
+        answers.append(answers[0])
+    else:
+        answers.append({"field_id": str(uuid4()), "value": "7"})
+
+    response = await client.post(
+        f"/api/v1/forms/{form.id}/responses:batch", json=payload
+    )
+
+    assert response.status_code == 422
+    assert await count_answers(app_session) == 0
@@ -0,0 +1,49 @@
+import pytest
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db.models import User
+from app.core.db.setup import create_db_session
+
+
+def make_user(name: str = "ada") -> User:
+    return User(
+        email=f"{name}@example.com",
+        username=name,
+        hashed_password="x",
+        name=name.title(),
+    )
+
+
+@pytest.mark.anyio
+async def test_objects_stay_loaded_after_commit(app_session: AsyncSession):
+    user = make_user()
+    app_session.add(user)
+    await app_session.commit()
+
+    # An expired attribute would need an implicit refresh, which raises
+    # MissingGreenlet outside of an awaited call.
+    assert user.name == "Ada"
+    assert user.registered_at is not None
+
+
+@pytest.mark.anyio
+async def test_sessions_do_not_share_state(app_db: None):
+    first = create_db_session()
+    second = create_db_session()
+    writer = await anext(first)
+    reader = await anext(second)
+
+    user = make_user()
+    writer.add(user)
+    await writer.commit()
+    found = (
+        await reader.exec(select(User).where(User.username == "ada"))
+    ).one()
+
+    assert found is not user
+    assert found.id == user.id
+    await first.aclose()
+    await second.aclose()
+    assert not writer.in_transaction()
+    assert not reader.in_transaction()
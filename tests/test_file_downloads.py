@@ -0,0 +1,160 @@
+import asyncio
+import os
+import tracemalloc
+
+import pytest
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.types import Message, Scope
+
+from app import app
+from app.api.routes.v1.providers.file import stream_chunks
+from app.core.services.storage_backends import LocalStorage
+from tests.utils import create_user, log_in
+
+CONTENT = bytes(range(256)) * 4096 * 4  # 4 MiB
+DOWNLOADS = 200
+# Peak of Python allocations while serving every download at once. Each
+# response is sent from disk in chunks; reading the files into memory
+# instead peaks above 100 MB.
+DOWNLOAD_MEMORY_BUDGET = 32 * 1024 * 1024
+
+
+async def upload(
+    app_session: AsyncSession, client: AsyncClient, content: bytes = CONTENT
+) -> str:
+    await log_in(app_session, client, await create_user(app_session))
+    response = await client.post(
+        "/api/v1/v1/file",
+        files={"file": ("data.bin", content, "application/octet-stream")},
+    )
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+@pytest.mark.anyio
+async def test_serves_whole_file(
+    app_session: AsyncSession, client: AsyncClient, local_storage: LocalStorage
+):
+    resource_id = await upload(app_session, client)
+
+    response = await client.get(f"/api/v1/v1/file/{resource_id}")
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["content-length"] == str(len(CONTENT))
+    assert response.headers["accept-ranges"] == "bytes"
+
+    etag = response.headers["etag"]
+    cached = await client.get(
+        f"/api/v1/v1/file/{resource_id}", headers={"If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+
+
+@pytest.mark.anyio
+async def test_serves_ranges(
+    app_session: AsyncSession, client: AsyncClient, local_storage: LocalStorage
+):
+    resource_id = await upload(app_session, client)
+    url = f"/api/v1/v1/file/{resource_id}"
+
+    partial = await client.get(url, headers={"Range": "bytes=1000-1999"})
+    suffix = await client.get(url, headers={"Range": "bytes=-10"})
+    beyond = await client.get(
+        url, headers={"Range": f"bytes={len(CONTENT)}-"}
+    )
+
+    assert partial.status_code == 206
+    assert partial.content == CONTENT[1000:2000]
+    assert partial.headers["content-range"] == (
+        f"bytes 1000-1999/{len(CONTENT)}"
+    )
+    assert suffix.status_code == 206
+    assert suffix.content == CONTENT[-10:]
+    assert beyond.status_code == 416
+
+
+@pytest.mark.anyio
+async def test_missing_blob_is_not_found(
+    app_session: AsyncSession, client: AsyncClient, local_storage: LocalStorage
+):
+    resource_id = await upload(app_session, client)
+    for root, _, names in os.walk(local_storage.root):
+        for name in names:
+            os.remove(os.path.join(root, name))
+
+    response = await client.get(f"/api/v1/v1/file/{resource_id}")
+
+    assert response.status_code == 404
+
+
+async def download(path: str) -> int:
+    """
+    Sends one GET straight to the ASGI app and counts the body bytes
+    without keeping them, unlike the test client's transport.
+    """
+    scope: Scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"test")],
+        "client": ("127.0.0.1", 1),
+        "server": ("test", 80),
+    }
+    received = 0
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message):
+        nonlocal received
+        if message["type"] == "http.response.body":
+            received += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return received
+
+
+@pytest.mark.anyio
+async def test_parallel_downloads_stream_from_disk(
+    app_session: AsyncSession, client: AsyncClient, local_storage: LocalStorage
+):
+    resource_id = await upload(app_session, client)
+    path = f"/api/v1/v1/file/{resource_id}"
+
+    tracemalloc.start()
+    try:
+        sizes = await asyncio.gather(
+            *(download(path) for _ in range(DOWNLOADS))
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert sizes == [len(CONTENT)] * DOWNLOADS
+    assert peak < DOWNLOAD_MEMORY_BUDGET, peak
+
+
+@pytest.mark.anyio
+async def test_stopped_stream_closes_the_stored_file():
+    closed: list[bool] = []
+
+    def chunks():
+        try:
+            yield b"first"
+            yield b"second"
+        finally:
+            closed.append(True)
+
+    stream = stream_chunks(chunks())
+    assert await anext(stream) == b"first"
+    await stream.aclose()
+
+    assert closed == [True]
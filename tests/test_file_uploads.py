@@ -0,0 +1,176 @@
+import os
+from collections.abc import AsyncIterator
+from io import BytesIO
+
+import pytest
+from httpx import AsyncClient
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db.models import FileResource
+from app.core.services import storage
+from app.core.services.storage_backends import CHUNK_SIZE, LocalStorage
+from tests.utils import create_user, log_in
+
+
+def stored_blobs(backend: LocalStorage) -> list[str]:
+    return [
+        name
+        for _, _, names in os.walk(backend.root)
+        for name in names
+        if not name.startswith(".")
+    ]
+
+
+@pytest.mark.anyio
+async def test_same_content_is_stored_once(
+    app_session: AsyncSession, client: AsyncClient, local_storage: LocalStorage
+):
+    await log_in(app_session, client, await create_user(app_session))
+
+    response = await client.post(
+        "/api/v1/v1/files",
+        files=[
+            ("files", ("a.txt", b"same", "text/plain")),
+            ("files", ("b.txt", b"same", "text/plain")),
+        ],
+    )
+
+    assert response.status_code == 200
+    assert [resource["name"] for resource in response.json()] == [
+        "a.txt",
+        "b.txt",
+    ]
+    assert len(stored_blobs(local_storage)) == 1
+
+
+@pytest.mark.anyio
+async def test_failed_batch_releases_stored_files(
+    app_session: AsyncSession,
+    client: AsyncClient,
+    local_storage: LocalStorage,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    await log_in(app_session, client, await create_user(app_session))
+    store_staged = storage.store_staged
+
+    def fail_on_second(staged: storage.StagedBlob):
+        if stored_blobs(local_storage):
+            raise RuntimeError("storage went away")
+        return store_staged(staged)
+
+    monkeypatch.setattr(storage, "store_staged", fail_on_second)
+
+    with pytest.raises(RuntimeError):
+        await client.post(
+            "/api/v1/v1/files",
+            files=[
+                ("files", ("a.txt", b"first", "text/plain")),
+                ("files", ("b.txt", b"second", "text/plain")),
+            ],
+        )
+
+    assert stored_blobs(local_storage) == []
+    assert (await app_session.exec(select(FileResource))).all() == []
+
+
+def staged_files(backend: LocalStorage) -> list[str]:
+    return [name for name in os.listdir(backend.root) if name.startswith(".")]
+
+
+@pytest.mark.anyio
+async def test_upload_is_staged_once_and_renamed(
+    app_session: AsyncSession,
+    client: AsyncClient,
+    local_storage: LocalStorage,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    await log_in(app_session, client, await create_user(app_session))
+    stages: list[str] = []
+    stage = local_storage.stage
+
+    def record_stage():
+        buffer, path = stage()
+        stages.append(path)
+        return buffer, path
+
+    monkeypatch.setattr(local_storage, "stage", record_stage)
+
+    first = await client.post(
+        "/api/v1/v1/file", files={"file": ("a.txt", b"once", "text/plain")}
+    )
+    second = await client.post(
+        "/api/v1/v1/file", files={"file": ("b.txt", b"once", "text/plain")}
+    )
+
+    assert (first.status_code, second.status_code) == (200, 200)
+    assert len(stages) == 2
+    # The first staged file became the blob, the duplicate was dropped.
+    assert len(stored_blobs(local_storage)) == 1
+    assert staged_files(local_storage) == []
+
+
+def test_oversized_upload_stops_at_the_limit(local_storage: LocalStorage):
+    source = BytesIO(b"x" * (storage.MAX_FILE_SIZE * 4))
+
+    with pytest.raises(storage.FileTooLargeError):
+        storage.stage_stream(source)
+
+    assert source.tell() <= storage.MAX_FILE_SIZE + CHUNK_SIZE
+    assert staged_files(local_storage) == []
+
+
+@pytest.mark.anyio
+async def test_oversized_request_is_cut_off(
+    client: AsyncClient, local_storage: LocalStorage
+):
+    sent: list[int] = []
+
+    async def body() -> AsyncIterator[bytes]:
+        yield (
+            b"--limit\r\n"
+            b'Content-Disposition: form-data; name="file"; filename="big"\r\n'
+            b"Content-Type: a/b\r\n\r\n"
+        )
+        for _ in range(storage.MAX_FILE_SIZE * 4 // CHUNK_SIZE):
+            sent.append(CHUNK_SIZE)
+            yield b"x" * CHUNK_SIZE
+
+    declared = await client.post(
+        "/api/v1/v1/file",
+        files={"file": ("big.bin", b"x" * (storage.MAX_FILE_SIZE * 2), "a/b")},
+    )
+    # Without a Content-Length, the body is counted as it arrives.
+    streamed = await client.post(
+        "/api/v1/v1/file",
+        content=body(),
+        headers={"Content-Type": "multipart/form-data; boundary=limit"},
+    )
+
+    assert (declared.status_code, streamed.status_code) == (413, 413)
+    assert sum(sent) < storage.MAX_FILE_SIZE * 2
+
+
+@pytest.mark.anyio
+async def test_failed_commit_releases_the_blob(
+    app_session: AsyncSession,
+    client: AsyncClient,
+    local_storage: LocalStorage,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    await log_in(app_session, client, await create_user(app_session))
+    commit = AsyncSession.commit
+
+    async def fail_once(self: AsyncSession):
+        monkeypatch.setattr(AsyncSession, "commit", commit)
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(AsyncSession, "commit", fail_once)
+
+    with pytest.raises(RuntimeError):
+        await client.post(
+            "/api/v1/v1/file",
+            files={"file": ("a.txt", b"orphan", "text/plain")},
+        )
+
+    assert stored_blobs(local_storage) == []
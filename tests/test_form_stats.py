@@ -0,0 +1,84 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db.models import (
+    AnswerSession,
+    FieldAnswer,
+    Form,
+    FormField,
+    FormStats,
+)
+from app.core.services import form_stats
+from app.core.services.form_stats import FormStatsRefresher, refresh_form_stats
+from tests.utils import create_user
+
+
+@pytest.mark.anyio
+async def test_refresh_summarizes_and_overwrites(app_session: AsyncSession):
+    author = await create_user(app_session)
+    form = Form(user_id=author.id, label="Survey")
+    field = FormField(
+        form_id=form.id, label="Age", description="", field_type="Numerical"
+    )
+    app_session.add_all([form, field])
+    for value, submitted in (("20", True), ("40", True), ("99", False)):
+        answer_session = AnswerSession(form_id=form.id, submitted=submitted)
+        app_session.add_all(
+            [
+                answer_session,
+                FieldAnswer(
+                    session_id=answer_session.id,
+                    field_id=field.id,
+                    value=value,
+                ),
+            ]
+        )
+    await app_session.commit()
+
+    first = await refresh_form_stats(app_session, form.id)
+    app_session.add(AnswerSession(form_id=form.id, submitted=True))
+    await app_session.commit()
+    second = await refresh_form_stats(app_session, form.id)
+
+    assert (first.started, first.submitted) == (3, 2)
+    assert first.fields[0].mean == 30
+    assert (second.started, second.submitted) == (4, 3)
+    stored = await app_session.get(FormStats, form.id, populate_existing=True)
+    assert stored is not None
+    assert stored.submitted == 3
+    assert stored.summary == second.model_dump_json()
+
+
+def fail_to_connect(*args, **kwargs):
+    raise ConnectionError("database is down")
+
+
+@pytest.mark.anyio
+async def test_failed_refreshes_are_retried(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(form_stats, "AsyncSession", fail_to_connect)
+    errors: list[str] = []
+    monkeypatch.setattr(form_stats, "log_error", errors.append)
+    refresher = FormStatsRefresher(interval=0.01)
+    form_id = uuid4()
+    refresher.mark_stale(form_id)
+
+    refresher.start()
+    await asyncio.sleep(0.05)
+
+    assert refresher.task is not None and not refresher.task.done()
+    assert refresher.stale == {form_id}
+    assert errors and "database is down" in errors[0]
+    await refresher.stop()
+
+
+@pytest.mark.anyio
+async def test_zero_interval_disables_the_refresher():
+    refresher = FormStatsRefresher(interval=0)
+    refresher.mark_stale(uuid4())
+    refresher.start()
+
+    assert refresher.task is None
+    assert refresher.stale == set()
@@ -0,0 +1,199 @@
+from datetime import date
+from timeit import repeat
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from pydantic import EmailStr, TypeAdapter
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.routes.v1.providers import form as form_provider
+from app.core.db.models import Form, FormField
+from app.core.security.permissions import SUPER_ADMIN_ROLE_NAME
+from app.core.services.form_validation import (
+    FieldValidatorCache,
+    compile_validator,
+    field_validators,
+)
+from tests.utils import create_user
+
+
+def make_field(field_type: str, required: bool = False, **config) -> FormField:
+    return FormField(
+        form_id=uuid4(),
+        label="Question",
+        description="",
+        field_type=field_type,
+        required=required,
+        **config,
+    )
+
+
+def reference_validate(answer: str | None, field: FormField) -> bool:
+    """
+    The checks validate_answer made before validators were compiled,
+    parsing the field configuration on every call.
+    """
+    text_bounds = (
+        [int(bound) for bound in field.text_bounds.split(":")]
+        if field.text_bounds is not None
+        else None
+    )
+    possible_answers = (
+        [choice.strip() for choice in field.possible_answers.split("\\")]
+        if field.possible_answers is not None
+        else None
+    )
+    value = str(answer or "")
+    if field.required is True and (answer is None or answer == ""):
+        return False
+    if field.field_type == "Boolean" and answer not in ["0", "1"]:
+        return False
+    if field.field_type == "Multiselect" and any(
+        choice not in (possible_answers or [])
+        for choice in (answer or "").split(",")
+    ):
+        return False
+    if field.field_type == "Select" and answer not in (possible_answers or []):
+        return False
+    if (
+        field.field_type in ("Text", "LongText")
+        and text_bounds is not None
+        and not text_bounds[0] <= len(value) <= text_bounds[1]
+    ):
+        return False
+    try:
+        match field.field_type:
+            case "Email":
+                TypeAdapter(EmailStr).validate_python(value)
+            case "Date":
+                TypeAdapter(date).validate_python(value)
+    except ValueError:
+        return False
+    return True
+
+
+@pytest.mark.parametrize(
+    ("answer", "valid"),
+    [("42", True), ("100", True), ("101", False), ("-1", False)]
+    + [(digits, False) for digits in ("²", "١٢", "４２", "4²")],
+)
+def test_numerical_bounds(answer: str, valid: bool):
+    field = make_field("Numerical", number_bounds="0:100")
+
+    assert compile_validator(field)(answer) is valid
+
+
+ANSWERS = [
+    None,
+    "",
+    " ",
+    "0",
+    "1",
+    "2",
+    "red",
+    "blue",
+    " red",
+    "red,blue",
+    "red,",
+    "red,green",
+    "ada@example.com",
+    "ada@",
+    "2025-02-28",
+    "2025-02-30",
+    "28/02/2025",
+    "hello",
+    "hello world, again",
+]
+
+
+@pytest.mark.parametrize(
+    "field",
+    [
+        make_field("Select", possible_answers="red\\ blue \\green"),
+        make_field("Multiselect", possible_answers="red\\blue"),
+        make_field("Boolean"),
+        make_field("Boolean", required=True),
+        make_field("Text", text_bounds="1:5"),
+        make_field("LongText", text_bounds="3:12", required=True),
+        make_field("Text"),
+        make_field("Email"),
+        make_field("Date", required=True),
+    ],
+    ids=lambda field: "-".join(
+        [field.field_type, "required" if field.required else "optional"]
+    ),
+)
+@pytest.mark.parametrize("answer", ANSWERS)
+def test_compiled_validators_match_the_reference(
+    field: FormField, answer: str | None
+):
+    assert compile_validator(field)(answer) is reference_validate(
+        answer, field
+    )
+
+
+def test_unchanged_fields_reuse_their_validator():
+    cache = FieldValidatorCache(max_size=10, ttl=60)
+    field = make_field("Select", possible_answers="red\\blue")
+
+    assert cache.get(field) is cache.get(field)
+
+
+SELECT = {"field_type": "Select", "possible_answers": "red\\blue"}
+TEXT = {"field_type": "Text"}
+
+
+@pytest.mark.parametrize(
+    ("config", "changes", "answer", "before", "after"),
+    [
+        (SELECT, {"field_type": "Boolean"}, "1", False, True),
+        (SELECT, {"possible_answers": "red\\green"}, "green", False, True),
+        (TEXT, {"text_bounds": "1:3"}, "blue", True, False),
+        (TEXT, {"required": True}, None, True, False),
+    ],
+)
+@pytest.mark.anyio
+async def test_updating_a_field_recompiles_its_validator(
+    app_session: AsyncSession,
+    config: dict[str, Any],
+    changes: dict[str, Any],
+    answer: str | None,
+    before: bool,
+    after: bool,
+):
+    editor = await create_user(
+        app_session, role_names=(SUPER_ADMIN_ROLE_NAME,)
+    )
+    form = Form(user_id=editor.id, label="Survey")
+    field = FormField(
+        form_id=form.id,
+        label="Colour",
+        description="",
+        required=False,
+        **config,
+    )
+    app_session.add_all([form, field])
+    await app_session.commit()
+    assert field_validators.get(field)(answer) is before
+
+    await form_provider.update_form_field(
+        app_session, editor, field.id, **changes
+    )
+
+    assert field_validators.get(field)(answer) is after
+
+
+def test_compiled_select_outpaces_the_reference():
+    field = make_field(
+        "Select",
+        possible_answers="\\".join(f"option {index}" for index in range(200)),
+    )
+    validate = compile_validator(field)
+
+    compiled = min(repeat(lambda: validate("option 199"), number=500))
+    reference = min(
+        repeat(lambda: reference_validate("option 199", field), number=500)
+    )
+
+    assert compiled * 5 < reference
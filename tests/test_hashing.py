@@ -0,0 +1,83 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.services.hashing import (
+    HashingPool,
+    hash_password,
+    verify_and_update_password,
+)
+
+
+@pytest.fixture
+def pool():
+    pool = HashingPool(workers=1, max_pending=2)
+    yield pool
+    pool.shutdown()
+
+
+async def settle(pool: HashingPool):
+    # Slots are released from the worker through call_soon_threadsafe.
+    for _ in range(100):
+        if pool.pending == 0:
+            return
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.anyio
+async def test_event_loop_runs_while_hashing(pool: HashingPool):
+    release = threading.Event()
+    call = asyncio.ensure_future(pool.run(release.wait, 5))
+
+    # The loop keeps serving other tasks while the worker is blocked.
+    await asyncio.sleep(0.05)
+    assert not call.done()
+    release.set()
+
+    assert await call is True
+    await settle(pool)
+    assert pool.latency.count == 1
+
+
+@pytest.mark.anyio
+async def test_saturated_pool_rejects_with_503(pool: HashingPool):
+    release = threading.Event()
+    calls = [asyncio.ensure_future(pool.run(release.wait, 5)) for _ in "ab"]
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException) as error:
+        await pool.run(release.wait, 5)
+
+    assert error.value.status_code == 503
+    assert error.value.headers == {"Retry-After": "1"}
+    assert pool.rejected == 1
+    release.set()
+    await asyncio.gather(*calls)
+
+
+@pytest.mark.anyio
+async def test_cancelled_call_holds_its_slot_until_done(pool: HashingPool):
+    release = threading.Event()
+    call = asyncio.ensure_future(pool.run(release.wait, 5))
+    await asyncio.sleep(0)
+
+    call.cancel()
+    await asyncio.sleep(0.05)
+    assert pool.pending == 1
+
+    release.set()
+    await settle(pool)
+    assert pool.pending == 0
+
+
+@pytest.mark.anyio
+async def test_hash_round_trip():
+    hashed = await hash_password("correct horse")
+
+    assert await verify_and_update_password("correct horse", hashed) == (
+        True,
+        None,
+    )
+    assert (await verify_and_update_password("wrong", hashed))[0] is False
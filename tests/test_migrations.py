@@ -0,0 +1,46 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+VERSIONS = Path(__file__).parent.parent / "migrations" / "versions"
+
+
+def load_migration(revision: str):
+    [path] = VERSIONS.glob(f"{revision}_*.py")
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("duplicated", ["email", "username"])
+def test_unique_indexes_abort_on_duplicates(duplicated: str):
+    migration = load_migration("6810e90cc3a9")
+    engine = sa.create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            'CREATE TABLE "user" (email VARCHAR, username VARCHAR)'
+        )
+        connection.exec_driver_sql("CREATE TABLE link (label VARCHAR)")
+        for index in range(3):
+            connection.execute(
+                sa.text('INSERT INTO "user" VALUES (:email, :username)'),
+                {
+                    "email": f"{index}@example.com",
+                    "username": f"user-{index}",
+                    duplicated: "taken",
+                },
+            )
+        context = MigrationContext.configure(connection)
+
+        with Operations.context(context):
+            with pytest.raises(RuntimeError, match=duplicated) as error:
+                migration.upgrade()
+
+        assert "'taken' (3x)" in str(error.value)
+        assert sa.inspect(connection).get_indexes("user") == []
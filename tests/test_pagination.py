@@ -0,0 +1,76 @@
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Field, SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db.pagination import paginate
+
+
+class PagedItem(SQLModel, table=True):
+    id: str = Field(primary_key=True)
+    created_at: datetime
+
+
+@pytest.fixture
+async def db_session() -> AsyncIterator[AsyncSession]:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(
+            SQLModel.metadata.create_all,
+            tables=[SQLModel.metadata.tables["pageditem"]],
+        )
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_pages_through_str_ids(db_session: AsyncSession):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    ids = [f"item-{index}" for index in range(7)]
+    db_session.add_all(
+        PagedItem(id=item_id, created_at=start + timedelta(minutes=index))
+        for index, item_id in enumerate(ids)
+    )
+    await db_session.commit()
+
+    seen: list[str] = []
+    cursor = None
+    pages = 0
+    while True:
+        items, cursor = await paginate(
+            db_session,
+            select(PagedItem),
+            sort_columns=[PagedItem.created_at, PagedItem.id],
+            cursor=cursor,
+            limit=3,
+        )
+        seen.extend(item.id for item in items)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert seen == ids
+
+
+@pytest.mark.anyio
+async def test_pages_by_str_id_alone(db_session: AsyncSession):
+    ids = [f"item-{index}" for index in range(5)]
+    db_session.add_all(
+        PagedItem(id=item_id, created_at=datetime.now(timezone.utc))
+        for item_id in ids
+    )
+    await db_session.commit()
+
+    first, cursor = await paginate(
+        db_session, select(PagedItem), [PagedItem.id], None, 2
+    )
+    assert cursor is not None
+    second, _ = await paginate(
+        db_session, select(PagedItem), [PagedItem.id], cursor, 2
+    )
+    assert [item.id for item in first + second] == ids[:4]
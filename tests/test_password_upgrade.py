@@ -0,0 +1,66 @@
+import pytest
+from fastapi import BackgroundTasks, HTTPException, Response
+from passlib.context import CryptContext
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.routes.v1.providers.auth import login
+from app.core.services.hashing import hash_password
+from app.utils.crypto import password_context
+from tests.utils import create_user
+
+# Hashes as they were made before the cost was lowered for the tests.
+OUTDATED_CONTEXT = CryptContext(schemes=["bcrypt"], bcrypt__rounds=5)
+
+
+async def log_in_with(db_session: AsyncSession, password: str):
+    # The OTP email is queued on the background tasks, which never run.
+    return await login(
+        db_session=db_session,
+        email="ada@example.com",
+        password=password,
+        response=Response(),
+        bt=BackgroundTasks(),
+    )
+
+
+@pytest.mark.anyio
+async def test_login_upgrades_outdated_hash(app_session: AsyncSession):
+    user = await create_user(app_session)
+    outdated = OUTDATED_CONTEXT.hash("secret")
+    user.hashed_password = outdated
+    await app_session.commit()
+    assert password_context.needs_update(outdated)
+
+    await log_in_with(app_session, "secret")
+
+    await app_session.refresh(user)
+    assert user.hashed_password != outdated
+    assert not password_context.needs_update(user.hashed_password)
+    assert password_context.verify("secret", user.hashed_password)
+
+
+@pytest.mark.anyio
+async def test_login_keeps_current_hash(app_session: AsyncSession):
+    user = await create_user(app_session)
+    current = await hash_password("secret")
+    user.hashed_password = current
+    await app_session.commit()
+
+    await log_in_with(app_session, "secret")
+
+    await app_session.refresh(user)
+    assert user.hashed_password == current
+
+
+@pytest.mark.anyio
+async def test_wrong_password_does_not_upgrade(app_session: AsyncSession):
+    user = await create_user(app_session)
+    outdated = OUTDATED_CONTEXT.hash("secret")
+    user.hashed_password = outdated
+    await app_session.commit()
+
+    with pytest.raises(HTTPException):
+        await log_in_with(app_session, "guess")
+
+    await app_session.refresh(user)
+    assert user.hashed_password == outdated
@@ -0,0 +1,124 @@
+import pytest
+from sqlalchemy import update
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db.builders.permission import PermissionBuilder
+from app.core.db.models import User
+from app.core.db.setup import create_db_session
+from app.core.security.permission_cache import permission_cache
+from app.core.security.permissions import (
+    ACTION_READWRITE,
+    FORM_RESOURCE,
+    PermissionSnapshot,
+    get_owner_role,
+    load_permission_snapshot,
+)
+from tests.utils import create_user
+
+
+async def grant_form(db_session: AsyncSession, user: User, form_id: str):
+    db_session.add(
+        PermissionBuilder()
+        .withResourceName(FORM_RESOURCE)
+        .withResourceId(form_id)
+        .withActionName(ACTION_READWRITE)
+        .forRole(await get_owner_role(db_session, user))
+        .make()
+    )
+
+
+async def load_in_new_session(user_id: str) -> PermissionSnapshot:
+    async for db_session in create_db_session():
+        return await load_permission_snapshot(db_session, user_id)
+    raise AssertionError
+
+
+async def read_version(user_id: str) -> int:
+    async for db_session in create_db_session():
+        return (
+            await db_session.exec(
+                select(User.permissions_version).where(User.id == user_id)
+            )
+        ).one()
+    raise AssertionError
+
+
+@pytest.mark.anyio
+async def test_snapshots_are_shared_across_sessions(
+    app_session: AsyncSession, statements: list[str]
+):
+    user = await create_user(app_session)
+    await load_in_new_session(user.id)
+    statements.clear()
+
+    await load_in_new_session(user.id)
+
+    # Only the version is read; the roles and permissions come from the
+    # cache.
+    assert len(statements) == 1
+    assert "permissions_version" in statements[0]
+
+
+@pytest.mark.anyio
+async def test_commit_invalidates_snapshot(app_session: AsyncSession):
+    user = await create_user(app_session)
+    assert not (await load_in_new_session(user.id)).grants
+
+    await grant_form(app_session, user, "form")
+    await app_session.commit()
+
+    snapshot = await load_in_new_session(user.id)
+    assert snapshot.has_permission(FORM_RESOURCE, "form", ACTION_READWRITE)
+
+
+@pytest.mark.anyio
+async def test_rolled_back_grants_are_not_cached(app_session: AsyncSession):
+    user = await create_user(app_session)
+    user_id = user.id  # The rollback expires `user`.
+    await grant_form(app_session, user, "form")
+
+    # Autoflushes the pending grant, which this transaction then sees.
+    snapshot = await load_permission_snapshot(app_session, user_id)
+    assert snapshot.has_permission(FORM_RESOURCE, "form", ACTION_READWRITE)
+    await app_session.rollback()
+
+    snapshot = await load_in_new_session(user_id)
+    assert not snapshot.has_permission(FORM_RESOURCE, "form", ACTION_READWRITE)
+
+
+@pytest.mark.anyio
+async def test_grants_bump_the_permissions_version(app_session: AsyncSession):
+    user = await create_user(app_session)
+    user_id = user.id
+    before = await read_version(user_id)
+
+    await grant_form(app_session, user, "form")
+    await app_session.commit()
+
+    assert await read_version(user_id) == before + 1
+
+
+@pytest.mark.anyio
+async def test_version_bumped_elsewhere_bypasses_the_cache(
+    app_session: AsyncSession,
+):
+    user = await create_user(app_session)
+    version = await read_version(user.id)
+    stale = PermissionSnapshot(
+        role_names=frozenset(),
+        grants=frozenset([(FORM_RESOURCE, "form", ACTION_READWRITE)]),
+    )
+    # As if another worker had cached a grant it has since revoked.
+    permission_cache.set(user.id, version, stale)
+    assert await load_in_new_session(user.id) is stale
+
+    await app_session.execute(
+        update(User)
+        .where(col(User.id) == user.id)
+        .values(permissions_version=version + 1)
+    )
+    await app_session.commit()
+
+    snapshot = await load_in_new_session(user.id)
+    assert not snapshot.has_permission(FORM_RESOURCE, "form", ACTION_READWRITE)
@@ -0,0 +1,122 @@
+import pytest
+from fastapi import HTTPException
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db.builders.permission import PermissionBuilder
+from app.core.db.builders.role import RoleBuilder
+from app.core.db.models import User
+from app.core.security.permissions import (
+    ACTION_CREATE,
+    ACTION_READWRITE,
+    ADMIN_ROLE_NAME,
+    FORM_RESOURCE,
+    LINK_RESOURCE,
+    GlobalPermissionCheckModel,
+    PermissionCheckModel,
+    PermissionChecker,
+)
+from tests.utils import create_user
+
+
+async def grant_forms(db_session: AsyncSession, user: User, count: int):
+    """Gives `user` one role per form, as forms used to be created."""
+    for index in range(count):
+        role = RoleBuilder().addUser(user).make()
+        db_session.add_all(
+            [
+                role,
+                PermissionBuilder()
+                .withResourceName(FORM_RESOURCE)
+                .withResourceId(f"form-{index}")
+                .withActionName(ACTION_READWRITE)
+                .forRole(role)
+                .make(),
+            ]
+        )
+    await db_session.commit()
+
+
+def form_check(form_id: str) -> PermissionCheckModel:
+    return PermissionCheckModel(
+        resource_name=FORM_RESOURCE,
+        resource_id=form_id,
+        action_names=[ACTION_READWRITE],
+    )
+
+
+@pytest.mark.anyio
+async def test_checks_of_many_roles_take_one_query(
+    app_session: AsyncSession, statements: list[str]
+):
+    user = await create_user(app_session)
+    await grant_forms(app_session, user, 1000)
+    statements.clear()
+
+    for form_id in ("form-0", "form-500", "form-999"):
+        assert await PermissionChecker(
+            db_session=app_session,
+            user=user,
+            pcheck_models=[form_check(form_id)],
+        ).check()
+
+    # The permissions version and a single snapshot load.
+    assert len(statements) == 2
+
+
+@pytest.mark.anyio
+async def test_every_check_must_pass(app_session: AsyncSession):
+    user = await create_user(app_session)
+    await grant_forms(app_session, user, 2)
+
+    assert await PermissionChecker(
+        db_session=app_session,
+        user=user,
+        pcheck_models=[form_check("form-0"), form_check("form-1")],
+    ).check()
+    with pytest.raises(HTTPException) as error:
+        await PermissionChecker(
+            db_session=app_session,
+            user=user,
+            pcheck_models=[form_check("form-0"), form_check("form-2")],
+        ).check()
+    assert error.value.status_code == 401
+
+
+@pytest.mark.anyio
+async def test_either_needs_one_check(app_session: AsyncSession):
+    user = await create_user(app_session)
+    await grant_forms(app_session, user, 1)
+    link_check = GlobalPermissionCheckModel(
+        resource_name=LINK_RESOURCE, action_names=[ACTION_CREATE]
+    )
+
+    assert await PermissionChecker(
+        db_session=app_session,
+        user=user,
+        pcheck_models=[link_check, form_check("form-0")],
+    ).check(either=True)
+    with pytest.raises(HTTPException):
+        await PermissionChecker(
+            db_session=app_session, user=user, pcheck_models=[link_check]
+        ).check(either=True)
+
+
+@pytest.mark.anyio
+async def test_bypass_role_skips_checks(app_session: AsyncSession):
+    user = await create_user(app_session, role_names=(ADMIN_ROLE_NAME,))
+
+    assert await PermissionChecker(
+        db_session=app_session,
+        user=user,
+        bypass_roles=[ADMIN_ROLE_NAME],
+        pcheck_models=[form_check("form-0")],
+    ).check()
+
+
+@pytest.mark.anyio
+async def test_no_check_models_allows(app_session: AsyncSession):
+    user = await create_user(app_session)
+
+    assert await PermissionChecker(
+        db_session=app_session, user=user, pcheck_models=[]
+    ).check()
@@ -0,0 +1,70 @@
+import pytest
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.security.permission_cache import permission_cache
+from app.core.security.permissions import ADMIN_ROLE_NAME
+from app.core.security.session_cache import session_cache
+from tests.utils import create_user, log_in
+
+# Statements sent by one request with cold session and permission caches.
+# They must not grow with the number of forms, fields and links the user
+# owns; raise a budget only when an endpoint really needs another query.
+STATEMENT_BUDGETS = {
+    "/api/v1/auth/me": 1,
+    "/api/v1/forms/my": 3,
+    "/api/v1/forms/{form_id}": 6,
+    "/api/v1/forms/{form_id}/fields": 6,
+    "/api/v1/links": 2,
+    "/api/v1/links/label/link-0": 1,
+}
+
+
+async def seed_owned_content(client: AsyncClient, forms: int) -> str:
+    form_id = ""
+    for index in range(forms):
+        response = await client.post(
+            "/api/v1/forms", json={"label": f"Form {index}"}
+        )
+        assert response.status_code == 201
+        form_id = response.json()["id"]
+        for position in range(3):
+            response = await client.post(
+                f"/api/v1/forms/{form_id}/fields",
+                json={
+                    "form_id": form_id,
+                    "label": f"Question {position}",
+                    "description": "",
+                    "field_type": "Text",
+                },
+            )
+            assert response.status_code == 201
+        response = await client.post(
+            "/api/v1/links",
+            json={"label": f"link-{index}", "url": "https://loslc.tech"},
+        )
+        assert response.status_code == 200
+    return form_id
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("forms", [1, 10])
+@pytest.mark.parametrize("path", list(STATEMENT_BUDGETS))
+async def test_statements_per_endpoint(
+    app_session: AsyncSession,
+    client: AsyncClient,
+    statements: list[str],
+    path: str,
+    forms: int,
+):
+    user = await create_user(app_session, role_names=(ADMIN_ROLE_NAME,))
+    await log_in(app_session, client, user)
+    form_id = await seed_owned_content(client, forms)
+    session_cache.sessions.clear()
+    permission_cache.snapshots.clear()
+    statements.clear()
+
+    response = await client.get(path.format(form_id=form_id))
+
+    assert response.status_code == 200
+    assert len(statements) == STATEMENT_BUDGETS[path], statements
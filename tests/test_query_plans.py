@@ -0,0 +1,85 @@
+import uuid
+
+import pytest
+from sqlalchemy import Select
+from sqlmodel import col, select
+
+from app.core.db.models import (
+    AnswerSession,
+    FieldAnswer,
+    FormField,
+    Link,
+    Permission,
+    RoleUserLink,
+    User,
+)
+from app.core.db.setup import engine
+
+# Parameters are bound as they are, without the column types' processing.
+FORM_ID = uuid.uuid4().hex
+
+# The lookups the providers run on every request, with the index SQLite
+# must search for each of them, or the key it must search on when the
+# index is an unnamed constraint.
+LOOKUPS: list[tuple[Select, str]] = [
+    (select(User).where(User.email == "ada@example.com"), "ix_user_email"),
+    (select(User).where(User.username == "ada"), "ix_user_username"),
+    (select(Link).where(Link.label == "home"), "ix_link_label"),
+    (select(Link).where(Link.user_id == "user"), "ix_link_user_id"),
+    (
+        select(Permission).where(Permission.role_id == "role"),
+        "ix_permission_role_id_resource",
+    ),
+    (
+        select(FormField).where(FormField.form_id == FORM_ID),
+        "ix_formfield_form_id",
+    ),
+    (
+        select(FieldAnswer).where(FieldAnswer.field_id == FORM_ID),
+        "ix_fieldanswer_field_id",
+    ),
+    (
+        select(FieldAnswer).where(FieldAnswer.session_id == FORM_ID),
+        # uq_fieldanswer_session_id_field_id, unnamed in SQLite
+        "(session_id=?)",
+    ),
+    (
+        select(AnswerSession).where(
+            AnswerSession.form_id == FORM_ID,
+            col(AnswerSession.submitted).is_(True),
+        ),
+        "ix_answersession_form_id_submitted",
+    ),
+    (
+        select(RoleUserLink).where(RoleUserLink.user_id == "user"),
+        "(user_id=?)",  # primary key
+    ),
+    (
+        select(RoleUserLink).where(RoleUserLink.role_id == "role"),
+        "ix_roleuserlink_role_id",
+    ),
+]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "statement, index",
+    LOOKUPS,
+    ids=[str(statement.whereclause) for statement, _ in LOOKUPS],
+)
+async def test_lookup_uses_index(app_db: None, statement: Select, index: str):
+    async with engine.connect() as connection:
+        compiled = statement.compile(connection.sync_connection)
+        parameters = tuple(
+            compiled.params[name] for name in compiled.positiontup or ()
+        )
+        plan = (
+            await connection.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {compiled}", parameters
+            )
+        ).all()
+
+    details = " / ".join(row[-1] for row in plan)
+    assert "SCAN" not in details, details
+    assert "USING INDEX" in details or "USING COVERING INDEX" in details
+    assert index in details, details
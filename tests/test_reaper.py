@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db.models import AuthSession, LoginSession
+from app.core.services.reaper import SessionReaper
+from tests.utils import create_user
+
+
+@pytest.mark.anyio
+async def test_reaps_expired_sessions_in_batches(app_session: AsyncSession):
+    user = await create_user(app_session)
+    past = datetime.now(timezone.utc) - timedelta(minutes=1)
+    live = LoginSession(user_id=user.id)
+    app_session.add_all(
+        [
+            live,
+            *(LoginSession(user_id=user.id, expires_at=past) for _ in "abc"),
+            LoginSession(user_id=user.id, expired=True),
+            AuthSession(user_id=user.id, expires_at=past),
+        ]
+    )
+    await app_session.commit()
+
+    counts = await SessionReaper(interval=0, batch_size=2).run_once()
+
+    assert counts == {
+        "loginsession": 4,
+        "authsession": 1,
+        "accountverificationsession": 0,
+    }
+    remaining = (await app_session.exec(select(LoginSession.id))).all()
+    assert remaining == [live.id]
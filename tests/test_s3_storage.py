@@ -0,0 +1,125 @@
+import os
+from collections.abc import Iterator
+from io import BytesIO
+from uuid import uuid4
+
+import httpx
+import pytest
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.services import storage
+from app.core.services.storage_backends import CHUNK_SIZE, S3Storage
+from tests.utils import create_user, log_in
+
+CONTENT = os.urandom(CHUNK_SIZE * 3 + 10)
+
+
+@pytest.fixture(scope="module")
+def s3_endpoint() -> Iterator[str]:
+    """
+    An S3-compatible server: the one at S3_TEST_ENDPOINT_URL, such as a
+    local MinIO, or else moto's server in a thread.
+    """
+    if endpoint := os.environ.get("S3_TEST_ENDPOINT_URL"):
+        yield endpoint
+        return
+    moto_server = pytest.importorskip("moto.server")
+    server = moto_server.ThreadedMotoServer(
+        ip_address="127.0.0.1", port=0, verbose=False
+    )
+    server.start()
+    host, port = server.get_host_and_port()
+    yield f"http://{host}:{port}"
+    server.stop()
+
+
+@pytest.fixture
+def s3_storage(s3_endpoint: str) -> Iterator[S3Storage]:
+    pytest.importorskip("boto3")
+    backend = S3Storage(
+        bucket=f"loslc-test-{uuid4().hex[:12]}",
+        endpoint_url=s3_endpoint,
+        region="us-east-1",
+        access_key_id=os.environ.get("S3_TEST_ACCESS_KEY_ID", "minioadmin"),
+        secret_access_key=os.environ.get(
+            "S3_TEST_SECRET_ACCESS_KEY", "minioadmin"
+        ),
+    )
+    backend.client.create_bucket(Bucket=backend.bucket)
+    yield backend
+    listed = backend.client.list_objects_v2(Bucket=backend.bucket)
+    for stored in listed.get("Contents", []):
+        backend.delete(stored["Key"])
+    backend.client.delete_bucket(Bucket=backend.bucket)
+
+
+def test_round_trip(s3_storage: S3Storage):
+    s3_storage.put("ab/cd/blob", BytesIO(CONTENT))
+
+    assert s3_storage.exists("ab/cd/blob")
+    assert s3_storage.stat("ab/cd/blob").size == len(CONTENT)
+    assert b"".join(s3_storage.get_stream("ab/cd/blob")) == CONTENT
+    assert b"".join(s3_storage.get_stream("ab/cd/blob", 10, 19)) == (
+        CONTENT[10:20]
+    )
+    assert b"".join(
+        s3_storage.get_stream("ab/cd/blob", len(CONTENT) - 5)
+    ) == (CONTENT[-5:])
+
+    s3_storage.delete("ab/cd/blob")
+    s3_storage.delete("ab/cd/blob")
+
+    assert not s3_storage.exists("ab/cd/blob")
+    with pytest.raises(FileNotFoundError):
+        s3_storage.get_stream("ab/cd/blob")
+    with pytest.raises(FileNotFoundError):
+        s3_storage.stat("ab/cd/blob")
+
+
+def test_closing_a_stream_early_closes_the_body(
+    s3_storage: S3Storage, monkeypatch: pytest.MonkeyPatch
+):
+    s3_storage.put("blob", BytesIO(CONTENT))
+    get_object = s3_storage.client.get_object
+    bodies = []
+
+    def recording_get_object(**kwargs):
+        response = get_object(**kwargs)
+        bodies.append(response["Body"])
+        return response
+
+    monkeypatch.setattr(s3_storage.client, "get_object", recording_get_object)
+
+    chunks = s3_storage.get_stream("blob")
+    next(chunks)
+    chunks.close()
+
+    assert bodies[0]._raw_stream.closed
+
+
+@pytest.mark.anyio
+async def test_downloads_redirect_to_presigned_urls(
+    app_session: AsyncSession,
+    client: AsyncClient,
+    s3_storage: S3Storage,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(storage, "backend", s3_storage)
+    await log_in(app_session, client, await create_user(app_session))
+    uploaded = await client.post(
+        "/api/v1/v1/file",
+        files={"file": ("report.pdf", CONTENT, "application/pdf")},
+    )
+    assert uploaded.status_code == 200
+
+    response = await client.get(f"/api/v1/v1/file/{uploaded.json()['id']}")
+
+    assert response.status_code == 307
+    assert response.headers["cache-control"] == "no-store"
+    async with httpx.AsyncClient() as s3_client:
+        presigned = await s3_client.get(response.headers["location"])
+    assert presigned.status_code == 200
+    assert presigned.content == CONTENT
+    assert presigned.headers["content-type"] == "application/pdf"
+    assert "report.pdf" in presigned.headers["content-disposition"]
@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.routes.v1.providers import auth as auth_provider
+from app.core.security.session_cache import (
+    CachedLoginSession,
+    SessionCache,
+    session_cache,
+)
+from tests.utils import create_user, log_in
+
+
+def cached_session(user_id: str = "ada") -> CachedLoginSession:
+    return CachedLoginSession(
+        user_id=user_id,
+        expires_at=datetime.now(timezone.utc) + timedelta(days=1),
+        expired=False,
+        user={},
+    )
+
+
+@pytest.mark.anyio
+async def test_cached_session_needs_no_query(
+    app_session: AsyncSession, client: AsyncClient, statements: list[str]
+):
+    user = await create_user(app_session)
+    login_session = await log_in(app_session, client, user)
+    assert (await client.get("/api/v1/auth/me")).status_code == 200
+    statements.clear()
+
+    response = await client.get("/api/v1/auth/me")
+
+    assert response.status_code == 200
+    assert response.json()["username"] == "ada"
+    assert statements == []
+    cached = session_cache.get(login_session.id)
+    assert cached is not None
+    assert "hashed_password" not in cached.user
+
+
+@pytest.mark.anyio
+async def test_logout_evicts_session(
+    app_session: AsyncSession, client: AsyncClient
+):
+    user = await create_user(app_session)
+    await log_in(app_session, client, user)
+    assert (await client.get("/api/v1/auth/me")).status_code == 200
+
+    assert (await client.post("/api/v1/auth/logout")).status_code == 200
+
+    assert (await client.get("/api/v1/auth/me")).status_code == 401
+
+
+@pytest.mark.anyio
+async def test_logout_during_load_is_not_undone(
+    app_session: AsyncSession,
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    user = await create_user(app_session)
+    login_session = await log_in(app_session, client, user)
+    load_session = auth_provider.load_session
+
+    async def load_then_log_out(db_session, session_id, is_ws=False):
+        loaded = await load_session(db_session, session_id, is_ws=is_ws)
+        # Another request logs out while this one holds the old row.
+        login_session.expired = True
+        app_session.add(login_session)
+        await app_session.commit()
+        return loaded
+
+    monkeypatch.setattr(auth_provider, "load_session", load_then_log_out)
+    assert (await client.get("/api/v1/auth/me")).status_code == 200
+    monkeypatch.undo()
+
+    assert session_cache.get(login_session.id) is None
+    assert (await client.get("/api/v1/auth/me")).status_code == 401
+
+
+def test_load_racing_with_eviction_is_not_stored():
+    cache = SessionCache(max_size=10, ttl=60)
+    version = cache.version()
+    cache.evict("session")
+    cache.set("session", version, cached_session())
+    assert cache.get("session") is None
+
+    version = cache.version()
+    cache.evict_user("ada")
+    cache.set("session", version, cached_session())
+    assert cache.get("session") is None
+
+    cache.set("session", cache.version(), cached_session())
+    assert cache.get("session") is not None
+
+
+def test_evictions_are_bounded():
+    cache = SessionCache(max_size=2, ttl=60)
+    version = cache.version()
+    for session_id in ("first", "second", "third"):
+        cache.evict(session_id)
+
+    assert len(cache.evicted) == 2
+    cache.set("first", version, cached_session())
+    assert cache.get("first") is None
+    cache.set("first", cache.version(), cached_session())
+    assert cache.get("first") is not None
@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.routes.v1.providers import auth as auth_provider
+from app.api.routes.v1.providers.auth import USER_SESSION_COOKIE_ID
+from app.core.db.models import LoginSession, User
+from app.core.security import tokens
+from app.core.security.session_cache import session_cache
+from app.core.security.tokens import (
+    SessionClaims,
+    revocation_list,
+    sign_session_token,
+)
+from app.utils.date import utc
+from tests.utils import create_user, log_in
+
+
+@pytest.fixture(autouse=True)
+def token_mode(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(auth_provider, "AUTH_MODE", tokens.AUTH_MODE_TOKEN)
+    monkeypatch.setattr(tokens, "SESSION_SECRET", "test-secret")
+
+
+async def use_token(
+    db_session: AsyncSession, client: AsyncClient, user: User
+) -> LoginSession:
+    login_session = await log_in(db_session, client, user)
+    claims = SessionClaims(
+        sub=user.id,
+        jti=login_session.id,
+        exp=int(utc(login_session.expires_at).timestamp()),
+    )
+    client.cookies.set(USER_SESSION_COOKIE_ID, sign_session_token(claims))
+    return login_session
+
+
+@pytest.mark.anyio
+async def test_token_is_checked_against_its_login_session(
+    app_session: AsyncSession, client: AsyncClient, statements: list[str]
+):
+    user = await create_user(app_session)
+    await use_token(app_session, client, user)
+    statements.clear()
+
+    assert (await client.get("/api/v1/auth/me")).status_code == 200
+    assert (await client.get("/api/v1/auth/me")).status_code == 200
+
+    # One joined load of the session and its user, then the cache.
+    assert len(statements) == 1
+    assert "loginsession" in statements[0]
+
+
+@pytest.mark.anyio
+async def test_forged_tokens_are_rejected_without_queries(
+    app_session: AsyncSession, client: AsyncClient, statements: list[str]
+):
+    user = await create_user(app_session)
+    other = await create_user(app_session, username="grace")
+    login_session = await log_in(app_session, client, other)
+    claims = SessionClaims(
+        sub=user.id,
+        jti=login_session.id,
+        exp=int((datetime.now(timezone.utc) + timedelta(days=1)).timestamp()),
+    )
+    token = sign_session_token(claims)
+    statements.clear()
+
+    client.cookies.set(USER_SESSION_COOKIE_ID, token[:-2] + "xx")
+    assert (await client.get("/api/v1/auth/me")).status_code == 401
+    assert statements == []
+
+    # Validly signed, but naming someone else's login session.
+    client.cookies.set(USER_SESSION_COOKIE_ID, token)
+    assert (await client.get("/api/v1/auth/me")).status_code == 401
+
+
+@pytest.mark.anyio
+async def test_verifying_after_login_takes_effect(
+    app_session: AsyncSession, client: AsyncClient
+):
+    user = await create_user(app_session, verified=False)
+    await use_token(app_session, client, user)
+    assert (await client.get("/api/v1/auth/me")).status_code == 401
+
+    user.verified = True
+    await app_session.commit()
+
+    assert (await client.get("/api/v1/auth/me")).status_code == 200
+
+
+@pytest.mark.anyio
+async def test_logout_outlives_the_process(
+    app_session: AsyncSession, client: AsyncClient
+):
+    user = await create_user(app_session)
+    await use_token(app_session, client, user)
+    token = client.cookies[USER_SESSION_COOKIE_ID]
+    assert (await client.get("/api/v1/auth/me")).status_code == 200
+
+    assert (await client.post("/api/v1/auth/logout")).status_code == 200
+    # As seen by a restarted or another worker.
+    revocation_list.revoked.clear()
+    session_cache.sessions.clear()
+
+    client.cookies.set(USER_SESSION_COOKIE_ID, token)
+    assert (await client.get("/api/v1/auth/me")).status_code == 401
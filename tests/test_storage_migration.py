@@ -0,0 +1,82 @@
+import hashlib
+import os
+
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db.models import FileResource
+from app.core.services import storage_migration
+from app.core.services.storage import blob_key
+from app.core.services.storage_backends import LocalStorage
+from tests.utils import create_user
+
+
+@pytest.fixture
+def locked_digests(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Records the digests the migration locks; SQLite has no locks."""
+    locked: list[str] = []
+
+    async def lock_digest(db_session, digest: str, shared: bool = False):
+        assert shared
+        locked.append(digest)
+
+    monkeypatch.setattr(storage_migration, "lock_digest", lock_digest)
+    return locked
+
+
+async def create_legacy_file(
+    db_session: AsyncSession, root: str, content: bytes
+) -> FileResource:
+    user = await create_user(db_session)
+    resource = FileResource(
+        user_id=user.id, name="notes.txt", filetype="text/plain"
+    )
+    db_session.add(resource)
+    await db_session.commit()
+    with open(f"{root}/{resource.id}", "wb") as buffer:
+        buffer.write(content)
+    return resource
+
+
+@pytest.mark.anyio
+async def test_moves_files_to_blobs_under_the_digest_lock(
+    app_session: AsyncSession,
+    local_storage: LocalStorage,
+    locked_digests: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(storage_migration, "STORAGE", local_storage.root)
+    resource = await create_legacy_file(
+        app_session, local_storage.root, b"legacy"
+    )
+    digest = hashlib.sha256(b"legacy").hexdigest()
+
+    await storage_migration.migrate_storage()
+
+    await app_session.refresh(resource)
+    assert resource.sha256 == digest
+    assert locked_digests == [digest]
+    assert local_storage.exists(blob_key(digest))
+    assert not os.path.exists(f"{local_storage.root}/{resource.id}")
+
+
+@pytest.mark.anyio
+async def test_leaves_released_files_to_their_release(
+    app_session: AsyncSession,
+    local_storage: LocalStorage,
+    locked_digests: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(storage_migration, "STORAGE", local_storage.root)
+    resource = await create_legacy_file(
+        app_session, local_storage.root, b"deleted"
+    )
+    resource.sha256 = hashlib.sha256(b"deleted").hexdigest()
+    await app_session.delete(resource)
+    await app_session.commit()
+
+    async with AsyncSession(storage_migration.engine) as db_session:
+        await storage_migration.move_to_blob(db_session, resource)
+
+    assert locked_digests == [resource.sha256]
+    assert not local_storage.exists(blob_key(resource.sha256))
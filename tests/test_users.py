@@ -0,0 +1,127 @@
+from collections.abc import Awaitable, Callable
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.routes.v1.dto.pagination import PageDTO
+from app.api.routes.v1.providers import user as user_provider
+from app.core.db.builders.permission import PermissionBuilder
+from app.core.db.builders.role import RoleBuilder
+from app.core.db.models import Permission, Role, RoleUserLink, User
+from app.core.security.permissions import (
+    ACTION_READ,
+    ADMIN_ROLE_NAME,
+    FORM_RESOURCE,
+)
+from tests.utils import create_user
+
+
+async def role_links(
+    db_session: AsyncSession, user_id: str
+) -> list[RoleUserLink]:
+    return list(
+        (
+            await db_session.exec(
+                select(RoleUserLink).where(RoleUserLink.user_id == user_id)
+            )
+        ).all()
+    )
+
+
+@pytest.mark.anyio
+async def test_only_admins_remove_roles(app_session: AsyncSession):
+    target = await create_user(app_session, "bo", role_names=("editor",))
+    [link] = await role_links(app_session, target.id)
+    outsider = await create_user(app_session)
+    admin = await create_user(app_session, "cy", role_names=(ADMIN_ROLE_NAME,))
+
+    with pytest.raises(HTTPException):
+        await user_provider.remove_role_from_user(
+            app_session, outsider, link.role_id, target.id
+        )
+    assert await role_links(app_session, target.id) == [link]
+
+    await user_provider.remove_role_from_user(
+        app_session, admin, link.role_id, target.id
+    )
+    assert await role_links(app_session, target.id) == []
+
+
+async def walk_pages[T: BaseModel](
+    load_page: Callable[[str | None], Awaitable[PageDTO[T]]],
+) -> list[list[T]]:
+    pages: list[list[T]] = []
+    cursor = None
+    while True:
+        page = await load_page(cursor)
+        pages.append(page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+async def seed_roles(db_session: AsyncSession, user: User, count: int):
+    """Gives `user` `count` roles, the nth of which holds n permissions."""
+    for index in range(count):
+        role = RoleBuilder().addUser(user).withName(f"role-{index}").make()
+        db_session.add(role)
+        db_session.add_all(
+            PermissionBuilder()
+            .withResourceName(FORM_RESOURCE)
+            .withResourceId(f"form-{index}-{number}")
+            .withActionName(ACTION_READ)
+            .forRole(role)
+            .make()
+            for number in range(index)
+        )
+    await db_session.commit()
+
+
+@pytest.mark.anyio
+async def test_role_pages_count_permissions(app_session: AsyncSession):
+    admin = await create_user(app_session, role_names=(ADMIN_ROLE_NAME,))
+    target = await create_user(app_session, "bo")
+    await seed_roles(app_session, target, 11)
+
+    pages = await walk_pages(
+        lambda cursor: user_provider.get_user_roles(
+            app_session, admin, target.id, cursor, 4
+        )
+    )
+
+    assert [len(page) for page in pages] == [4, 4, 3]
+    roles = [role for page in pages for role in page]
+    assert sorted(
+        (role.name or "", role.permissions_count) for role in roles
+    ) == sorted((f"role-{index}", index) for index in range(11))
+
+
+@pytest.mark.anyio
+async def test_deep_pages_neither_skip_nor_repeat(app_session: AsyncSession):
+    admin = await create_user(app_session, role_names=(ADMIN_ROLE_NAME,))
+    await seed_roles(app_session, admin, 30)
+    role_ids = sorted((await app_session.exec(select(Role.id))).all())
+    permission_ids = sorted(
+        (await app_session.exec(select(Permission.id))).all()
+    )
+
+    role_pages = await walk_pages(
+        lambda cursor: user_provider.get_all_roles(
+            app_session, admin, cursor, 7
+        )
+    )
+    permission_pages = await walk_pages(
+        lambda cursor: user_provider.get_all_permissions(
+            app_session, admin, cursor, 50
+        )
+    )
+
+    assert len(role_pages) == 5
+    assert [role.id for page in role_pages for role in page] == role_ids
+    assert len(permission_pages) > 5
+    assert [
+        permission.id for page in permission_pages for permission in page
+    ] == permission_ids
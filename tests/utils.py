@@ -0,0 +1,39 @@
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.routes.v1.providers.auth import USER_SESSION_COOKIE_ID
+from app.core.db.builders.role import RoleBuilder
+from app.core.db.models import LoginSession, User
+
+
+async def create_user(
+    db_session: AsyncSession,
+    username: str = "ada",
+    role_names: tuple[str, ...] = (),
+    verified: bool = True,
+) -> User:
+    user = User(
+        email=f"{username}@example.com",
+        username=username,
+        hashed_password="x",
+        name=username.title(),
+        verified=verified,
+    )
+    roles = [
+        RoleBuilder().addUser(user).withName(role_name).make()
+        for role_name in role_names
+    ]
+    db_session.add_all([user, *roles])
+    await db_session.commit()
+    return user
+
+
+async def log_in(
+    db_session: AsyncSession, client: AsyncClient, user: User
+) -> LoginSession:
+    """Opens a login session for `user` and sends its cookie from `client`."""
+    login_session = LoginSession(user_id=user.id)
+    db_session.add(login_session)
+    await db_session.commit()
+    client.cookies.set(USER_SESSION_COOKIE_ID, login_session.id)
+    return login_session